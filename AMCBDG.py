@@ -1,14 +1,39 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import pandas as pd
+import numpy as np
 import os
+import multiprocessing
+import queue
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 import openpyxl
-from openpyxl.styles import PatternFill, Font
-from openpyxl.utils import get_column_letter
 import psutil
 
+# Optional JIT for the allocation check/commit kernels - numpy fallback when numba isn't installed
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Optional fast workbook reader - pandas uses calamine when python-calamine is installed, else openpyxl
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
+# Columns read from each lookup sheet (the Demand sheet is read in full for the sorting strategies)
+SHEET_COLUMNS = {
+    "Planned Demand": {"SO Number", "Component Part Number", "Component Qty Required"},
+    "Component Demand": {"Component Part Number", "Component Qty Required"},
+    "IPIS": {"PART_NO", "Available Qty"},
+    "Hours": {"PART_NO", "Hours per Unit"},
+    "POs": {"PO Number", "Part Number", "Qty Due", "Promised Due Date"}
+}
+
 class PerformanceTracker:
     """Track performance metrics across different phases"""
     
@@ -105,6 +130,7 @@ VERSION = "v1.9.0"
 VERSION_DATE = "2025-07-30"
 DEBUG_MODE = False
 DEBUG_COMPONENT_PART = None  # Set to a specific part number (as string) to track, e.g. "8034855"
+PROGRESS_INTERVAL = 0.5  # Minimum seconds between progress messages from the order loop
 DEBUG_SO_NUMBER = 9682591
       # Set to a specific SO number (as string) to track, e.g. "9678417"
 
@@ -205,47 +231,116 @@ def get_sorting_strategies():
         {"name": "Planner (Z-A)", "columns": ["Planner", "Start Date"], "ascending": [False, True]}
     ]
 
+def find_strategy_extremes(strategy_results):
+    """Return the best (orders, hours, qty) and worst (orders) strategy results from one metrics array"""
+    # One (strategies x 3) array of the compared metrics; argmax/argmin pick the first strategy on ties, as max/min did
+    metrics = np.array([
+        (s['metrics']['releasable_count'], s['metrics']['releasable_hours'], s['metrics']['releasable_qty'])
+        for s in strategy_results
+    ], dtype=np.float64)
+    best_orders, best_hours, best_qty = metrics.argmax(axis=0)
+    worst_orders = metrics[:, 0].argmin()
+    return (strategy_results[best_orders], strategy_results[best_hours],
+            strategy_results[best_qty], strategy_results[worst_orders])
+
+def safe_pct(part, whole):
+    """part/whole as a percentage, 0.0 when whole is 0 (empty file or category) instead of raising"""
+    return part / whole * 100 if whole else 0.0
+
+def format_pct(part, whole):
+    """Format part/whole as a one-decimal percentage ("0.0%" when whole is 0)"""
+    return f"{safe_pct(part, whole):.1f}%"
+
 @timing_decorator("Build Stock Dictionary")
 def build_stock_dictionary(df_ipis):
-    """Build stock dict using IPIS as primary source"""
-    stock = {}
-    
+    """Build stock (part -> available qty Series) using IPIS as primary source"""
     # Use IPIS as the authoritative source
     if not df_ipis.empty:
         df_ipis["PART_NO"] = df_ipis["PART_NO"].astype(str)
-        ipis_stock = df_ipis.groupby("PART_NO")["Available Qty"].sum().to_dict()
-        stock.update(ipis_stock)
-    else:
-        print("WARNING: IPIS sheet is empty - no stock data available!")
+        return df_ipis.groupby("PART_NO")["Available Qty"].sum()
     
-    return stock
+    print("WARNING: IPIS sheet is empty - no stock data available!")
+    return pd.Series(dtype=np.int64)
 
-def process_single_scenario(filepath, scenario_name, status_callback=None, scenario_num=1, total_scenarios=1, sorting_strategy=None, include_kits=True, include_instruments=True, include_virtuoso=True, include_kit_samples=True):
-    """Process a single scenario file and return results with live progress updates"""
+@timing_decorator("Build Committed Components")
+def build_committed_components(df_component_demand):
+    """Build committed (part -> committed qty Series) from the Component Demand sheet"""
+    if not df_component_demand.empty:
+        df_component_demand["Component Part Number"] = df_component_demand["Component Part Number"].astype(str)
+        return df_component_demand.groupby("Component Part Number")["Component Qty Required"].sum()
     
-    if status_callback:
-        strategy_name = sorting_strategy["name"] if sorting_strategy else "Default"
-        status_callback(f"📂 [Scenario {scenario_num}/{total_scenarios}] Loading sheets for {os.path.basename(filepath)} ({strategy_name})...")
+    return pd.Series(dtype=np.int64)
+
+def _find_shortages_numpy(comp_idx, req_qty, stock, used):
+    """Positions in comp_idx whose required qty exceeds stock minus used (numpy fallback)"""
+    return np.flatnonzero(~(stock[comp_idx] - used[comp_idx] >= req_qty))  # NaN stock counts as short
+
+def _commit_allocation_numpy(comp_idx, req_qty, used):
+    """Add each required qty onto used at its part code (numpy fallback)"""
+    np.add.at(used, comp_idx, req_qty)
+
+if njit is not None:
+    @njit(cache=True)
+    def find_shortages(comp_idx, req_qty, stock, used):
+        """Positions in comp_idx whose required qty exceeds stock minus used, compiled with numba"""
+        shortages = np.empty(len(comp_idx), dtype=np.int64)
+        n_short = 0
+        for j in range(len(comp_idx)):
+            if not (stock[comp_idx[j]] - used[comp_idx[j]] >= req_qty[j]):
+                shortages[n_short] = j
+                n_short += 1
+        return shortages[:n_short]
+
+    @njit(cache=True)
+    def commit_allocation(comp_idx, req_qty, used):
+        """Add each required qty onto used at its part code, compiled with numba"""
+        for j in range(len(comp_idx)):
+            used[comp_idx[j]] += req_qty[j]
+else:
+    find_shortages = _find_shortages_numpy
+    commit_allocation = _commit_allocation_numpy
+
+@timing_decorator("Load Excel Data")
+def read_workbook_sheets(filepath):
+    """Parse the sheets a scenario needs - the workbook is opened and unzipped once for all sheets"""
+    def parse_sheet(xf, sheet_name):
+        columns = SHEET_COLUMNS[sheet_name]
+        return xf.parse(sheet_name, usecols=lambda col: col in columns)
     
-    # Load the sheets we need with timing
-    @timing_decorator("Load Excel Data")
-    def load_excel_data(filepath):
+    with pd.ExcelFile(filepath, engine=EXCEL_ENGINE) as xf:
         return {
-            'df_main': pd.read_excel(filepath, sheet_name="Demand"),
-            'df_struct': pd.read_excel(filepath, sheet_name="Planned Demand"),
-            'df_component_demand': pd.read_excel(filepath, sheet_name="Component Demand"),
-            'df_ipis': pd.read_excel(filepath, sheet_name="IPIS"),
-            'df_hours': pd.read_excel(filepath, sheet_name="Hours"),
-            'df_pos': pd.read_excel(filepath, sheet_name="POs")
+            'df_main': xf.parse("Demand"),
+            'df_struct': parse_sheet(xf, "Planned Demand"),
+            'df_component_demand': parse_sheet(xf, "Component Demand"),
+            'df_ipis': parse_sheet(xf, "IPIS"),
+            'df_hours': parse_sheet(xf, "Hours"),
+            'df_pos': parse_sheet(xf, "POs")
         }
+
+def load_workbook(filepath):
+    """Parse the sheets and snapshot the initial stock and committed quantities shared by every strategy"""
+    workbook = read_workbook_sheets(filepath)
+    workbook['stock'] = build_stock_dictionary(workbook['df_ipis'])
+    workbook['committed_components'] = build_committed_components(workbook['df_component_demand'])
+    return workbook
+
+def process_single_scenario(filepath, scenario_name, status_callback=None, scenario_num=1, total_scenarios=1, sorting_strategy=None, include_kits=True, include_instruments=True, include_virtuoso=True, include_kit_samples=True, workbook=None):
+    """Process a single scenario file and return results with live progress updates"""
+    
+    # A preloaded workbook (from load_workbook) is shared across strategies - its frames are
+    # only read or given idempotent str conversions below, so no copy is needed
+    if workbook is None:
+        if status_callback:
+            strategy_name = sorting_strategy["name"] if sorting_strategy else "Default"
+            status_callback(f"📂 [Scenario {scenario_num}/{total_scenarios}] Loading sheets for {os.path.basename(filepath)} ({strategy_name})...")
+        workbook = load_workbook(filepath)
     
-    excel_data = load_excel_data(filepath)
-    df_main = excel_data['df_main']
-    df_struct = excel_data['df_struct']
-    df_component_demand = excel_data['df_component_demand']
-    df_ipis = excel_data['df_ipis']
-    df_hours = excel_data['df_hours']
-    df_pos = excel_data['df_pos']
+    df_main = workbook['df_main']
+    df_struct = workbook['df_struct']
+    df_component_demand = workbook['df_component_demand']
+    df_ipis = workbook['df_ipis']
+    df_hours = workbook['df_hours']
+    df_pos = workbook['df_pos']
     
     # DEBUG: Show data loading results
     if DEBUG_MODE:
@@ -326,8 +421,8 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
         strategy_name = sorting_strategy["name"] if sorting_strategy else "Default"
         status_callback(f"🔁 [Scenario {scenario_num}/{total_scenarios}] Processing commitments ({strategy_name})...")
     
-    # Build stock dictionary
-    stock = build_stock_dictionary(df_ipis)
+    # Initial stock snapshot from load_workbook - read-only here, the loop only ever writes used_arr
+    stock = workbook['stock']
     
     # DEBUG: Show stock information
     if DEBUG_MODE:
@@ -358,19 +453,10 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
             
             print("-" * 80)
 
-    # Build committed_components with timing
-    performance_tracker.start_phase("Build Committed Components")
-    committed_components = {}
-    committed_parts_count = 0
-    total_committed_qty = 0
-
-    if not df_component_demand.empty:
-        df_component_demand["Component Part Number"] = df_component_demand["Component Part Number"].astype(str)
-        committed_summary = df_component_demand.groupby("Component Part Number")["Component Qty Required"].sum()
-        committed_components = committed_summary.to_dict()
-        committed_parts_count = len(committed_components)
-        total_committed_qty = sum(committed_components.values())
-    performance_tracker.end_phase()
+    # Part -> committed qty Series snapshot from load_workbook (reindexes straight into the used array)
+    committed_components = workbook['committed_components']
+    committed_parts_count = len(committed_components)
+    total_committed_qty = committed_components.sum() if committed_parts_count else 0
     
     # DEBUG: Show committed components
     if DEBUG_MODE:
@@ -400,9 +486,6 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
             print(f"    Final committed in dictionary: {committed_components.get(debug_part, 0)}")
         print("-" * 80)
 
-    # Initialize used_components with the committed quantities
-    used_components = committed_components.copy()
-
     # Build labor standards dictionary (unchanged)
     df_hours["PART_NO"] = df_hours["PART_NO"].astype(str)
     labor_standards = df_hours.groupby("PART_NO")["Hours per Unit"].sum().to_dict()
@@ -419,10 +502,12 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
     # Apply normalization to both planned demand and main data
     planned_demand["SO Number"] = planned_demand["SO Number"].apply(normalize_so_number)
     
-    # Pre-process main data (unchanged)
+    # Pre-process main data - Part and Planner become categoricals: each distinct string is stored
+    # once, and the strategy sorts and planner filters work on integer codes (categories are
+    # lexically ordered, so sort results are unchanged)
     df_main['Start Date'] = pd.to_datetime(df_main['Start Date'], errors='coerce')
-    df_main["Part"] = df_main["Part"].astype(str)
-    df_main["Planner"] = df_main["Planner"].fillna("UNKNOWN").astype(str)
+    df_main["Part"] = df_main["Part"].astype(str).astype("category")
+    df_main["Planner"] = df_main["Planner"].fillna("UNKNOWN").astype(str).astype("category")
     df_main["Demand"] = pd.to_numeric(df_main["Demand"], errors='coerce').fillna(0)
     
     # Filter data based on selected categories
@@ -458,37 +543,121 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
         excluded = total_original - total_filtered
         status_callback(f"🔁 [Scenario {scenario_num}/{total_scenarios}] Filtered data: {total_filtered:,}/{total_original:,} orders selected ({excluded:,} excluded) ({strategy_name})...")
     
-    # Calculate hours for sorting (unchanged)
-    filtered_df_main["Hours_Calc"] = filtered_df_main.apply(lambda row: 
-        labor_standards.get(str(row["Part"]), 0) * row["Demand"], axis=1)
+    # Calculate hours for sorting - labor standards are looked up once per distinct part, then
+    # spread to the orders through the category codes
+    part_cats = filtered_df_main["Part"].cat.categories
+    part_codes = filtered_df_main["Part"].cat.codes.to_numpy()
+    hours_per_unit = pd.Series(part_cats, dtype=object).map(labor_standards).fillna(0).to_numpy(dtype=np.float64)
+    filtered_df_main["Hours_Calc"] = hours_per_unit[part_codes] * filtered_df_main["Demand"].to_numpy(dtype=np.float64)
     
-    # Apply sorting strategy (unchanged)
+    # Apply sorting strategy - one stable multi-key sort (NaT/missing values last)
     if sorting_strategy:
-        # Handle missing values appropriately for each column type
-        for col in sorting_strategy["columns"]:
-            if col == "Start Date":
-                # Put NaT (missing dates) at the end
-                filtered_df_main = filtered_df_main.sort_values(sorting_strategy["columns"], 
-                                            ascending=sorting_strategy["ascending"], 
-                                            na_position='last')
-            else:
-                filtered_df_main = filtered_df_main.sort_values(sorting_strategy["columns"], 
-                                            ascending=sorting_strategy["ascending"])
+        filtered_df_main = filtered_df_main.sort_values(sorting_strategy["columns"], 
+                                    ascending=sorting_strategy["ascending"], 
+                                    na_position='last', kind='mergesort')
     else:
         # Default sorting (original behavior)
-        filtered_df_main = filtered_df_main.sort_values(['Start Date', 'SO Number'], na_position='last')
+        filtered_df_main = filtered_df_main.sort_values(['Start Date', 'SO Number'], na_position='last', kind='mergesort')
     
     filtered_df_main = filtered_df_main.reset_index(drop=True)
     
-    results = []
-    processed = 0
+    # Integer part codes shared by the stock, used and BOM arrays - the allocation loop indexes
+    # arrays instead of hashing part strings into dicts
+    performance_tracker.start_phase("Build Allocation Arrays")
+    part_index = pd.Index(pd.unique(np.concatenate([
+        stock.index.to_numpy(dtype=object),
+        committed_components.index.to_numpy(dtype=object),
+        planned_demand["Component Part Number"].to_numpy(dtype=object),
+        df_main["Part"].cat.categories.to_numpy(dtype=object)
+    ])))
+    # Stock and committed Series reindex straight onto the codes (0 where a part has none)
+    stock_qty = stock.reindex(part_index, fill_value=0)
+    committed_qty = committed_components.reindex(part_index, fill_value=0)
+    
+    # Whole-unit data stays int64; anything fractional uses float64 for the arithmetic
+    stock_is_float = not pd.api.types.is_integer_dtype(stock_qty)
+    committed_is_float = not pd.api.types.is_integer_dtype(committed_qty)
+    demand_is_float = not pd.api.types.is_integer_dtype(filtered_df_main["Demand"])
+    qty_dtype = np.float64 if (stock_is_float or committed_is_float or demand_is_float) else np.int64
+    stock_arr = stock_qty.to_numpy(dtype=qty_dtype)
+    used_arr = committed_qty.to_numpy(dtype=qty_dtype, copy=True)  # Starts at the committed quantities; a private copy per scenario
+    # Parts whose available qty reads as a float in the shortage text, independent of the array dtype:
+    # float stock or commitments for the parts that have them, plus (below) any part given a float demand
+    float_qty = np.zeros(len(part_index), dtype=bool)
+    if stock_is_float:
+        float_qty |= part_index.isin(stock.index)
+    if committed_is_float:
+        float_qty |= part_index.isin(committed_components.index)
+    
+    # BOM per SO: (component parts, component codes, required qty array, required qty as Python ints)
+    bom_rows = pd.DataFrame({
+        "SO Number": planned_demand["SO Number"],
+        "Component Part Number": planned_demand["Component Part Number"],
+        "Code": part_index.get_indexer(planned_demand["Component Part Number"]),
+        "Required": pd.to_numeric(planned_demand["Component Qty Required"], errors='coerce').fillna(0).astype(np.int64)
+    })
+    bom_groups = {
+        so_number: (
+            group["Component Part Number"].tolist(),
+            group["Code"].to_numpy(dtype=np.int64),
+            group["Required"].to_numpy(dtype=qty_dtype),
+            group["Required"].tolist()
+        )
+        for so_number, group in bom_rows.groupby("SO Number", sort=False)
+    }
+    
+    # Future POs per part in sheet order: part -> [(PO number, due date text, qty due), ...]
+    # Parts, dates and quantities are converted and compared against "now" once, here.
+    # po_max_qty holds the running max of qty due per part (non-decreasing), so the first PO
+    # covering a shortage is found with a binary search instead of scanning the list.
+    po_due_dates = pd.to_datetime(df_pos["Promised Due Date"], errors='coerce')
+    future_pos = pd.DataFrame({
+        "Part Number": df_pos["Part Number"].astype(str),
+        "PO Number": df_pos["PO Number"],
+        "Due": po_due_dates.dt.strftime('%Y-%m-%d'),
+        "Qty Due": pd.to_numeric(df_pos["Qty Due"], errors='coerce')
+    })[po_due_dates >= datetime.now()]
+    po_index = {}
+    po_max_qty = {}
+    for part_no, group in future_pos.groupby("Part Number", sort=False):
+        po_index[part_no] = list(zip(group["PO Number"], group["Due"], group["Qty Due"]))
+        po_max_qty[part_no] = np.maximum.accumulate(group["Qty Due"].fillna(-np.inf).to_numpy(dtype=np.float64))
+    
+    # Per-order columns pulled out once (SoA) - the loop indexes plain arrays instead of iterrows() rows
     total = len(filtered_df_main)
+    so_arr = filtered_df_main["SO Number"].to_numpy(dtype=object)
+    so_valid = filtered_df_main["SO Number"].notna().to_numpy()
+    part_arr = filtered_df_main["Part"].to_numpy(dtype=object)
+    part_codes = filtered_df_main["Part"].cat.codes.to_numpy()
+    part_idx_arr = part_index.get_indexer(part_cats)[part_codes]
+    demand_arr = filtered_df_main["Demand"].to_numpy()
+    hours_arr = filtered_df_main["Hours_Calc"].to_numpy(dtype=np.float64)
+    # Piggyback orders: "NS<part>99" appears as a planned component (one set probe per order, vectorized)
+    pb_parts = set(planned_demand["Component Part Number"])
+    pb_arr = ("NS" + pd.Series(part_cats, dtype=object) + "99").isin(pb_parts).to_numpy()[part_codes]
+    planner_arr = filtered_df_main["Planner"].to_numpy(dtype=object)
+    start_date_arr = filtered_df_main["Start Date"].dt.strftime('%Y-%m-%d').fillna("No Date").to_numpy(dtype=object)
+    
+    # Result columns filled by position; Planner and Start Date come straight from the input columns
+    so_out = np.empty(total, dtype=object)
+    part_out = np.empty(total, dtype=object)
+    pb_out = np.empty(total, dtype=object)
+    hours_out = np.zeros(total, dtype=np.float64)
+    status_out = np.empty(total, dtype=object)
+    release_mask = np.zeros(total, dtype=np.bool_)
+    skipped_mask = np.zeros(total, dtype=np.bool_)
+    shortages_out = np.empty(total, dtype=object)
+    components_out = np.empty(total, dtype=object)
+    performance_tracker.end_phase()
+    
+    processed = 0
     
     # Baseline estimate: ~0.15 seconds per order (conservative estimate)
     baseline_time_per_order = 0.15
     processing_start_time = time.time()
-
-    # Process each order sequentially with FREQUENT UI updates + TIME ESTIMATES
+    last_progress_time = processing_start_time
+    
+    # Process each order sequentially, posting progress at most every PROGRESS_INTERVAL seconds
     
     # DEBUG: Show header when starting to process orders
     debug_component_orders_found = 0
@@ -499,11 +668,12 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
     # Start timing the main order processing loop
     performance_tracker.start_phase("Process Orders")
     
-    for _, row in filtered_df_main.iterrows():
+    for i in range(total):
         processed += 1
         
-        # UPDATE UI EVERY 100 ORDERS
-        if processed % 100 == 0 or processed == total or processed == 1:
+        # Check the clock every 1000 orders and post progress when the interval has passed
+        if processed == total or processed == 1 or (processed % 1000 == 0 and time.time() - last_progress_time >= PROGRESS_INTERVAL):
+            last_progress_time = time.time()
             progress_pct = processed / total * 100
             
             # Calculate dynamic time estimates
@@ -517,7 +687,7 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
                 remaining_orders = total - processed
                 est_remaining = remaining_orders * baseline_time_per_order
             
-
+            
             
             if status_callback:
                 strategy_name = sorting_strategy["name"] if sorting_strategy else "Default"
@@ -531,14 +701,15 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
                     else:
                         status_callback(f"🔁 [Scenario {scenario_num}/{total_scenarios}] {strategy_name} - {processed:,}/{total:,} ({progress_pct:.1f}%) | {est_remaining:.0f}s remaining")
         
-        so = str(row["SO Number"]).strip() if pd.notna(row["SO Number"]) else f"ORDER_{processed}"
-        part = str(row["Part"]) if pd.notna(row["Part"]) else None
-        demand_qty = row["Demand"] if pd.notna(row["Demand"]) and row["Demand"] > 0 else 0
-        planner = str(row["Planner"]) if pd.notna(row["Planner"]) else "UNKNOWN"
-        start_date = row["Start Date"]
+        so = str(so_arr[i]).strip() if so_valid[i] else f"ORDER_{processed}"
+        part = part_arr[i]  # Already str ("nan" when missing)
+        demand_qty = demand_arr[i] if demand_arr[i] > 0 else 0
+        planner = planner_arr[i]
+        start_date = start_date_arr[i]
         
         # NORMALIZE SO NUMBER for consistent matching
         so = normalize_so_number(so)
+        so_out[i] = so
         
         # DEBUG: Show when processing specific SO or part
         debug_so_match = DEBUG_SO_NUMBER is not None and str(so) == str(DEBUG_SO_NUMBER)
@@ -554,59 +725,38 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
             print(f"   Start Date: {start_date}")
         
         # ENHANCED DEBUG: Track every Shop Order that tries to allocate to the debug component
-        debug_component_allocation_found = False
         if DEBUG_MODE and DEBUG_COMPONENT_PART is not None:
             # Check if this SO will try to allocate the debug component (either as parent part or as component)
             debug_component = str(DEBUG_COMPONENT_PART)
             if str(part) == debug_component:
-                debug_component_allocation_found = True
                 print(f"\n🔍 DEBUG COMPONENT ALLOCATION: SO {so} directly uses {debug_component} as parent part")
             else:
                 # Check if this SO's BOM contains the debug component
-                try:
-                    bom_check = planned_demand[planned_demand["SO Number"] == so]
-                    if not bom_check.empty:
-                        bom_components = bom_check["Component Part Number"].astype(str).tolist()
-                        if debug_component in bom_components:
-                            debug_component_allocation_found = True
-                            comp_row = bom_check[bom_check["Component Part Number"].astype(str) == debug_component].iloc[0]
-                            comp_qty = comp_row["Component Qty Required"]
-                            print(f"\n🔍 DEBUG COMPONENT ALLOCATION: SO {so} (Parent: {part}) requires {comp_qty} units of {debug_component}")
-                except:
-                    pass
+                bom_check = bom_groups.get(so)
+                if bom_check is not None and debug_component in bom_check[0]:
+                    comp_qty = bom_check[3][bom_check[0].index(debug_component)]
+                    print(f"\n🔍 DEBUG COMPONENT ALLOCATION: SO {so} (Parent: {part}) requires {comp_qty} units of {debug_component}")
         
         # Skip orders with missing critical data
-        if part is None or part == "nan" or demand_qty <= 0:
+        if part == "nan" or demand_qty <= 0:
             # DEBUG: Show skipped orders
             if DEBUG_MODE and (debug_so_match or debug_part_match):
                 print(f"   ⚠️  Order skipped: part={part}, demand={demand_qty}")
             
-            results.append({
-                "SO Number": so,
-                "Part": part or "MISSING",
-                "Planner": planner,
-                "Start Date": start_date.strftime('%Y-%m-%d') if pd.notna(start_date) else "No Date",
-                "PB": "-",
-                "Demand": demand_qty,
-                "Hours": 0,
-                "Status": "⚠️ Skipped",
-                "Shortages": "-",
-                "Components": "Missing part number or zero demand"
-            })
+            part_out[i] = part or "MISSING"
+            pb_out[i] = "-"
+            status_out[i] = "⚠️ Skipped"
+            skipped_mask[i] = True
+            shortages_out[i] = "-"
+            components_out[i] = "Missing part number or zero demand"
             continue
         
         # Check if this is a piggyback order
-        try:
-            pb_check = f"NS{part}99"
-            is_pb = "PB" if pb_check in planned_demand["Component Part Number"].values else "-"
-        except:
-            is_pb = "-"
+        is_pb = "PB" if pb_arr[i] else "-"
         
-        # Get planned demand for this SO
-        try:
-            bom = planned_demand[planned_demand["SO Number"] == so]
-        except:
-            bom = pd.DataFrame()
+        # Get planned demand for this SO (None when the SO has no BOM rows)
+        bom = bom_groups.get(so)
+        bom_size = len(bom[0]) if bom is not None else 0
         
         # DEBUG: Show BOM lookup results for specific SO
         debug_so_match = DEBUG_SO_NUMBER is not None and str(so) == str(DEBUG_SO_NUMBER)
@@ -633,20 +783,18 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
                     print(f"    Row {idx}: SO='{raw_so}' (type: {type(raw_so)}, repr: {repr(raw_so)})")
                     print(f"           Component='{row['Component Part Number']}', Qty={row['Component Qty Required']}")
             
-            print(f"  Records matching SO {so} exactly: {len(bom)}")
-            if len(bom) > 0:
+            print(f"  Records matching SO {so} exactly: {bom_size}")
+            if bom is not None:
                 print(f"  Components found:")
-                for _, comp in bom.iterrows():
-                    comp_part = str(comp["Component Part Number"])
-                    comp_qty = comp["Component Qty Required"]
+                for comp_part, comp_qty in zip(bom[0], bom[3]):
                     print(f"    {comp_part}: {comp_qty}")
             else:
                 print(f"  No components found - treating as raw material")
                 # Show a few sample records from planned demand
                 print(f"  Sample planned demand records:")
-                for i, (_, row) in enumerate(planned_demand.head(5).iterrows()):
+                for j, (_, row) in enumerate(planned_demand.head(5).iterrows()):
                     raw_so = row["SO Number"]
-                    print(f"    Row {i}: SO='{raw_so}' (type: {type(raw_so)}, repr: {repr(raw_so)}), Component='{row['Component Part Number']}', Qty={row['Component Qty Required']}")
+                    print(f"    Row {j}: SO='{raw_so}' (type: {type(raw_so)}, repr: {repr(raw_so)}), Component='{row['Component Part Number']}', Qty={row['Component Qty Required']}")
             print("-" * 80)
         
         # ENHANCED DEBUG: Show BOM lookup for any SO that uses the debug component
@@ -658,13 +806,11 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
             if debug_so_match or debug_part_match:
                 print(f"\n=== DEBUG: BOM Lookup for SO {so} (Parent: {part}) ===")
                 print(f"  Looking for SO Number: '{so}' in planned demand")
-                print(f"  Records matching SO {so} exactly: {len(bom)}")
+                print(f"  Records matching SO {so} exactly: {bom_size}")
                 
-                if len(bom) > 0:
+                if bom is not None:
                     print(f"  Components found in BOM:")
-                    for _, comp in bom.iterrows():
-                        comp_part = str(comp["Component Part Number"])
-                        comp_qty = comp["Component Qty Required"]
+                    for comp_part, comp_qty in zip(bom[0], bom[3]):
                         is_debug_component = comp_part == debug_part
                         debug_marker = " 🎯" if is_debug_component else ""
                         print(f"    {comp_part}: {comp_qty}{debug_marker}")
@@ -678,209 +824,164 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
         # Check material availability
         releasable = True
         shortage_details = []
+        shortage_parts_only = []  # Part numbers of the shortages, captured as they are found
         components_needed = {}
         
-        # Calculate labor hours for this order
-        base_hours = labor_standards.get(part, 0)
-        labor_hours = base_hours * demand_qty
+        # Labor hours for this order (hours per unit x demand, already in Hours_Calc)
+        labor_hours = hours_arr[i]
         
-        if len(bom) > 0:
+        if bom is not None:
             # This SO has planned component demand - use ALL-OR-NOTHING allocation
-            all_components_available = True
-            component_requirements = []
+            comp_parts, comp_idx, req_arr, req_qtys = bom
+            components_needed = dict(zip(comp_parts, req_qtys))
             debug_so_match = DEBUG_SO_NUMBER is not None and str(so) == str(DEBUG_SO_NUMBER)
             if DEBUG_MODE and debug_so_match:
                 print(f"\n=== DEBUG: Processing SO {so} ===")
-                print(f"Found {len(bom)} components in planned demand")
-            for _, comp in bom.iterrows():
-                try:
-                    comp_part = str(comp["Component Part Number"])
-                    required_qty = int(comp["Component Qty Required"]) if pd.notna(comp["Component Qty Required"]) else 0
-                    total_used = used_components.get(comp_part, 0)
-                    true_available = stock.get(comp_part, 0) - total_used
-                    available = max(0, true_available)
-
-                    # Always use the 'what if' calculation for both debug and output
+                print(f"Found {bom_size} components in planned demand")
+            
+            # Debug output for selected component part and/or SO number (before anything is allocated)
+            if DEBUG_MODE:
+                for comp_part, code, required_qty in zip(comp_parts, comp_idx, req_qtys):
+                    debug_part_match = DEBUG_COMPONENT_PART is not None and str(comp_part) == str(DEBUG_COMPONENT_PART)
+                    if not (debug_part_match or debug_so_match):
+                        continue
+                    total_used = used_arr[code]
+                    true_available = stock_arr[code] - total_used
                     available_after_usage = true_available - required_qty
                     will_be_sufficient = true_available >= required_qty
-
-                    # Debug output for selected component part and/or SO number
-                    debug_part_match = DEBUG_COMPONENT_PART is not None and str(comp_part) == str(DEBUG_COMPONENT_PART)
-                    # Note: debug_so_match is already set above for BOM processing
-                    
-                    # FIX: Always print debug for every component in BOM if SO matches
-                    if DEBUG_MODE and (debug_part_match or debug_so_match):
-                        print(f"\n=== DEBUG: SO {so} (Parent: {part}) requires component {comp_part} ===")
-                        print(f"  📊 STOCK ALLOCATION CALCULATION for component {comp_part}:")
-                        print(f"    Initial stock:           {stock.get(comp_part, 0):>8}")
-                        print(f"    Committed qty:           {committed_components.get(comp_part, 0) if 'committed_components' in locals() else 0:>8}")
-                        print(f"    Already allocated:       {total_used:>8}")
-                        print(f"    Available for this SO:   {true_available:>8}")
-                        print(f"")
-                        print(f"    Required for SO {so}:    {required_qty:>8}")
-                        print(f"    Would remain after:      {available_after_usage:>8}")
-                        print(f"")
-                        print(f"    ✅ CAN FULFILL ORDER:    {will_be_sufficient}")
-                        if will_be_sufficient:
-                            print(f"    📦 ALLOCATION: {required_qty} units allocated to SO {so}")
-                            print(f"    📦 REMAINING: {available_after_usage} units left in stock")
-                        else:
-                            print(f"    ❌ SHORTAGE: Need {required_qty}, have {true_available}, short {abs(available_after_usage)}")
-                        
-                        # Show detailed calculation breakdown
-                        print(f"\n  🔍 DETAILED CALCULATION BREAKDOWN:")
-                        print(f"    Stock lookup: stock.get('{comp_part}', 0) = {stock.get(comp_part, 0)}")
-                        print(f"    Used lookup: used_components.get('{comp_part}', 0) = {total_used}")
-                        print(f"    Calculation: {stock.get(comp_part, 0)} - {total_used} = {true_available}")
-                        print(f"    Required: {required_qty}")
-                        print(f"    Sufficient: {true_available} >= {required_qty} = {will_be_sufficient}")
-                        
-                        # Show all POs for this part
-                        future_pos = df_pos[
-                            (df_pos['Part Number'].astype(str) == str(comp_part)) &
-                            (pd.to_datetime(df_pos['Promised Due Date'], errors='coerce') >= datetime.now())
-                        ]
-                        if not future_pos.empty:
-                            print(f"\n  📋 Future POs for {comp_part}:")
-                            for _, po_row in future_pos.iterrows():
-                                po_id = po_row['PO Number']
-                                po_qty = po_row['Qty Due']
-                                po_date = pd.to_datetime(po_row['Promised Due Date']).strftime('%Y-%m-%d')
-                                print(f"    PO {po_id}: {po_qty} due {po_date}")
-                        else:
-                            print(f"\n  📋 No future POs found for {comp_part}")
-                        print("-" * 80)
-
-                    component_requirements.append({
-                        'part': comp_part,
-                        'required': required_qty,
-                        'available': available
-                    })
-                    components_needed[comp_part] = required_qty
-
-                    # Check availability but DON'T allocate yet
-                    if not will_be_sufficient:
-                        all_components_available = False
-                        shortage = abs(available_after_usage)  # Changed to use available_after_usage directly
-                        # Search POs for potential resolution
-                        future_pos = df_pos[
-                            (df_pos["Part Number"].astype(str) == comp_part) &
-                            (pd.to_datetime(df_pos["Promised Due Date"], errors="coerce") >= datetime.now())
-                        ]
-                        po_match = None
-                        for _, po_row in future_pos.iterrows():
-                            po_qty = po_row["Qty Due"]
-                            if po_qty >= shortage:
-                                po_match = po_row
-                                break
-                        if po_match is not None:
-                            po_id = po_match["PO Number"]
-                            po_date = pd.to_datetime(po_match["Promised Due Date"]).strftime('%Y-%m-%d')
-                            shortage_details.append(f"{comp_part} short {shortage} – PO {po_id} due {po_date}")
-                        else:
-                            shortage_details.append(f"{comp_part} (need {required_qty}, have {true_available}, short {shortage})")
-                except Exception as e:
-                    all_components_available = False
-                    shortage_details.append(f"Component processing error: {str(e)}")
-                    continue
-
-            # Only after all checks, allocate components if all are available
-            if all_components_available:
-                releasable = True
-                for req in component_requirements:
-                    comp_part = req['part']
-                    required_qty = req['required']
-                    used_components[comp_part] = used_components.get(comp_part, 0) + required_qty
-            else:
-                releasable = False
-
-        elif len(bom) == 0:
-            # This SO has no planned component demand - treat as raw material/purchased part
-            try:
-                total_used = used_components.get(part, 0)
-                true_available = stock.get(part, 0) - total_used  # Changed to use true_available
-                available_after_usage = true_available - demand_qty  # Added to match debug logic
-                
-                # DEBUG: Show allocation calculation for raw material parts (only for raw material orders)
-                debug_part_match = DEBUG_COMPONENT_PART is not None and str(part) == str(DEBUG_COMPONENT_PART)
-                debug_so_match = DEBUG_SO_NUMBER is not None and str(so) == str(DEBUG_SO_NUMBER)
-                
-                if DEBUG_MODE and (debug_part_match or debug_so_match):
-                    print(f"\n=== DEBUG: Raw Material {part} for SO {so} ===")
-                    print(f"  📊 STOCK ALLOCATION CALCULATION:")
-                    print(f"    Initial stock:           {stock.get(part, 0):>8}")
-                    print(f"    Committed qty:           {committed_components.get(part, 0) if 'committed_components' in locals() else 0:>8}")
+                    print(f"\n=== DEBUG: SO {so} (Parent: {part}) requires component {comp_part} ===")
+                    print(f"  📊 STOCK ALLOCATION CALCULATION for component {comp_part}:")
+                    print(f"    Initial stock:           {stock_arr[code]:>8}")
+                    print(f"    Committed qty:           {committed_components.get(comp_part, 0):>8}")
                     print(f"    Already allocated:       {total_used:>8}")
                     print(f"    Available for this SO:   {true_available:>8}")
                     print(f"")
-                    print(f"    Required for SO {so}:    {demand_qty:>8}")
+                    print(f"    Required for SO {so}:    {required_qty:>8}")
                     print(f"    Would remain after:      {available_after_usage:>8}")
                     print(f"")
-                    print(f"    ✅ CAN FULFILL ORDER:    {true_available >= demand_qty}")
-                    
-                    if true_available >= demand_qty:
-                        print(f"    📦 ALLOCATION: {demand_qty} units allocated to SO {so}")
+                    print(f"    ✅ CAN FULFILL ORDER:    {will_be_sufficient}")
+                    if will_be_sufficient:
+                        print(f"    📦 ALLOCATION: {required_qty} units allocated to SO {so}")
                         print(f"    📦 REMAINING: {available_after_usage} units left in stock")
                     else:
-                        print(f"    ❌ SHORTAGE: Need {demand_qty}, have {true_available}, short {abs(available_after_usage)}")
+                        print(f"    ❌ SHORTAGE: Need {required_qty}, have {true_available}, short {abs(available_after_usage)}")
                     
-                    # Show detailed calculation breakdown for raw material
+                    # Show detailed calculation breakdown
                     print(f"\n  🔍 DETAILED CALCULATION BREAKDOWN:")
-                    print(f"    Stock lookup: stock.get('{part}', 0) = {stock.get(part, 0)}")
-                    print(f"    Used lookup: used_components.get('{part}', 0) = {total_used}")
-                    print(f"    Calculation: {stock.get(part, 0)} - {total_used} = {true_available}")
-                    print(f"    Required: {demand_qty}")
-                    print(f"    Sufficient: {true_available} >= {demand_qty} = {true_available >= demand_qty}")
+                    print(f"    Stock lookup: stock_arr[{code}] ('{comp_part}') = {stock_arr[code]}")
+                    print(f"    Used lookup: used_arr[{code}] ('{comp_part}') = {total_used}")
+                    print(f"    Calculation: {stock_arr[code]} - {total_used} = {true_available}")
+                    print(f"    Required: {required_qty}")
+                    print(f"    Sufficient: {true_available} >= {required_qty} = {will_be_sufficient}")
                     
                     # Show all POs for this part
-                    future_pos = df_pos[
-                        (df_pos['Part Number'].astype(str) == str(part)) &
-                        (pd.to_datetime(df_pos['Promised Due Date'], errors='coerce') >= datetime.now())
-                    ]
-                    if not future_pos.empty:
-                        print(f"\n  📋 Future POs for {part}:")
-                        for _, po_row in future_pos.iterrows():
-                            po_id = po_row['PO Number']
-                            po_qty = po_row['Qty Due']
-                            po_date = pd.to_datetime(po_row['Promised Due Date']).strftime('%Y-%m-%d')
+                    part_pos = po_index.get(comp_part, ())
+                    if part_pos:
+                        print(f"\n  📋 Future POs for {comp_part}:")
+                        for po_id, po_date, po_qty in part_pos:
                             print(f"    PO {po_id}: {po_qty} due {po_date}")
                     else:
-                        print(f"\n  📋 No future POs found for {part}")
-                    
+                        print(f"\n  📋 No future POs found for {comp_part}")
                     print("-" * 80)
+            
+            # Check every component first (compiled kernel), allocate only if none are short
+            short_pos = find_shortages(comp_idx, req_arr, stock_arr, used_arr)
+            if len(short_pos) == 0:
+                commit_allocation(comp_idx, req_arr, used_arr)
+                releasable = True
+            else:
+                releasable = False
+                for j in short_pos:
+                    comp_part = comp_parts[j]
+                    required_qty = req_qtys[j]
+                    code = comp_idx[j]
+                    true_available = stock_arr[code] - used_arr[code]
+                    if not float_qty[code]:
+                        true_available = int(true_available)
+                    shortage = abs(true_available - required_qty)
+                    # Search POs for potential resolution
+                    po_match = None
+                    po_reach = po_max_qty.get(comp_part)
+                    if po_reach is not None:
+                        k = int(np.searchsorted(po_reach, shortage))
+                        if k < po_reach.size:
+                            po_id, po_date, _ = po_index[comp_part][k]
+                            po_match = (po_id, po_date)
+                    if po_match is not None:
+                        po_id, po_date = po_match
+                        shortage_details.append(f"{comp_part} short {shortage} – PO {po_id} due {po_date}")
+                    else:
+                        shortage_details.append(f"{comp_part} (need {required_qty}, have {true_available}, short {shortage})")
+                    shortage_parts_only.append(comp_part)
+        
+        else:
+            # This SO has no planned component demand - treat as raw material/purchased part
+            # Every order part has a code in the stock/used arrays, so this can't miss
+            part_idx = part_idx_arr[i]
+            total_used = used_arr[part_idx]
+            true_available = stock_arr[part_idx] - total_used  # Changed to use true_available
+            if not float_qty[part_idx]:
+                true_available = int(true_available)
+            available_after_usage = true_available - demand_qty  # Added to match debug logic
+            
+            # DEBUG: Show allocation calculation for raw material parts (only for raw material orders)
+            debug_part_match = DEBUG_COMPONENT_PART is not None and str(part) == str(DEBUG_COMPONENT_PART)
+            debug_so_match = DEBUG_SO_NUMBER is not None and str(so) == str(DEBUG_SO_NUMBER)
+            
+            if DEBUG_MODE and (debug_part_match or debug_so_match):
+                print(f"\n=== DEBUG: Raw Material {part} for SO {so} ===")
+                print(f"  📊 STOCK ALLOCATION CALCULATION:")
+                print(f"    Initial stock:           {stock_arr[part_idx]:>8}")
+                print(f"    Committed qty:           {committed_components.get(part, 0):>8}")
+                print(f"    Already allocated:       {total_used:>8}")
+                print(f"    Available for this SO:   {true_available:>8}")
+                print(f"")
+                print(f"    Required for SO {so}:    {demand_qty:>8}")
+                print(f"    Would remain after:      {available_after_usage:>8}")
+                print(f"")
+                print(f"    ✅ CAN FULFILL ORDER:    {true_available >= demand_qty}")
                 
-                if true_available >= demand_qty:  # Changed to use true_available
-                    used_components[part] = used_components.get(part, 0) + demand_qty
-                    releasable = True
+                if true_available >= demand_qty:
+                    print(f"    📦 ALLOCATION: {demand_qty} units allocated to SO {so}")
+                    print(f"    📦 REMAINING: {available_after_usage} units left in stock")
                 else:
-                    releasable = False
-                    shortage = abs(available_after_usage)  # Changed to use available_after_usage
-                    shortage_details.append(f"{part} (need {demand_qty}, have {true_available}, short {shortage})")
-            except:
+                    print(f"    ❌ SHORTAGE: Need {demand_qty}, have {true_available}, short {abs(available_after_usage)}")
+                
+                # Show detailed calculation breakdown for raw material
+                print(f"\n  🔍 DETAILED CALCULATION BREAKDOWN:")
+                print(f"    Stock lookup: stock_arr[{part_idx}] ('{part}') = {stock_arr[part_idx]}")
+                print(f"    Used lookup: used_arr[{part_idx}] ('{part}') = {total_used}")
+                print(f"    Calculation: {stock_arr[part_idx]} - {total_used} = {true_available}")
+                print(f"    Required: {demand_qty}")
+                print(f"    Sufficient: {true_available} >= {demand_qty} = {true_available >= demand_qty}")
+                
+                # Show all POs for this part
+                part_pos = po_index.get(part, ())
+                if part_pos:
+                    print(f"\n  📋 Future POs for {part}:")
+                    for po_id, po_date, po_qty in part_pos:
+                        print(f"    PO {po_id}: {po_qty} due {po_date}")
+                else:
+                    print(f"\n  📋 No future POs found for {part}")
+                
+                print("-" * 80)
+            
+            if true_available >= demand_qty:  # Changed to use true_available
+                used_arr[part_idx] += demand_qty
+                if demand_is_float:
+                    float_qty[part_idx] = True
+                releasable = True
+            else:
                 releasable = False
-                shortage_details.append(f"{part} (stock lookup failed)")
-
+                shortage = abs(available_after_usage)  # Changed to use available_after_usage
+                shortage_details.append(f"{part} (need {demand_qty}, have {true_available}, short {shortage})")
+                shortage_parts_only.append(part)
+        
         # Build result record
-        shortage_parts_only = []
         components_info = "; ".join(shortage_details) if shortage_details else str(components_needed) if components_needed else "-"
-
-        # Extract just the part numbers from shortage details
-        for detail in shortage_details:
-            if " short " in detail and "–" in detail:
-                part_short = detail.split(" short ")[0].strip()
-                shortage_parts_only.append(part_short)
-            elif "(" in detail and " (need " in detail:
-                part_short = detail.split(" (need ")[0].strip()
-                shortage_parts_only.append(part_short)
-            elif "(" in detail:
-                part_short = detail.split("(")[0].strip()
-                shortage_parts_only.append(part_short)
-            else:
-                part_short = detail.split()[0] if detail.split() else detail
-                shortage_parts_only.append(part_short)
-
+        
         clean_shortages = "; ".join(shortage_parts_only) if shortage_parts_only else "-"
-
+        
         # DEBUG: Show final order decision
         if DEBUG_MODE and (debug_so_match or debug_part_match):
             print(f"\n  🎯 FINAL ORDER DECISION:")
@@ -889,62 +990,78 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
                 print(f"    Reason: {shortage_details[0] if shortage_details else 'Unknown'}")
             print(f"    Components needed: {components_needed if components_needed else 'None (raw material)'}")
             print("=" * 80)
-
-        results.append({
-            "SO Number": so,
-            "Part": part,
-            "Planner": planner,
-            "Start Date": start_date.strftime('%Y-%m-%d') if pd.notna(start_date) else "No Date",
-            "PB": is_pb,
-            "Demand": demand_qty,
-            "Hours": round(labor_hours, 4),
-            "Status": "✅ Release" if releasable else "❌ Hold",
-            "Shortages": clean_shortages,
-            "Components": components_info
-        })
-
-    # Calculate summary metrics
-    df_results = pd.DataFrame(results)
-    total_orders = len(df_results)
-    releasable_count = len(df_results[df_results['Status'] == '✅ Release'])
+        
+        part_out[i] = part
+        pb_out[i] = is_pb
+        hours_out[i] = round(labor_hours, 4)
+        status_out[i] = "✅ Release" if releasable else "❌ Hold"
+        release_mask[i] = releasable
+        shortages_out[i] = clean_shortages
+        components_out[i] = components_info
+    
+    # Calculate summary metrics from the result arrays; df_results is only needed for the export
+    demand_out = np.where(demand_arr > 0, demand_arr, 0)
+    df_results = pd.DataFrame({
+        "SO Number": so_out,
+        "Part": part_out,
+        "Planner": planner_arr,
+        "Start Date": start_date_arr,
+        "PB": pb_out,
+        "Demand": demand_out,
+        "Hours": hours_out,
+        "Status": status_out,
+        "Shortages": shortages_out,
+        "Components": components_out
+    })
+    hold_mask = ~(release_mask | skipped_mask)
+    total_orders = total
+    releasable_count = int(np.count_nonzero(release_mask))
     held_count = total_orders - releasable_count
-    pb_count = len(df_results[df_results['PB'] == 'PB'])
-    skipped_count = len(df_results[df_results['Status'] == '⚠️ Skipped'])
+    pb_count = int(np.count_nonzero(pb_arr & ~skipped_mask))
+    skipped_count = int(np.count_nonzero(skipped_mask))
     
-    total_hours = df_results['Hours'].sum()
-    releasable_hours = df_results[df_results['Status'] == '✅ Release']['Hours'].sum()
-    held_hours = df_results[df_results['Status'] == '❌ Hold']['Hours'].sum()
+    total_hours = hours_out.sum()
+    releasable_hours = hours_out[release_mask].sum()
+    held_hours = hours_out[hold_mask].sum()
     
     # Calculate quantity metrics
-    total_qty = df_results['Demand'].sum()
-    releasable_qty = df_results[df_results['Status'] == '✅ Release']['Demand'].sum()
-    held_qty = df_results[df_results['Status'] == '❌ Hold']['Demand'].sum()
+    total_qty = demand_out.sum()
+    releasable_qty = demand_out[release_mask].sum()
+    held_qty = demand_out[hold_mask].sum()
+    
+    # Count/hours/qty per planner code in one bincount pass each, for all orders and for releasable orders
+    planner_codes, planner_names = pd.factorize(planner_arr)
+    planner_pos = {name: k for k, name in enumerate(planner_names)}
+    n_planners = len(planner_names)
+    released_codes = planner_codes[release_mask]
+    planner_totals = (
+        np.bincount(planner_codes, minlength=n_planners),
+        np.bincount(planner_codes, weights=hours_out, minlength=n_planners),
+        np.bincount(planner_codes, weights=demand_out, minlength=n_planners)
+    )
+    planner_released = (
+        np.bincount(released_codes, minlength=n_planners),
+        np.bincount(released_codes, weights=hours_out[release_mask], minlength=n_planners),
+        np.bincount(released_codes, weights=demand_out[release_mask], minlength=n_planners)
+    )
+    # bincount weights are float; keep whole-number demand as ints for display
+    qty_type = int if demand_out.dtype.kind in "iub" else float
     
-    # Calculate Kit and Instrument metrics with subcategories
-    releasable_results = df_results[df_results['Status'] == '✅ Release']
-    held_results = df_results[df_results['Status'] == '❌ Hold']
+    def planner_metrics(planners, sums):
+        """Return (count, hours, qty) summed over the given planner codes"""
+        slots = [planner_pos[p] for p in planners if p in planner_pos]
+        counts, hours, qtys = sums
+        return int(counts[slots].sum()), hours[slots].sum(), qty_type(qtys[slots].sum())
     
     # BVI Kits (Planner codes 3001, 3801)
     bvi_kit_planners = ['3001', '3801']
-    total_bvi_kits = df_results[df_results['Planner'].isin(bvi_kit_planners)]
-    releasable_bvi_kits = releasable_results[releasable_results['Planner'].isin(bvi_kit_planners)]
-    total_bvi_kits_count = len(total_bvi_kits)
-    total_bvi_kits_hours = total_bvi_kits['Hours'].sum()
-    total_bvi_kits_qty = total_bvi_kits['Demand'].sum()
-    releasable_bvi_kits_count = len(releasable_bvi_kits)
-    releasable_bvi_kits_hours = releasable_bvi_kits['Hours'].sum()
-    releasable_bvi_kits_qty = releasable_bvi_kits['Demand'].sum()
+    total_bvi_kits_count, total_bvi_kits_hours, total_bvi_kits_qty = planner_metrics(bvi_kit_planners, planner_totals)
+    releasable_bvi_kits_count, releasable_bvi_kits_hours, releasable_bvi_kits_qty = planner_metrics(bvi_kit_planners, planner_released)
     
     # Malosa Kits (Planner code 5001)
     malosa_kit_planners = ['5001']
-    total_malosa_kits = df_results[df_results['Planner'].isin(malosa_kit_planners)]
-    releasable_malosa_kits = releasable_results[releasable_results['Planner'].isin(malosa_kit_planners)]
-    total_malosa_kits_count = len(total_malosa_kits)
-    total_malosa_kits_hours = total_malosa_kits['Hours'].sum()
-    total_malosa_kits_qty = total_malosa_kits['Demand'].sum()
-    releasable_malosa_kits_count = len(releasable_malosa_kits)
-    releasable_malosa_kits_hours = releasable_malosa_kits['Hours'].sum()
-    releasable_malosa_kits_qty = releasable_malosa_kits['Demand'].sum()
+    total_malosa_kits_count, total_malosa_kits_hours, total_malosa_kits_qty = planner_metrics(malosa_kit_planners, planner_totals)
+    releasable_malosa_kits_count, releasable_malosa_kits_hours, releasable_malosa_kits_qty = planner_metrics(malosa_kit_planners, planner_released)
     
     # Total Kits
     total_kits_count = total_bvi_kits_count + total_malosa_kits_count
@@ -956,69 +1073,33 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
     
     # Manufacturing (Planner code 3802)
     manufacturing_planners = ['3802']
-    total_manufacturing = df_results[df_results['Planner'].isin(manufacturing_planners)]
-    releasable_manufacturing = releasable_results[releasable_results['Planner'].isin(manufacturing_planners)]
-    total_manufacturing_count = len(total_manufacturing)
-    total_manufacturing_hours = total_manufacturing['Hours'].sum()
-    total_manufacturing_qty = total_manufacturing['Demand'].sum()
-    releasable_manufacturing_count = len(releasable_manufacturing)
-    releasable_manufacturing_hours = releasable_manufacturing['Hours'].sum()
-    releasable_manufacturing_qty = releasable_manufacturing['Demand'].sum()
+    total_manufacturing_count, total_manufacturing_hours, total_manufacturing_qty = planner_metrics(manufacturing_planners, planner_totals)
+    releasable_manufacturing_count, releasable_manufacturing_hours, releasable_manufacturing_qty = planner_metrics(manufacturing_planners, planner_released)
     
     # Assembly (Planner code 3803)
     assembly_planners = ['3803']
-    total_assembly = df_results[df_results['Planner'].isin(assembly_planners)]
-    releasable_assembly = releasable_results[releasable_results['Planner'].isin(assembly_planners)]
-    total_assembly_count = len(total_assembly)
-    total_assembly_hours = total_assembly['Hours'].sum()
-    total_assembly_qty = total_assembly['Demand'].sum()
-    releasable_assembly_count = len(releasable_assembly)
-    releasable_assembly_hours = releasable_assembly['Hours'].sum()
-    releasable_assembly_qty = releasable_assembly['Demand'].sum()
+    total_assembly_count, total_assembly_hours, total_assembly_qty = planner_metrics(assembly_planners, planner_totals)
+    releasable_assembly_count, releasable_assembly_hours, releasable_assembly_qty = planner_metrics(assembly_planners, planner_released)
     
     # Packaging (Planner code 3804)
     packaging_planners = ['3804']
-    total_packaging = df_results[df_results['Planner'].isin(packaging_planners)]
-    releasable_packaging = releasable_results[releasable_results['Planner'].isin(packaging_planners)]
-    total_packaging_count = len(total_packaging)
-    total_packaging_hours = total_packaging['Hours'].sum()
-    total_packaging_qty = total_packaging['Demand'].sum()
-    releasable_packaging_count = len(releasable_packaging)
-    releasable_packaging_hours = releasable_packaging['Hours'].sum()
-    releasable_packaging_qty = releasable_packaging['Demand'].sum()
+    total_packaging_count, total_packaging_hours, total_packaging_qty = planner_metrics(packaging_planners, planner_totals)
+    releasable_packaging_count, releasable_packaging_hours, releasable_packaging_qty = planner_metrics(packaging_planners, planner_released)
     
     # Malosa Instruments (Planner code 3805)
     malosa_instrument_planners = ['3805']
-    total_malosa_instruments = df_results[df_results['Planner'].isin(malosa_instrument_planners)]
-    releasable_malosa_instruments = releasable_results[releasable_results['Planner'].isin(malosa_instrument_planners)]
-    total_malosa_instruments_count = len(total_malosa_instruments)
-    total_malosa_instruments_hours = total_malosa_instruments['Hours'].sum()
-    total_malosa_instruments_qty = total_malosa_instruments['Demand'].sum()
-    releasable_malosa_instruments_count = len(releasable_malosa_instruments)
-    releasable_malosa_instruments_hours = releasable_malosa_instruments['Hours'].sum()
-    releasable_malosa_instruments_qty = releasable_malosa_instruments['Demand'].sum()
+    total_malosa_instruments_count, total_malosa_instruments_hours, total_malosa_instruments_qty = planner_metrics(malosa_instrument_planners, planner_totals)
+    releasable_malosa_instruments_count, releasable_malosa_instruments_hours, releasable_malosa_instruments_qty = planner_metrics(malosa_instrument_planners, planner_released)
     
     # Virtuoso (Planner code 3806)
     virtuoso_planners = ['3806']
-    total_virtuoso = df_results[df_results['Planner'].isin(virtuoso_planners)]
-    releasable_virtuoso = releasable_results[releasable_results['Planner'].isin(virtuoso_planners)]
-    total_virtuoso_count = len(total_virtuoso)
-    total_virtuoso_hours = total_virtuoso['Hours'].sum()
-    total_virtuoso_qty = total_virtuoso['Demand'].sum()
-    releasable_virtuoso_count = len(releasable_virtuoso)
-    releasable_virtuoso_hours = releasable_virtuoso['Hours'].sum()
-    releasable_virtuoso_qty = releasable_virtuoso['Demand'].sum()
+    total_virtuoso_count, total_virtuoso_hours, total_virtuoso_qty = planner_metrics(virtuoso_planners, planner_totals)
+    releasable_virtuoso_count, releasable_virtuoso_hours, releasable_virtuoso_qty = planner_metrics(virtuoso_planners, planner_released)
     
     # Kit Samples (Planner code KIT SAMPLES)
     kit_samples_planners = ['KIT SAMPLES']
-    total_kit_samples = df_results[df_results['Planner'].isin(kit_samples_planners)]
-    releasable_kit_samples = releasable_results[releasable_results['Planner'].isin(kit_samples_planners)]
-    total_kit_samples_count = len(total_kit_samples)
-    total_kit_samples_hours = total_kit_samples['Hours'].sum()
-    total_kit_samples_qty = total_kit_samples['Demand'].sum()
-    releasable_kit_samples_count = len(releasable_kit_samples)
-    releasable_kit_samples_hours = releasable_kit_samples['Hours'].sum()
-    releasable_kit_samples_qty = releasable_kit_samples['Demand'].sum()
+    total_kit_samples_count, total_kit_samples_hours, total_kit_samples_qty = planner_metrics(kit_samples_planners, planner_totals)
+    releasable_kit_samples_count, releasable_kit_samples_hours, releasable_kit_samples_qty = planner_metrics(kit_samples_planners, planner_released)
     
     # Total Instruments
     total_instruments_count = (total_manufacturing_count + total_assembly_count + 
@@ -1049,7 +1130,8 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
         if DEBUG_COMPONENT_PART is not None:
             debug_part = str(DEBUG_COMPONENT_PART)
             initial_stock = stock.get(debug_part, 0)
-            final_used = used_components.get(debug_part, 0)
+            debug_code = part_index.get_indexer([debug_part])[0]
+            final_used = used_arr[debug_code] if debug_code >= 0 else 0
             remaining_stock = initial_stock - final_used
             
             print(f"\n  🎯 DEBUG COMPONENT SUMMARY ({debug_part}):")
@@ -1062,28 +1144,18 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
             # Show all Shop Orders that tried to allocate this component
             print(f"\n  📋 ALL SHOP ORDERS THAT TRIED TO ALLOCATE {debug_part}:")
             component_allocation_count = 0
-            for result in results:
-                result_so = result["SO Number"]
-                result_part = result["Part"]
-                result_status = result["Status"]
-                
+            for result_so, result_part, result_status in zip(so_out, part_out, status_out):
                 # Check if this SO directly uses the component as parent part
                 if str(result_part) == debug_part:
                     component_allocation_count += 1
                     print(f"    {component_allocation_count:2d}. SO {result_so}: Direct use as parent part - {result_status}")
                 else:
                     # Check if this SO's BOM contains the component
-                    try:
-                        bom_check = planned_demand[planned_demand["SO Number"] == result_so]
-                        if not bom_check.empty:
-                            bom_components = bom_check["Component Part Number"].astype(str).tolist()
-                            if debug_part in bom_components:
-                                component_allocation_count += 1
-                                comp_row = bom_check[bom_check["Component Part Number"].astype(str) == debug_part].iloc[0]
-                                comp_qty = comp_row["Component Qty Required"]
-                                print(f"    {component_allocation_count:2d}. SO {result_so} (Parent: {result_part}): Requires {comp_qty} units - {result_status}")
-                    except:
-                        pass
+                    bom_check = bom_groups.get(result_so)
+                    if bom_check is not None and debug_part in bom_check[0]:
+                        component_allocation_count += 1
+                        comp_qty = bom_check[3][bom_check[0].index(debug_part)]
+                        print(f"    {component_allocation_count:2d}. SO {result_so} (Parent: {result_part}): Requires {comp_qty} units - {result_status}")
             
             if component_allocation_count == 0:
                 print(f"    No Shop Orders found that use component {debug_part}")
@@ -1182,6 +1254,16 @@ def process_single_scenario(filepath, scenario_name, status_callback=None, scena
         }
     }
 
+def run_strategy_in_worker(filepath, scenario_name, sorting_strategy, category_options, workbook):
+    """Run one min/max strategy in a pool process and return (scenario, duration, phase timings)"""
+    # Pool processes are reused, so only this strategy's timings go back to the parent tracker
+    performance_tracker.phases.clear()
+    performance_tracker.memory_usage.clear()
+    
+    start_time = time.time()
+    scenario_result = process_single_scenario(filepath, scenario_name, sorting_strategy=sorting_strategy, workbook=workbook, **category_options)
+    return scenario_result, time.time() - start_time, performance_tracker.phases
+
 def load_and_process_files():
     # Multiple file selection
     filepaths = filedialog.askopenfilenames(
@@ -1193,29 +1275,77 @@ def load_and_process_files():
         status_var.set("🔄 Ready - Select Excel file(s) to begin processing")
         return
 
-    try:
-        # Clear the UI and start fresh
-        status_var.set("🔄 Initializing...")
-        root.update_idletasks()
+    # Clear the UI and start fresh
+    status_var.set("🔄 Initializing...")
+    main_frame.configure(style='TFrame')
+    process_btn.config(state='disabled')
+    
+    # Read the Tk variables here; the worker thread must not touch widgets
+    options = {
+        'minmax_mode': minmax_var.get(),
+        'no_export': no_export_var.get(),
+        'include_kits': include_kits_var.get(),
+        'include_instruments': include_instruments_var.get(),
+        'include_virtuoso': include_virtuoso_var.get(),
+        'include_kit_samples': include_kit_samples_var.get()
+    }
+    
+    progress_queue = queue.Queue()
+    threading.Thread(target=run_processing, args=(filepaths, options, progress_queue), daemon=True).start()
+    root.after(50, drain_progress_queue, progress_queue)
+
+def drain_progress_queue(progress_queue):
+    """Apply queued worker messages on the Tk thread, showing only the latest status"""
+    latest_status = None
+    while True:
+        try:
+            kind, payload = progress_queue.get_nowait()
+        except queue.Empty:
+            break
         
+        if kind == 'status':
+            latest_status = payload
+        elif kind == 'done':
+            summary_text, status_text = payload
+            results_text.delete(1.0, tk.END)
+            results_text.insert(1.0, summary_text)
+            status_var.set(status_text)
+            main_frame.configure(style='Success.TFrame')
+            process_btn.config(state='normal')
+            return
+        elif kind == 'error':
+            messagebox.showerror("Error", f"Processing failed:\n\n{payload}")
+            status_var.set("❌ Processing failed")
+            process_btn.config(state='normal')
+            return
+    
+    if latest_status is not None:
+        status_var.set(latest_status)
+    root.after(50, drain_progress_queue, progress_queue)
+
+def run_processing(filepaths, options, progress_queue):
+    """Run all scenarios and the export on a worker thread, posting progress to progress_queue"""
+    minmax_mode = options['minmax_mode']
+    include_kits = options['include_kits']
+    include_instruments = options['include_instruments']
+    include_virtuoso = options['include_virtuoso']
+    include_kit_samples = options['include_kit_samples']
+    
+    try:
         # Reset performance tracker for this run
         performance_tracker.cleanup()
         performance_tracker.phases.clear()
         performance_tracker.memory_usage.clear()
         
         start_time = time.time()
-        main_frame.configure(style='TFrame')
         
         scenarios = []
         scenarios_for_comparison = []  # Will store all tested scenarios for comparison tables
+        strategy_extremes = {}  # filepath -> (best orders, best hours, best qty, worst orders), min/max mode only
         
-        # Progress callback function that updates UI immediately
+        # Progress callback hands messages to the Tk thread through the queue
         def update_progress(message):
-            status_var.set(message)
-            root.update_idletasks()
-        
-        # Determine processing mode
-        minmax_mode = minmax_var.get()
+            progress_queue.put(('status', message))
         
         if minmax_mode:
             # Min/Max optimization mode - test all sorting strategies
@@ -1223,90 +1353,100 @@ def load_and_process_files():
             total_scenarios = len(filepaths) * len(strategies)
             
             update_progress(f"🔥 MIN/MAX MODE: Testing {len(strategies)} sorting strategies on {len(filepaths)} file(s) = {total_scenarios} total scenarios")
-            time.sleep(1)
             
             scenario_num = 0
             all_strategy_results = []  # Store ALL results for comparison
+            category_options = {
+                'include_kits': include_kits,
+                'include_instruments': include_instruments,
+                'include_virtuoso': include_virtuoso,
+                'include_kit_samples': include_kit_samples
+            }
             
-            for file_idx, filepath in enumerate(filepaths):
-                filename = os.path.basename(filepath)
-                base_filename = filename.replace('.xlsm', '').replace('.xlsx', '')
-                file_strategy_results = []  # Results for this specific file
-                
-                for strategy_idx, strategy in enumerate(strategies):
-                    scenario_num += 1
-                    scenario_name = f"{base_filename}_{strategy['name'].replace(' ', '_').replace('(', '').replace(')', '')}"
+            # Strategies are independent once a workbook is parsed, so they run across CPU cores.
+            # spawn keeps the pool away from the Tk process state on every platform.
+            max_workers = min(len(strategies), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                for file_idx, filepath in enumerate(filepaths):
+                    filename = os.path.basename(filepath)
+                    base_filename = filename.replace('.xlsm', '').replace('.xlsx', '')
+                    file_strategy_results = [None] * len(strategies)  # Results for this file, in strategy order
                     
-                    # Process with specific sorting strategy
-                    scenario_start_time = time.time()
-                    scenario_result = process_single_scenario(
-                        filepath, scenario_name, update_progress, 
-                        scenario_num, total_scenarios, strategy,
-                        include_kits=include_kits_var.get(),
-                        include_instruments=include_instruments_var.get(),
-                        include_virtuoso=include_virtuoso_var.get(),
-                        include_kit_samples=include_kit_samples_var.get()
-                    )
-                    scenario_end_time = time.time()
-                    scenario_duration = scenario_end_time - scenario_start_time
+                    # Parse the workbook once; every strategy below re-sorts and re-allocates the same sheets
+                    update_progress(f"📂 [File {file_idx+1}/{len(filepaths)}] Loading sheets for {filename}...")
+                    workbook = load_workbook(filepath)
                     
-                    # Store result for this file
-                    file_strategy_results.append(scenario_result)
-                    all_strategy_results.append(scenario_result)
+                    futures = {}
+                    for strategy_idx, strategy in enumerate(strategies):
+                        scenario_name = f"{base_filename}_{strategy['name'].replace(' ', '_').replace('(', '').replace(')', '')}"
+                        future = executor.submit(run_strategy_in_worker, filepath, scenario_name, strategy, category_options, workbook)
+                        futures[future] = strategy_idx
                     
-                    # Show completion
-                    metrics = scenario_result['metrics']
-                    remaining_scenarios = total_scenarios - scenario_num
-                    
-                    if remaining_scenarios > 0:
-                        total_elapsed = time.time() - start_time
-                        avg_time_per_scenario = total_elapsed / scenario_num
-                        estimated_remaining = remaining_scenarios * avg_time_per_scenario
+                    # Collect in completion order for progress; results are stored by strategy position
+                    for future in as_completed(futures):
+                        strategy_idx = futures[future]
+                        strategy = strategies[strategy_idx]
+                        scenario_result, scenario_duration, worker_phases = future.result()
+                        scenario_num += 1
                         
-                        update_progress(f"✅ [{scenario_num}/{total_scenarios}] {strategy['name']}: {metrics['releasable_count']:,}/{metrics['total_orders']:,} orders ({scenario_duration:.1f}s) | {estimated_remaining:.0f}s remaining")
-                    else:
-                        update_progress(f"✅ [{scenario_num}/{total_scenarios}] {strategy['name']}: {metrics['releasable_count']:,}/{metrics['total_orders']:,} orders ({scenario_duration:.1f}s) | OPTIMIZATION COMPLETE!")
+                        # Fold the worker's phase timings into this process's performance report
+                        for phase, times in worker_phases.items():
+                            performance_tracker.phases.setdefault(phase, []).extend(times)
+                        
+                        # Store result for this file
+                        file_strategy_results[strategy_idx] = scenario_result
+                        
+                        # Show completion
+                        metrics = scenario_result['metrics']
+                        remaining_scenarios = total_scenarios - scenario_num
+                        
+                        if remaining_scenarios > 0:
+                            total_elapsed = time.time() - start_time
+                            avg_time_per_scenario = total_elapsed / scenario_num
+                            estimated_remaining = remaining_scenarios * avg_time_per_scenario
+                            
+                            update_progress(f"✅ [{scenario_num}/{total_scenarios}] {strategy['name']}: {metrics['releasable_count']:,}/{metrics['total_orders']:,} orders ({scenario_duration:.1f}s) | {estimated_remaining:.0f}s remaining")
+                        else:
+                            update_progress(f"✅ [{scenario_num}/{total_scenarios}] {strategy['name']}: {metrics['releasable_count']:,}/{metrics['total_orders']:,} orders ({scenario_duration:.1f}s) | OPTIMIZATION COMPLETE!")
                     
-                    time.sleep(0.2)  # Brief pause between strategies
-                
-                # After testing all strategies for this file, find the best ones
-                best_orders_strategy = max(file_strategy_results, key=lambda s: s['metrics']['releasable_count'])
-                best_hours_strategy = max(file_strategy_results, key=lambda s: s['metrics']['releasable_hours'])
-                best_qty_strategy = max(file_strategy_results, key=lambda s: s['metrics']['releasable_qty'])
-                
-                # Create NEW scenario objects with clear names for the best strategies
-                # Best Orders Strategy
-                best_orders_scenario = {
-                    'name': f"BEST_ORDERS_{base_filename}",
-                    'filepath': filepath,
-                    'sorting_strategy': f"🏆 BEST ORDERS: {best_orders_strategy['sorting_strategy']}",
-                    'results_df': best_orders_strategy['results_df'],
-                    'metrics': best_orders_strategy['metrics']
-                }
-                scenarios.append(best_orders_scenario)
-                
-                # Best Hours Strategy
-                best_hours_scenario = {
-                    'name': f"BEST_HOURS_{base_filename}",
-                    'filepath': filepath,
-                    'sorting_strategy': f"🏆 BEST HOURS: {best_hours_strategy['sorting_strategy']}",
-                    'results_df': best_hours_strategy['results_df'],
-                    'metrics': best_hours_strategy['metrics']
-                }
-                scenarios.append(best_hours_scenario)
-                
-                # Best Quantity Strategy
-                best_qty_scenario = {
-                    'name': f"BEST_QTY_{base_filename}",
-                    'filepath': filepath,
-                    'sorting_strategy': f"🏆 BEST QTY: {best_qty_strategy['sorting_strategy']}",
-                    'results_df': best_qty_strategy['results_df'],
-                    'metrics': best_qty_strategy['metrics']
-                }
-                scenarios.append(best_qty_scenario)
-                
-                update_progress(f"🏆 File {file_idx+1}/{len(filepaths)} optimized: Orders={best_orders_strategy['sorting_strategy']} ({best_orders_strategy['metrics']['releasable_count']:,}), Hours={best_hours_strategy['sorting_strategy']} ({best_hours_strategy['metrics']['releasable_hours']:,.0f}), Qty={best_qty_strategy['sorting_strategy']} ({best_qty_strategy['metrics']['releasable_qty']:,})")
-                time.sleep(0.5)
+                    all_strategy_results.extend(file_strategy_results)
+                    
+                    # After testing all strategies for this file, find the best ones (and the worst, for the summary)
+                    strategy_extremes[filepath] = find_strategy_extremes(file_strategy_results)
+                    best_orders_strategy, best_hours_strategy, best_qty_strategy, _ = strategy_extremes[filepath]
+                    
+                    # Create NEW scenario objects with clear names for the best strategies
+                    # Best Orders Strategy
+                    best_orders_scenario = {
+                        'name': f"BEST_ORDERS_{base_filename}",
+                        'filepath': filepath,
+                        'sorting_strategy': f"🏆 BEST ORDERS: {best_orders_strategy['sorting_strategy']}",
+                        'results_df': best_orders_strategy['results_df'],
+                        'metrics': best_orders_strategy['metrics']
+                    }
+                    scenarios.append(best_orders_scenario)
+                    
+                    # Best Hours Strategy
+                    best_hours_scenario = {
+                        'name': f"BEST_HOURS_{base_filename}",
+                        'filepath': filepath,
+                        'sorting_strategy': f"🏆 BEST HOURS: {best_hours_strategy['sorting_strategy']}",
+                        'results_df': best_hours_strategy['results_df'],
+                        'metrics': best_hours_strategy['metrics']
+                    }
+                    scenarios.append(best_hours_scenario)
+                    
+                    # Best Quantity Strategy
+                    best_qty_scenario = {
+                        'name': f"BEST_QTY_{base_filename}",
+                        'filepath': filepath,
+                        'sorting_strategy': f"🏆 BEST QTY: {best_qty_strategy['sorting_strategy']}",
+                        'results_df': best_qty_strategy['results_df'],
+                        'metrics': best_qty_strategy['metrics']
+                    }
+                    scenarios.append(best_qty_scenario)
+                    
+                    update_progress(f"🏆 File {file_idx+1}/{len(filepaths)} optimized: Orders={best_orders_strategy['sorting_strategy']} ({best_orders_strategy['metrics']['releasable_count']:,}), Hours={best_hours_strategy['sorting_strategy']} ({best_hours_strategy['metrics']['releasable_hours']:,.0f}), Qty={best_qty_strategy['sorting_strategy']} ({best_qty_strategy['metrics']['releasable_qty']:,})")
             
             # Use all_strategy_results for comparison tables
             scenarios_for_comparison = all_strategy_results
@@ -1333,10 +1473,10 @@ def load_and_process_files():
                 scenario_start_time = time.time()
                 scenario_result = process_single_scenario(
                     filepath, scenario_name, update_progress, scenario_num, len(filepaths),
-                    include_kits=include_kits_var.get(),
-                    include_instruments=include_instruments_var.get(),
-                    include_virtuoso=include_virtuoso_var.get(),
-                    include_kit_samples=include_kit_samples_var.get()
+                    include_kits=include_kits,
+                    include_instruments=include_instruments,
+                    include_virtuoso=include_virtuoso,
+                    include_kit_samples=include_kit_samples
                 )
                 scenario_end_time = time.time()
                 scenario_duration = scenario_end_time - scenario_start_time
@@ -1356,12 +1496,16 @@ def load_and_process_files():
                     update_progress(f"✅ [Scenario {scenario_num}/{len(filepaths)}] Complete: {metrics['releasable_count']:,}/{metrics['total_orders']:,} releasable ({scenario_duration:.1f}s) | Est. {estimated_remaining:.0f}s for {remaining_scenarios} remaining scenarios")
                 else:
                     update_progress(f"✅ [Scenario {scenario_num}/{len(filepaths)}] Complete: {metrics['releasable_count']:,}/{metrics['total_orders']:,} releasable ({scenario_duration:.1f}s) | COMPLETE!")
-                
-                time.sleep(0.3)
         
         # Calculate total processing time
         end_time = time.time()
         processing_time = end_time - start_time
+        # Counts reused by the Summary sheet, the summary text and the status bar
+        strategy_count = len(get_sorting_strategies())
+        comparison_count = len(scenarios_for_comparison)
+        scenario_count = len(scenarios)
+        # Display names per source file, shared by the comparison sheet and the summary text
+        basenames = {fp: os.path.basename(fp) for fp in dict.fromkeys(s['filepath'] for s in scenarios_for_comparison)}
         
         # Helper function to aggregate metrics from a list of scenarios
         def aggregate_metrics(scenario_list, is_min_max_mode_for_totals=False):
@@ -1429,7 +1573,7 @@ def load_and_process_files():
                 source_metrics = aggregate_metrics(best_orders_scenarios, is_min_max_mode_for_totals=True)
             else: # Standard mode
                 total_orders_processed = sum(s['metrics']['total_orders'] for s in scenarios)
-                if len(scenarios) == 1:
+                if scenario_count == 1:
                     source_metrics = scenarios[0]['metrics']
                 else: # Standard mode, multiple files
                     source_metrics = aggregate_metrics(scenarios)
@@ -1437,34 +1581,37 @@ def load_and_process_files():
         orders_per_second = total_orders_processed / processing_time if processing_time > 0 else 0
         
         # Save results
-        if not no_export_var.get():
+        if not options['no_export']:
             # Save results
             output_dir = os.path.dirname(filepaths[0])
             timestamp = datetime.now().strftime('%Y%m%d_%H%M')
             
             if minmax_mode:
                 output_file = os.path.join(output_dir, f"MinMax_Optimization_Analysis_{VERSION}_{timestamp}.xlsx")
-            elif len(scenarios) > 1:
+            elif scenario_count > 1:
                 output_file = os.path.join(output_dir, f"Multi_Scenario_Analysis_{VERSION}_{timestamp}.xlsx")
             else:
                 output_file = os.path.join(output_dir, f"Material_Release_Plan_{VERSION}_{timestamp}.xlsx")
             
-            status_var.set("💾 Saving optimization results...")
-            root.update_idletasks()
+            update_progress("💾 Saving optimization results...")
             
             # Create summary sheet
+            # Values needing a branch or a join are worked out once, ahead of the (Metric, Value) rows
+            timed_count = comparison_count if minmax_mode else scenario_count
+            avg_time_text = f"{processing_time/timed_count:.2f}" if timed_count else "N/A"
+            processed_file_names = "; ".join(os.path.basename(f) for f in files_processed_list_for_summary)
             summary_items = [
                 ('Tool Version', f"{VERSION} ({VERSION_DATE})"),
                 ('Processing Date', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
                 ('Processing Mode', "Min/Max Optimization" if minmax_mode else "Standard"),
                 ('Files Processed Count', len(files_processed_list_for_summary)),
-                ('Strategies Tested / Scenarios', len(scenarios_for_comparison) if minmax_mode else len(scenarios)),
-                ('Optimal Strategies / Scenarios Saved', len(scenarios)),
+                ('Strategies Tested / Scenarios', comparison_count if minmax_mode else scenario_count),
+                ('Optimal Strategies / Scenarios Saved', scenario_count),
                 ('--- Material Categories Processed ---', '---'),
-                ('Kits Included', "Yes" if include_kits_var.get() else "No"),
-                ('Instruments Included', "Yes" if include_instruments_var.get() else "No"),
-                ('Virtuoso Included', "Yes" if include_virtuoso_var.get() else "No"),
-                ('Kit Samples Included', "Yes" if include_kit_samples_var.get() else "No"),
+                ('Kits Included', "Yes" if include_kits else "No"),
+                ('Instruments Included', "Yes" if include_instruments else "No"),
+                ('Virtuoso Included', "Yes" if include_virtuoso else "No"),
+                ('Kit Samples Included', "Yes" if include_kit_samples else "No"),
                 ('--- Overall Performance ---', '---'),
                 ('Total Orders Processed', f"{total_orders_processed:,}"),
                 ('Total Demand Quantity', f"{source_metrics.get('total_qty', 0):,}"),
@@ -1532,19 +1679,17 @@ def load_and_process_files():
                 ('--- Processing Performance ---', '---'),
                 ('Total Processing Time (seconds)', f"{processing_time:.2f}"),
                 ('Processing Speed (orders/second)', f"{orders_per_second:.1f}"),
-                ('Avg Time per Strategy/Scenario (seconds)', f"{processing_time/len(scenarios_for_comparison):.2f}" if minmax_mode and scenarios_for_comparison else (f"{processing_time/len(scenarios):.2f}" if scenarios else "N/A")),
-                ('Processed File Names', "; ".join([os.path.basename(f) for f in files_processed_list_for_summary]))
+                ('Avg Time per Strategy/Scenario (seconds)', avg_time_text),
+                ('Processed File Names', processed_file_names)
             ]
-            summary_data = pd.DataFrame(summary_items, columns=['Metric', 'Value'])
-            
-            # Create comparison data if multiple scenarios
-            if len(scenarios_for_comparison) > 1:
+            # Comparison data only when there is something to compare - a single scenario gets no sheet
+            if comparison_count > 1:
                 comparison_data = []
                 for scenario in scenarios_for_comparison:
                     metrics = scenario['metrics']
                     comparison_data.append({
                         'Scenario': scenario['name'],
-                        'File': os.path.basename(scenario['filepath']),
+                        'File': basenames[scenario['filepath']],
                         'Sorting Strategy': scenario['sorting_strategy'],
                         'Total Orders': metrics['total_orders'],
                         'Releasable Orders': metrics['releasable_count'],
@@ -1595,14 +1740,27 @@ def load_and_process_files():
                         'Kit Samples Qty': f"{metrics['releasable_kit_samples_qty']:,}"
                     })
                 comparison_df = pd.DataFrame(comparison_data)
-
-            # Write everything to Excel in a single writer session
-            with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-                # Define styles once at the start
-                header_fill = PatternFill(start_color='E0E0E0', end_color='E0E0E0', fill_type='solid')
-                separator_fill = PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
-                bold_font = Font(bold=True)
-
+            elif DEBUG_MODE:
+                print("🔍 DEBUG: Only one scenario - Strategy Comparison sheet skipped")
+
+            # Write everything to Excel in a single writer session with xlsxwriter, formats set up front.
+            # No constant_memory: to_excel writes frames column by column, which that row-streaming mode drops.
+            with pd.ExcelWriter(output_file, engine='xlsxwriter',
+                                engine_kwargs={'options': {'strings_to_numbers': False}}) as writer:
+                # Define formats once at the start
+                workbook = writer.book
+                header_format = workbook.add_format({'bold': True, 'bg_color': '#E0E0E0'})
+                separator_format = workbook.add_format({'bg_color': '#F5F5F5'})
+                bold_format = workbook.add_format({'bold': True})
+                decimal_format = workbook.add_format({'num_format': '#,##0.0'})
+                whole_format = workbook.add_format({'num_format': '#,##0'})
+                pct_format = workbook.add_format({'num_format': '0.0%'})
+                
+                def text_width(values, cap=None):
+                    """Column width that fits the longest value, plus padding"""
+                    width = max((len(str(value)) for value in values), default=0) + 2
+                    return min(width, cap) if cap else width
+                
                 # Write each scenario to its own sheet first
                 for scenario in scenarios:
                     sheet_name = scenario['name'][:31]  # Excel sheet name limit
@@ -1615,66 +1773,43 @@ def load_and_process_files():
                     
                     df.to_excel(writer, sheet_name=sheet_name, index=False)
                     
-                    # Get the worksheet and apply number formats
+                    # Column formats: hours with 1 decimal place, demand as whole numbers
                     worksheet = writer.sheets[sheet_name]
-                    for idx, col in enumerate(df.columns, 1):
-                        col_letter = get_column_letter(idx)
+                    for idx, col in enumerate(df.columns):
                         if col == 'Hours':
-                            # Format hours with 1 decimal place
-                            for cell in worksheet[col_letter][1:]:
-                                cell.number_format = '#,##0.0'
+                            worksheet.set_column(idx, idx, None, decimal_format)
                         elif col == 'Demand':
-                            # Format demand as whole numbers
-                            for cell in worksheet[col_letter][1:]:
-                                cell.number_format = '#,##0'
-                
-                # Write the summary sheet with formatting
-                summary_data.to_excel(writer, sheet_name='Summary', index=False)
-                worksheet = writer.sheets['Summary']
+                            worksheet.set_column(idx, idx, None, whole_format)
                 
-                # Apply number formats to summary sheet
-                for row in range(2, worksheet.max_row + 1):
-                    value_cell = worksheet.cell(row=row, column=2)
-                    metric_cell = worksheet.cell(row=row, column=1)
+                # Write the summary sheet row by row with its formatting
+                worksheet = workbook.add_worksheet('Summary')
+                worksheet.write_row(0, 0, ['Metric', 'Value'], header_format)
+                bold_prefixes = ('Total', 'Releasable', 'BVI', 'Malosa', 'Manufacturing', 'Assembly', 'Packaging', 'Virtuoso')
+                for row, (metric, value) in enumerate(summary_items, 1):
+                    if metric.startswith('---'):
+                        # Separator rows are shaded across columns A and B
+                        worksheet.write_row(row, 0, [metric, value], separator_format)
+                        continue
                     
-                    if any(term in metric_cell.value for term in ['Hours', 'Time']):
-                        value_cell.number_format = '#,##0.0'
-                    elif any(term in metric_cell.value for term in ['Orders', 'Count', 'Quantity']):
-                        value_cell.number_format = '#,##0'
-                    elif 'Rate' in metric_cell.value or 'Speed' in metric_cell.value:
-                        value_cell.number_format = '#,##0.0'
+                    if any(term in metric for term in ['Hours', 'Time']):
+                        value_format = decimal_format
+                    elif any(term in metric for term in ['Orders', 'Count', 'Quantity']):
+                        value_format = whole_format
+                    elif 'Rate' in metric or 'Speed' in metric:
+                        value_format = decimal_format
+                    else:
+                        value_format = None
                     
-                    # Apply visual formatting to Summary sheet
-                    if metric_cell.value.startswith('---'):
-                        # Apply separator formatting
-                        for col in range(1, 3):  # Columns A and B
-                            cell = worksheet.cell(row=row, column=col)
-                            cell.fill = separator_fill
-                    elif any(metric_cell.value.startswith(prefix) for prefix in ['Total', 'Releasable', 'BVI', 'Malosa', 'Manufacturing', 'Assembly', 'Packaging', 'Virtuoso']):
-                        # Bold important metrics
-                        metric_cell.font = bold_font
-                
-                # Format header row in Summary
-                for col in range(1, 3):  # Columns A and B
-                    cell = worksheet.cell(row=1, column=col)
-                    cell.font = bold_font
-                    cell.fill = header_fill
+                    # Bold important metrics
+                    worksheet.write(row, 0, metric, bold_format if metric.startswith(bold_prefixes) else None)
+                    worksheet.write(row, 1, value, value_format)
                 
                 # Auto-adjust column widths in Summary
-                for column in worksheet.columns:
-                    max_length = 0
-                    column = [cell for cell in column]
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                        adjusted_width = (max_length + 2)
-                        worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
+                worksheet.set_column(0, 0, text_width(['Metric'] + [metric for metric, _ in summary_items]))
+                worksheet.set_column(1, 1, text_width(['Value'] + [value for _, value in summary_items]))
                 
                 # Write comparison sheet if it exists
-                if len(scenarios_for_comparison) > 1:
+                if comparison_count > 1:
                     comparison_df_formatted = comparison_df.copy()
                     
                     # Convert string numbers back to numeric format
@@ -1703,120 +1838,95 @@ def load_and_process_files():
                             # Remove % sign and convert to numeric percentage
                             comparison_df_formatted[col] = comparison_df_formatted[col].astype(str).str.rstrip('%').astype(float) / 100
                     
-                    comparison_df_formatted.to_excel(writer, sheet_name='Strategy Comparison', index=False)
+                    # Styled header row written directly, the data goes underneath it
+                    comp_worksheet = workbook.add_worksheet('Strategy Comparison')
+                    comp_worksheet.write_row(0, 0, list(comparison_df_formatted.columns), header_format)
+                    comparison_df_formatted.to_excel(writer, sheet_name='Strategy Comparison', startrow=1, header=False, index=False)
                     
-                    # Format the comparison sheet
-                    comp_worksheet = writer.sheets['Strategy Comparison']
-                    
-                    # Apply number formats to all cells in numeric columns
-                    for col_idx, col_name in enumerate(comparison_df_formatted.columns, 1):
-                        col_letter = get_column_letter(col_idx)
-                        
+                    # Number format and width for every column (width capped at 50)
+                    for col_idx, col_name in enumerate(comparison_df_formatted.columns):
                         if col_name in pct_columns:
-                            # Format as percentage
-                            for cell in comp_worksheet[col_letter][1:]:
-                                cell.number_format = '0.0%'
+                            column_format = pct_format
                         elif 'Hours' in str(col_name):
-                            # Format with 1 decimal place
-                            for cell in comp_worksheet[col_letter][1:]:
-                                cell.number_format = '#,##0.0'
+                            column_format = decimal_format
                         elif any(term in col_name for term in ['Orders', 'Qty', 'Count', 'Parts']):
-                            # Format as whole number with thousands separator
-                            for cell in comp_worksheet[col_letter][1:]:
-                                cell.number_format = '#,##0'
-                    
-                    # Format headers and apply column widths
-                    for col in range(1, comp_worksheet.max_column + 1):
-                        cell = comp_worksheet.cell(row=1, column=col)
-                        cell.font = bold_font
-                        cell.fill = header_fill
-                        
-                        # Auto-adjust column width
-                        max_length = 0
-                        column = [cell for cell in comp_worksheet[get_column_letter(col)]]
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except:
-                                pass
-                            adjusted_width = min((max_length + 2), 50)  # Cap width at 50
-                            comp_worksheet.column_dimensions[get_column_letter(col)].width = adjusted_width
+                            column_format = whole_format
+                        else:
+                            column_format = None
+                        width = text_width([col_name] + comparison_df_formatted[col_name].tolist(), cap=50)
+                        comp_worksheet.set_column(col_idx, col_idx, width, column_format)
         else:
             output_file = None  # No file created
 
         # Display results
         if minmax_mode:
             # Min/Max optimization summary
-            files_processed = list(set([s['filepath'] for s in scenarios_for_comparison]))
+            # Files in run order, straight from the per-file extremes - no rescan of every strategy result
+            files_processed = list(strategy_extremes)
             
-            summary_text = f"""🔥 MIN/MAX OPTIMIZATION COMPLETE!
+            # Summary blocks are collected in a list and joined once at the end
+            summary_parts = [f"""🔥 MIN/MAX OPTIMIZATION COMPLETE!
 
 📊 OPTIMIZATION ANALYSIS:
    Files Analyzed: {len(files_processed)}
-   Sorting Strategies Tested: {len(get_sorting_strategies())}
-   Total Strategy Tests: {len(scenarios_for_comparison)}
-   Best Strategies Saved: {len(scenarios)} individual sheets (3 per file: Orders, Hours, Qty)
+   Sorting Strategies Tested: {strategy_count}
+   Total Strategy Tests: {comparison_count}
+   Best Strategies Saved: {scenario_count} individual sheets (3 per file: Orders, Hours, Qty)
 
 🔧 MATERIAL CATEGORIES PROCESSED:
-   Kits (3001, 3801, 5001): {'✓ Included' if include_kits_var.get() else '✗ Excluded'}
-   Instruments (3802, 3803, 3804, 3805): {'✓ Included' if include_instruments_var.get() else '✗ Excluded'}
-   Virtuoso (3806): {'✓ Included' if include_virtuoso_var.get() else '✗ Excluded'}
-   Kit Samples (KIT SAMPLES): {'✓ Included' if include_kit_samples_var.get() else '✗ Excluded'}
+   Kits (3001, 3801, 5001): {'✓ Included' if include_kits else '✗ Excluded'}
+   Instruments (3802, 3803, 3804, 3805): {'✓ Included' if include_instruments else '✗ Excluded'}
+   Virtuoso (3806): {'✓ Included' if include_virtuoso else '✗ Excluded'}
+   Kit Samples (KIT SAMPLES): {'✓ Included' if include_kit_samples else '✗ Excluded'}
 
-"""
+"""]
             
-            for filepath in files_processed:
-                file_scenarios = [s for s in scenarios_for_comparison if s['filepath'] == filepath]
-                best_orders = max(file_scenarios, key=lambda s: s['metrics']['releasable_count'])
-                best_hours = max(file_scenarios, key=lambda s: s['metrics']['releasable_hours'])
-                best_qty = max(file_scenarios, key=lambda s: s['metrics']['releasable_qty'])
-                worst_orders = min(file_scenarios, key=lambda s: s['metrics']['releasable_count'])
+            for filepath, (best_orders, best_hours, best_qty, worst_orders) in strategy_extremes.items():
+                bo, bh, bq, wo = best_orders['metrics'], best_hours['metrics'], best_qty['metrics'], worst_orders['metrics']
+                improvement_orders = bo['releasable_count'] - wo['releasable_count']
+                improvement_pct = safe_pct(improvement_orders, wo['total_orders'])
                 
-                improvement_orders = best_orders['metrics']['releasable_count'] - worst_orders['metrics']['releasable_count']
-                improvement_pct = improvement_orders / worst_orders['metrics']['total_orders'] * 100
-                
-                summary_text += f"""📁 FILE: {os.path.basename(filepath)}
+                summary_parts.append(f"""📁 FILE: {basenames[filepath]}
    🏆 BEST STRATEGY (Orders): {best_orders['sorting_strategy']}
-      → {best_orders['metrics']['releasable_count']:>6}/{best_orders['metrics']['total_orders']:>6} orders releasable ({best_orders['metrics']['releasable_count']/best_orders['metrics']['total_orders']*100:.1f}%)
+      → {bo['releasable_count']:>6}/{bo['total_orders']:>6} orders releasable ({format_pct(bo['releasable_count'], bo['total_orders'])})
       
       🔧 KITS:
-        BVI Kits:          {best_orders['metrics']['releasable_bvi_kits_count']:>6} orders,  {best_orders['metrics']['releasable_bvi_kits_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_bvi_kits_qty']:>8} qty
-        Malosa Kits:       {best_orders['metrics']['releasable_malosa_kits_count']:>6} orders,  {best_orders['metrics']['releasable_malosa_kits_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_malosa_kits_qty']:>8} qty
-              → {best_orders['metrics']['releasable_count']:>6}/{best_orders['metrics']['total_orders']:>6} orders releasable ({best_orders['metrics']['releasable_count']/best_orders['metrics']['total_orders']*100:.1f}%)
+        BVI Kits:          {bo['releasable_bvi_kits_count']:>6} orders,  {bo['releasable_bvi_kits_hours']:>8.1f} hrs,  {bo['releasable_bvi_kits_qty']:>8} qty
+        Malosa Kits:       {bo['releasable_malosa_kits_count']:>6} orders,  {bo['releasable_malosa_kits_hours']:>8.1f} hrs,  {bo['releasable_malosa_kits_qty']:>8} qty
+              → {bo['releasable_count']:>6}/{bo['total_orders']:>6} orders releasable ({format_pct(bo['releasable_count'], bo['total_orders'])})
         
         🔧 KITS:
-        BVI Kits:          {best_orders['metrics']['releasable_bvi_kits_count']:>6} orders,  {best_orders['metrics']['releasable_bvi_kits_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_bvi_kits_qty']:>8} qty
-        Malosa Kits:       {best_orders['metrics']['releasable_malosa_kits_count']:>6} orders,  {best_orders['metrics']['releasable_malosa_kits_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_malosa_kits_qty']:>8} qty
-        Total Kits:        {best_orders['metrics']['releasable_kits_count']:>6} orders,  {best_orders['metrics']['releasable_kits_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_kits_qty']:>8} qty
+        BVI Kits:          {bo['releasable_bvi_kits_count']:>6} orders,  {bo['releasable_bvi_kits_hours']:>8.1f} hrs,  {bo['releasable_bvi_kits_qty']:>8} qty
+        Malosa Kits:       {bo['releasable_malosa_kits_count']:>6} orders,  {bo['releasable_malosa_kits_hours']:>8.1f} hrs,  {bo['releasable_malosa_kits_qty']:>8} qty
+        Total Kits:        {bo['releasable_kits_count']:>6} orders,  {bo['releasable_kits_hours']:>8.1f} hrs,  {bo['releasable_kits_qty']:>8} qty
         
         🔬 INSTRUMENTS:
-        Manufacturing:     {best_orders['metrics']['releasable_manufacturing_count']:>6} orders,  {best_orders['metrics']['releasable_manufacturing_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_manufacturing_qty']:>8} qty
-        Assembly:         {best_orders['metrics']['releasable_assembly_count']:>6} orders,  {best_orders['metrics']['releasable_assembly_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_assembly_qty']:>8} qty
-        Packaging:        {best_orders['metrics']['releasable_packaging_count']:>6} orders,  {best_orders['metrics']['releasable_packaging_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_packaging_qty']:>8} qty
-        Malosa Inst:      {best_orders['metrics']['releasable_malosa_instruments_count']:>6} orders,  {best_orders['metrics']['releasable_malosa_instruments_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_malosa_instruments_qty']:>8} qty
-        Total Instruments:{best_orders['metrics']['releasable_instruments_count']:>6} orders,  {best_orders['metrics']['releasable_instruments_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_instruments_qty']:>8} qty
+        Manufacturing:     {bo['releasable_manufacturing_count']:>6} orders,  {bo['releasable_manufacturing_hours']:>8.1f} hrs,  {bo['releasable_manufacturing_qty']:>8} qty
+        Assembly:         {bo['releasable_assembly_count']:>6} orders,  {bo['releasable_assembly_hours']:>8.1f} hrs,  {bo['releasable_assembly_qty']:>8} qty
+        Packaging:        {bo['releasable_packaging_count']:>6} orders,  {bo['releasable_packaging_hours']:>8.1f} hrs,  {bo['releasable_packaging_qty']:>8} qty
+        Malosa Inst:      {bo['releasable_malosa_instruments_count']:>6} orders,  {bo['releasable_malosa_instruments_hours']:>8.1f} hrs,  {bo['releasable_malosa_instruments_qty']:>8} qty
+        Total Instruments:{bo['releasable_instruments_count']:>6} orders,  {bo['releasable_instruments_hours']:>8.1f} hrs,  {bo['releasable_instruments_qty']:>8} qty
         
         🎵 VIRTUOSO:
-        Virtuoso (3806):   {best_orders['metrics']['releasable_virtuoso_count']:>6} orders,  {best_orders['metrics']['releasable_virtuoso_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_virtuoso_qty']:>8} qty
+        Virtuoso (3806):   {bo['releasable_virtuoso_count']:>6} orders,  {bo['releasable_virtuoso_hours']:>8.1f} hrs,  {bo['releasable_virtuoso_qty']:>8} qty
 
    🏆 BEST STRATEGY (Hours): {best_hours['sorting_strategy']}
-      → {best_hours['metrics']['releasable_hours']:,.0f}/{best_hours['metrics']['total_hours']:,.0f} hours releasable ({best_hours['metrics']['releasable_hours']/best_hours['metrics']['total_hours']*100:.1f}%)
+      → {bh['releasable_hours']:,.0f}/{bh['total_hours']:,.0f} hours releasable ({format_pct(bh['releasable_hours'], bh['total_hours'])})
    
    🏆 BEST STRATEGY (Qty): {best_qty['sorting_strategy']}
-      → {best_qty['metrics']['releasable_qty']:,}/{best_qty['metrics']['total_qty']:,} units releasable ({best_qty['metrics']['releasable_qty']/best_qty['metrics']['total_qty']*100:.1f}%)
+      → {bq['releasable_qty']:,}/{bq['total_qty']:,} units releasable ({format_pct(bq['releasable_qty'], bq['total_qty'])})
    
    📉 WORST STRATEGY: {worst_orders['sorting_strategy']}
-      → {worst_orders['metrics']['releasable_count']:,} orders releasable
+      → {wo['releasable_count']:,} orders releasable
    
    🔺 IMPROVEMENT POTENTIAL: +{improvement_orders:,} more orders ({improvement_pct:.1f}% boost)
 
-"""
+""")
             
-            summary_text += f"""⏱️ PERFORMANCE METRICS:
+            summary_parts.append(f"""⏱️ PERFORMANCE METRICS:
    Total Processing Time: {processing_time:.2f} seconds
    Processing Speed: {orders_per_second:.1f} orders/second
-   Average per Strategy: {processing_time/len(scenarios_for_comparison):.1f} seconds
+   Average per Strategy: {processing_time/comparison_count:.1f} seconds
    
 💾 Results saved to: {os.path.basename(output_file) if output_file else 'No export (Quick Analysis Mode)'}
    
@@ -1825,9 +1935,10 @@ def load_and_process_files():
    ✓ Triple optimization: Orders + Hours + Quantity
    ✓ Only optimal results saved as individual sheets
    ✓ Complete strategy comparison table
-   ✓ Improvement potential analysis"""
+   ✓ Improvement potential analysis""")
+            summary_text = "".join(summary_parts)
             
-        elif len(scenarios) > 1:
+        elif scenario_count > 1:
             # Multi-scenario summary (standard mode)
             best_scenario = max(scenarios, key=lambda s: s['metrics']['releasable_count'])
             worst_scenario = min(scenarios, key=lambda s: s['metrics']['releasable_count'])
@@ -1835,16 +1946,16 @@ def load_and_process_files():
             
             summary_text = f"""✅ MULTI-SCENARIO ANALYSIS COMPLETE!
 
-📊 SCENARIOS COMPARED: {len(scenarios)}
+📊 SCENARIOS COMPARED: {scenario_count}
 
 🔧 MATERIAL CATEGORIES PROCESSED:
-   Kits (3001, 3801, 5001): {'✓ Included' if include_kits_var.get() else '✗ Excluded'}
-   Instruments (3802, 3803, 3804, 3805): {'✓ Included' if include_instruments_var.get() else '✗ Excluded'}
-   Virtuoso (3806): {'✓ Included' if include_virtuoso_var.get() else '✗ Excluded'}
-   Kit Samples (KIT SAMPLES): {'✓ Included' if include_kit_samples_var.get() else '✗ Excluded'}
+   Kits (3001, 3801, 5001): {'✓ Included' if include_kits else '✗ Excluded'}
+   Instruments (3802, 3803, 3804, 3805): {'✓ Included' if include_instruments else '✗ Excluded'}
+   Virtuoso (3806): {'✓ Included' if include_virtuoso else '✗ Excluded'}
+   Kit Samples (KIT SAMPLES): {'✓ Included' if include_kit_samples else '✗ Excluded'}
 
-🏆 BEST PERFORMER: {os.path.basename(best_scenario['filepath'])}
-   ✅ {best_scenario['metrics']['releasable_count']:,} releasable orders ({best_scenario['metrics']['releasable_count']/best_scenario['metrics']['total_orders']*100:.1f}%)
+🏆 BEST PERFORMER: {basenames[best_scenario['filepath']]}
+   ✅ {best_scenario['metrics']['releasable_count']:,} releasable orders ({format_pct(best_scenario['metrics']['releasable_count'], best_scenario['metrics']['total_orders'])})
    🔧 BVI Kits: {best_scenario['metrics']['releasable_bvi_kits_count']:,} orders, {best_scenario['metrics']['releasable_bvi_kits_hours']:,.0f} hrs, {best_scenario['metrics']['releasable_bvi_kits_qty']:,} qty
    🔧 Malosa Kits: {best_scenario['metrics']['releasable_malosa_kits_count']:,} orders, {best_scenario['metrics']['releasable_malosa_kits_hours']:,.0f} hrs, {best_scenario['metrics']['releasable_malosa_kits_qty']:,} qty
    🔬 Manufacturing: {best_scenario['metrics']['releasable_manufacturing_count']:,} orders, {best_scenario['metrics']['releasable_manufacturing_hours']:,.0f} hrs, {best_scenario['metrics']['releasable_manufacturing_qty']:,} qty
@@ -1856,8 +1967,8 @@ def load_and_process_files():
 🎵 VIRTUOSO:
    Virtuoso (3806): {best_scenario['metrics']['releasable_virtuoso_count']:,} orders, {best_scenario['metrics']['releasable_virtuoso_hours']:,.0f} hrs, {best_scenario['metrics']['releasable_virtuoso_qty']:,} qty
 
-📉 BASELINE: {os.path.basename(worst_scenario['filepath'])}
-   ✅ {worst_scenario['metrics']['releasable_count']:,} releasable orders ({worst_scenario['metrics']['releasable_count']/worst_scenario['metrics']['total_orders']*100:.1f}%)
+📉 BASELINE: {basenames[worst_scenario['filepath']]}
+   ✅ {worst_scenario['metrics']['releasable_count']:,} releasable orders ({format_pct(worst_scenario['metrics']['releasable_count'], worst_scenario['metrics']['total_orders'])})
 
 🔺 IMPROVEMENT: +{improvement:,} more orders releasable
 
@@ -1875,16 +1986,16 @@ def load_and_process_files():
 
 📊 RESULTS SUMMARY:
    Total Orders:     {format_metric(safe_metric(metrics, 'total_orders')):>8}
-   ✅ Releasable:    {format_metric(safe_metric(metrics, 'releasable_count')):>8} ({format_metric(safe_metric(metrics, 'releasable_count') / safe_metric(metrics, 'total_orders') * 100, 'percentage')})
-   ❌ On Hold:       {format_metric(safe_metric(metrics, 'held_count')):>8} ({format_metric(safe_metric(metrics, 'held_count') / safe_metric(metrics, 'total_orders') * 100, 'percentage')})
+   ✅ Releasable:    {format_metric(safe_metric(metrics, 'releasable_count')):>8} ({format_metric(safe_pct(safe_metric(metrics, 'releasable_count'), safe_metric(metrics, 'total_orders')), 'percentage')})
+   ❌ On Hold:       {format_metric(safe_metric(metrics, 'held_count')):>8} ({format_metric(safe_pct(safe_metric(metrics, 'held_count'), safe_metric(metrics, 'total_orders')), 'percentage')})
    🏷️ Piggyback:     {format_metric(safe_metric(metrics, 'pb_count')):>8}
    ⚠️ Skipped:       {format_metric(safe_metric(metrics, 'skipped_count')):>8}
 
 🔧 MATERIAL CATEGORIES PROCESSED:
-   Kits (3001, 3801, 5001): {'✓ Included' if include_kits_var.get() else '✗ Excluded'}
-   Instruments (3802, 3803, 3804, 3805): {'✓ Included' if include_instruments_var.get() else '✗ Excluded'}
-   Virtuoso (3806): {'✓ Included' if include_virtuoso_var.get() else '✗ Excluded'}
-   Kit Samples (KIT SAMPLES): {'✓ Included' if include_kit_samples_var.get() else '✗ Excluded'}
+   Kits (3001, 3801, 5001): {'✓ Included' if include_kits else '✗ Excluded'}
+   Instruments (3802, 3803, 3804, 3805): {'✓ Included' if include_instruments else '✗ Excluded'}
+   Virtuoso (3806): {'✓ Included' if include_virtuoso else '✗ Excluded'}
+   Kit Samples (KIT SAMPLES): {'✓ Included' if include_kit_samples else '✗ Excluded'}
 
 🔧 RELEASABLE KITS:
    BVI Kits (3001, 3801):    {format_metric(safe_metric(metrics, 'releasable_bvi_kits_count')):>6} orders,  {format_metric(safe_metric(metrics, 'releasable_bvi_kits_hours'), 'hours'):>8} hrs,  {format_metric(safe_metric(metrics, 'releasable_bvi_kits_qty')):>8} qty
@@ -1903,7 +2014,7 @@ def load_and_process_files():
 
 ⏱️ LABOR HOURS SUMMARY:
    Total Hours:              {format_metric(safe_metric(metrics, 'total_hours'), 'hours'):>8}
-   ✅ Releasable Hours:       {format_metric(safe_metric(metrics, 'releasable_hours'), 'hours'):>8} ({format_metric(safe_metric(metrics, 'releasable_hours') / safe_metric(metrics, 'total_hours') * 100, 'percentage')})
+   ✅ Releasable Hours:       {format_metric(safe_metric(metrics, 'releasable_hours'), 'hours'):>8} ({format_metric(safe_pct(safe_metric(metrics, 'releasable_hours'), safe_metric(metrics, 'total_hours')), 'percentage')})
 
 ⏱️ PERFORMANCE METRICS:
    Processing Time: {processing_time:.2f} seconds
@@ -1911,34 +2022,32 @@ def load_and_process_files():
 
 💾 Results saved to: {os.path.basename(output_file) if output_file else 'No export (Quick Analysis Mode)'}"""
         
-        # Insert summary text and performance report
-        results_text.delete(1.0, tk.END)
-        results_text.insert(1.0, summary_text.strip() + "\n\n" + generate_performance_report())
+        # Summary text and performance report
+        summary_text = summary_text.strip() + "\n\n" + generate_performance_report()
         
         # For status bar
         if minmax_mode:
-            status_var.set(f"🔥 MIN/MAX OPTIMIZATION COMPLETE! {len(scenarios_for_comparison)} strategies tested, {len(scenarios)} best results saved in {processing_time:.1f}s")
-        elif len(scenarios) > 1:
+            status_text = f"🔥 MIN/MAX OPTIMIZATION COMPLETE! {comparison_count} strategies tested, {scenario_count} best results saved in {processing_time:.1f}s"
+        elif scenario_count > 1:
             best_scenario = max(scenarios, key=lambda s: s['metrics']['releasable_count'])
             worst_scenario = min(scenarios, key=lambda s: s['metrics']['releasable_count'])
             improvement = best_scenario['metrics']['releasable_count'] - worst_scenario['metrics']['releasable_count']
-            status_var.set(f"✅ ALL {len(scenarios)} SCENARIOS COMPLETE! Best: {best_scenario['metrics']['releasable_count']:,} releasable (+{improvement:,} vs worst) | Total time: {processing_time:.1f}s")
+            status_text = f"✅ ALL {scenario_count} SCENARIOS COMPLETE! Best: {best_scenario['metrics']['releasable_count']:,} releasable (+{improvement:,} vs worst) | Total time: {processing_time:.1f}s"
         else:
             total_orders = scenarios[0]['metrics']['total_orders']
             total_releasable = scenarios[0]['metrics']['releasable_count']
-            status_var.set(f"✅ PROCESSING COMPLETE! {total_releasable:,}/{total_orders:,} orders releasable in {processing_time:.1f}s")
+            status_text = f"✅ PROCESSING COMPLETE! {total_releasable:,}/{total_orders:,} orders releasable in {processing_time:.1f}s"
         
-        main_frame.configure(style='Success.TFrame')
+        progress_queue.put(('done', (summary_text, status_text)))
         
     except Exception as e:
-        messagebox.showerror("Error", f"Processing failed:\n\n{str(e)}")
-        status_var.set("❌ Processing failed")
+        progress_queue.put(('error', str(e)))
 
 def copy_summary_to_clipboard():
+    """Copy the summary text to the clipboard in one append - the running mainloop serves it, so no forced redraw"""
     summary_text_content = results_text.get("1.0", tk.END).strip()
     root.clipboard_clear()
     root.clipboard_append(summary_text_content)
-    root.update()
     copy_btn.config(text="✅ Copied!")
     root.after(2000, lambda: copy_btn.config(text="📋 Copy Summary"))
 
@@ -2002,174 +2111,177 @@ def generate_performance_report():
     
     return "\n".join(report)
 
-# Create GUI
-root = tk.Tk()
-root.title(f"PlanSnap {VERSION} - Material Release Planning Tool")
-root.geometry("600x650")
-
-# Main frame
-main_frame = ttk.Frame(root, padding="20")
-main_frame.grid(row=0, column=0, sticky="nsew")
-
-# Title
-title_label = ttk.Label(main_frame, text=f"PlanSnap {VERSION}", 
-                       font=('Arial', 16, 'bold'))
-title_label.grid(row=0, column=0, pady=(0, 5))
-
-# Version date
-version_label = ttk.Label(main_frame, text=f"Updated: {VERSION_DATE}", 
-                         font=('Arial', 8))
-version_label.grid(row=1, column=0, pady=(0, 15))
-
-# Instructions
-instructions = """• Select MULTIPLE files to compare different scenarios (hold Ctrl)
-• Enable Min/Max Optimization to find the best sorting strategy for each file
-• Use Quick Analysis Mode for faster results without Excel export
-• Select specific material categories to process (Kits, Instruments, Virtuoso)"""
-
-inst_label = ttk.Label(main_frame, text=instructions, justify=tk.LEFT, wraplength=700)
-inst_label.grid(row=2, column=0, pady=(0, 20))
-
-# Min/Max Mode checkbox with tooltip
-minmax_frame = ttk.Frame(main_frame)
-minmax_frame.grid(row=3, column=0, pady=(0, 10))
-
-minmax_var = tk.BooleanVar()
-minmax_checkbox = ttk.Checkbutton(
-    minmax_frame, 
-    text="🔥 Enable Triple Optimization Mode",
-    variable=minmax_var,
-    style='Big.TCheckbutton'
-)
-minmax_checkbox.grid(row=0, column=0)
-
-minmax_tooltip = ttk.Label(
-    minmax_frame,
-    text="Tests all sorting strategies to find best results for Orders, Hours, and Quantity",
-    font=('Arial', 8, 'italic'),
-    foreground='gray'
-)
-minmax_tooltip.grid(row=1, column=0, pady=(0, 10))
-
-# No Export checkbox with tooltip
-no_export_frame = ttk.Frame(main_frame)
-no_export_frame.grid(row=4, column=0, pady=(0, 10))
-
-no_export_var = tk.BooleanVar()
-no_export_checkbox = ttk.Checkbutton(
-    no_export_frame, 
-    text="⚡ Quick Analysis Mode",
-    variable=no_export_var,
-    style='Big.TCheckbutton'
-)
-no_export_checkbox.grid(row=0, column=0)
-
-no_export_tooltip = ttk.Label(
-    no_export_frame,
-    text="Show results instantly without creating Excel files (useful for rapid testing)",
-    font=('Arial', 8, 'italic'),
-    foreground='gray'
-)
-no_export_tooltip.grid(row=1, column=0, pady=(0, 10))
-
-# Material Category Selection
-material_frame = ttk.LabelFrame(main_frame, text="🔧 Material Categories to Process", padding="10")
-material_frame.grid(row=5, column=0, pady=(0, 10), sticky="ew")
-
-# Create variables for material category checkboxes
-include_kits_var = tk.BooleanVar(value=True)
-include_instruments_var = tk.BooleanVar(value=True)
-include_virtuoso_var = tk.BooleanVar(value=True)
-include_kit_samples_var = tk.BooleanVar(value=True)
-
-# Kits checkbox
-kits_checkbox = ttk.Checkbutton(
-    material_frame,
-    text="🔧 Kits (Planner codes: 3001, 3801, 5001)",
-    variable=include_kits_var,
-    style='Big.TCheckbutton'
-)
-kits_checkbox.grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
-
-# Instruments checkbox
-instruments_checkbox = ttk.Checkbutton(
-    material_frame,
-    text="🔬 Instruments (Planner codes: 3802, 3803, 3804, 3805)",
-    variable=include_instruments_var,
-    style='Big.TCheckbutton'
-)
-instruments_checkbox.grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
-
-# Virtuoso checkbox
-virtuoso_checkbox = ttk.Checkbutton(
-    material_frame,
-    text="🎵 Virtuoso (Planner code: 3806)",
-    variable=include_virtuoso_var,
-    style='Big.TCheckbutton'
-)
-virtuoso_checkbox.grid(row=2, column=0, sticky=tk.W, pady=(0, 5))
-
-# Kit Samples checkbox
-kit_samples_checkbox = ttk.Checkbutton(
-    material_frame,
-    text="🧪 Kit Samples (Planner code: KIT SAMPLES)",
-    variable=include_kit_samples_var,
-    style='Big.TCheckbutton'
-)
-kit_samples_checkbox.grid(row=3, column=0, sticky=tk.W, pady=(0, 5))
-
-# Material categories tooltip
-material_tooltip = ttk.Label(
-    material_frame,
-    text="Untick categories to exclude them from material availability checks",
-    font=('Arial', 8, 'italic'),
-    foreground='gray'
-)
-material_tooltip.grid(row=4, column=0, pady=(5, 0), sticky=tk.W)
-
-# Process button
-process_btn = ttk.Button(main_frame, text="📂 SELECT FILES & PROCESS", 
-                        command=load_and_process_files, 
-                        style='Big.TButton')
-process_btn.grid(row=6, column=0, pady=(10, 20))
-
-# Configure button style
-style = ttk.Style()
-style.configure('Big.TButton', font=('Arial', 12, 'bold'))
-style.configure('Big.TCheckbutton', font=('Arial', 10, 'bold'))
-style.configure('Success.TFrame', background='#7ff09a')
-
-# Status
-status_var = tk.StringVar()
-status_var.set("🔄 Ready - Select Excel file(s) to begin processing")
-status_label = ttk.Label(main_frame, textvariable=status_var, font=('Arial', 10))
-status_label.grid(row=7, column=0, pady=(0, 10), sticky=tk.W)
-
-# Results area
-results_frame = ttk.LabelFrame(main_frame, text="📊 Results", padding="10")
-results_frame.grid(row=8, column=0, sticky="nsew", pady=(10, 0))
-
-results_text = tk.Text(results_frame, height=18, width=90, font=('Consolas', 9))
-scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=results_text.yview)
-
-results_text.configure(yscrollcommand=scrollbar.set)
-
-results_text.grid(row=0, column=0, sticky="nsew")
-scrollbar.grid(row=0, column=1, sticky="ns")
-
-copy_btn = ttk.Button(main_frame, text="📋 Copy Summary", command=copy_summary_to_clipboard)
-copy_btn.grid(row=9, column=0, pady=(10, 10))
-
-# Configure grid weights
-root.columnconfigure(0, weight=1)
-root.rowconfigure(0, weight=1)
-main_frame.columnconfigure(0, weight=1)
-main_frame.rowconfigure(8, weight=1)
-results_frame.columnconfigure(0, weight=1)
-results_frame.rowconfigure(0, weight=1)
-
-# Show initial message
-results_text.insert(1.0, "Select your Excel file(s) to begin material release planning...")
-
+# Build the GUI only when run as a script - min/max pool processes import this module too
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    
+    # Create GUI
+    root = tk.Tk()
+    root.title(f"PlanSnap {VERSION} - Material Release Planning Tool")
+    root.geometry("600x650")
+
+    # Main frame
+    main_frame = ttk.Frame(root, padding="20")
+    main_frame.grid(row=0, column=0, sticky="nsew")
+
+    # Title
+    title_label = ttk.Label(main_frame, text=f"PlanSnap {VERSION}", 
+                           font=('Arial', 16, 'bold'))
+    title_label.grid(row=0, column=0, pady=(0, 5))
+
+    # Version date
+    version_label = ttk.Label(main_frame, text=f"Updated: {VERSION_DATE}", 
+                             font=('Arial', 8))
+    version_label.grid(row=1, column=0, pady=(0, 15))
+
+    # Instructions
+    instructions = ("• Select MULTIPLE files to compare different scenarios (hold Ctrl)\n"
+                    "• Enable Min/Max Optimization to find the best sorting strategy for each file\n"
+                    "• Use Quick Analysis Mode for faster results without Excel export\n"
+                    "• Select specific material categories to process (Kits, Instruments, Virtuoso)")
+
+    inst_label = ttk.Label(main_frame, text=instructions, justify=tk.LEFT, wraplength=700)
+    inst_label.grid(row=2, column=0, pady=(0, 20))
+
+    # Min/Max Mode checkbox with tooltip
+    minmax_frame = ttk.Frame(main_frame)
+    minmax_frame.grid(row=3, column=0, pady=(0, 10))
+
+    minmax_var = tk.BooleanVar()
+    minmax_checkbox = ttk.Checkbutton(
+        minmax_frame, 
+        text="🔥 Enable Triple Optimization Mode",
+        variable=minmax_var,
+        style='Big.TCheckbutton'
+    )
+    minmax_checkbox.grid(row=0, column=0)
+
+    minmax_tooltip = ttk.Label(
+        minmax_frame,
+        text="Tests all sorting strategies to find best results for Orders, Hours, and Quantity",
+        font=('Arial', 8, 'italic'),
+        foreground='gray'
+    )
+    minmax_tooltip.grid(row=1, column=0, pady=(0, 10))
+
+    # No Export checkbox with tooltip
+    no_export_frame = ttk.Frame(main_frame)
+    no_export_frame.grid(row=4, column=0, pady=(0, 10))
+
+    no_export_var = tk.BooleanVar()
+    no_export_checkbox = ttk.Checkbutton(
+        no_export_frame, 
+        text="⚡ Quick Analysis Mode",
+        variable=no_export_var,
+        style='Big.TCheckbutton'
+    )
+    no_export_checkbox.grid(row=0, column=0)
+
+    no_export_tooltip = ttk.Label(
+        no_export_frame,
+        text="Show results instantly without creating Excel files (useful for rapid testing)",
+        font=('Arial', 8, 'italic'),
+        foreground='gray'
+    )
+    no_export_tooltip.grid(row=1, column=0, pady=(0, 10))
+
+    # Material Category Selection
+    material_frame = ttk.LabelFrame(main_frame, text="🔧 Material Categories to Process", padding="10")
+    material_frame.grid(row=5, column=0, pady=(0, 10), sticky="ew")
+
+    # Create variables for material category checkboxes
+    include_kits_var = tk.BooleanVar(value=True)
+    include_instruments_var = tk.BooleanVar(value=True)
+    include_virtuoso_var = tk.BooleanVar(value=True)
+    include_kit_samples_var = tk.BooleanVar(value=True)
+
+    # Kits checkbox
+    kits_checkbox = ttk.Checkbutton(
+        material_frame,
+        text="🔧 Kits (Planner codes: 3001, 3801, 5001)",
+        variable=include_kits_var,
+        style='Big.TCheckbutton'
+    )
+    kits_checkbox.grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+
+    # Instruments checkbox
+    instruments_checkbox = ttk.Checkbutton(
+        material_frame,
+        text="🔬 Instruments (Planner codes: 3802, 3803, 3804, 3805)",
+        variable=include_instruments_var,
+        style='Big.TCheckbutton'
+    )
+    instruments_checkbox.grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
+
+    # Virtuoso checkbox
+    virtuoso_checkbox = ttk.Checkbutton(
+        material_frame,
+        text="🎵 Virtuoso (Planner code: 3806)",
+        variable=include_virtuoso_var,
+        style='Big.TCheckbutton'
+    )
+    virtuoso_checkbox.grid(row=2, column=0, sticky=tk.W, pady=(0, 5))
+
+    # Kit Samples checkbox
+    kit_samples_checkbox = ttk.Checkbutton(
+        material_frame,
+        text="🧪 Kit Samples (Planner code: KIT SAMPLES)",
+        variable=include_kit_samples_var,
+        style='Big.TCheckbutton'
+    )
+    kit_samples_checkbox.grid(row=3, column=0, sticky=tk.W, pady=(0, 5))
+
+    # Material categories tooltip
+    material_tooltip = ttk.Label(
+        material_frame,
+        text="Untick categories to exclude them from material availability checks",
+        font=('Arial', 8, 'italic'),
+        foreground='gray'
+    )
+    material_tooltip.grid(row=4, column=0, pady=(5, 0), sticky=tk.W)
+
+    # Process button
+    process_btn = ttk.Button(main_frame, text="📂 SELECT FILES & PROCESS", 
+                            command=load_and_process_files, 
+                            style='Big.TButton')
+    process_btn.grid(row=6, column=0, pady=(10, 20))
+
+    # Configure button style
+    style = ttk.Style()
+    style.configure('Big.TButton', font=('Arial', 12, 'bold'))
+    style.configure('Big.TCheckbutton', font=('Arial', 10, 'bold'))
+    style.configure('Success.TFrame', background='#7ff09a')
+
+    # Status
+    status_var = tk.StringVar()
+    status_var.set("🔄 Ready - Select Excel file(s) to begin processing")
+    status_label = ttk.Label(main_frame, textvariable=status_var, font=('Arial', 10))
+    status_label.grid(row=7, column=0, pady=(0, 10), sticky=tk.W)
+
+    # Results area
+    results_frame = ttk.LabelFrame(main_frame, text="📊 Results", padding="10")
+    results_frame.grid(row=8, column=0, sticky="nsew", pady=(10, 0))
+
+    results_text = tk.Text(results_frame, height=18, width=90, font=('Consolas', 9))
+    scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=results_text.yview)
+
+    results_text.configure(yscrollcommand=scrollbar.set)
+
+    results_text.grid(row=0, column=0, sticky="nsew")
+    scrollbar.grid(row=0, column=1, sticky="ns")
+
+    copy_btn = ttk.Button(main_frame, text="📋 Copy Summary", command=copy_summary_to_clipboard)
+    copy_btn.grid(row=9, column=0, pady=(10, 10))
+
+    # Configure grid weights
+    root.columnconfigure(0, weight=1)
+    root.rowconfigure(0, weight=1)
+    main_frame.columnconfigure(0, weight=1)
+    main_frame.rowconfigure(8, weight=1)
+    results_frame.columnconfigure(0, weight=1)
+    results_frame.rowconfigure(0, weight=1)
+
+    # Show initial message
+    results_text.insert(1.0, "Select your Excel file(s) to begin material release planning...")
+    
     root.mainloop()
@@ -1,19 +1,27 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import pandas as pd
+import numpy as np
 import os
 import time
 from datetime import datetime
 import openpyxl
-from openpyxl.styles import PatternFill, Font
-from openpyxl.utils import get_column_letter
 import pymssql
 from dotenv import load_dotenv
 import sys
 from sqlalchemy import create_engine, text
 import psutil
 import gc
+import functools
+from collections import defaultdict
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional JIT for the per-part accumulation kernel - numpy fallback when numba isn't installed
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # Load environment variables
 load_dotenv('db_credentials.env')
@@ -89,6 +97,10 @@ class PerformanceTracker:
             'final_memory_mb': self.memory_usage[-1]['memory_mb'] if self.memory_usage else 0
         }
     
+    def add_phase_time(self, phase_name, duration):
+        """Record a duration measured outside start_phase/end_phase (e.g. on a worker thread)"""
+        self.phases.setdefault(phase_name, []).append(duration)
+    
     def cleanup(self):
         """Clean up and end any current phase"""
         if self.current_phase:
@@ -100,6 +112,7 @@ performance_tracker = PerformanceTracker()
 def timing_decorator(phase_name):
     """Decorator to automatically time function execution"""
     def decorator(func):
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
             performance_tracker.start_phase(phase_name)
             try:
@@ -116,6 +129,11 @@ VERSION_DATE = "2025-07-29"
 DEBUG_MODE = False
 DEBUG_COMPONENT_PART = None  # Set to a specific part number (as string) to track, e.g. "8034855"
 DEBUG_SO_NUMBER = 9682591
+
+# ttk frame style names (configured once at GUI setup)
+DEFAULT_STYLE = 'TFrame'
+QUICK_STYLE = 'Quick.TFrame'      # Blue for quick mode
+SUCCESS_STYLE = 'Success.TFrame'  # Green for normal mode
       # Set to a specific SO number (as string) to track, e.g. "9678417"
 
 # Global variables
@@ -183,14 +201,20 @@ if DEBUG_MODE:
     print("     - Column: 'Planner' → Planner code")
     print("="*60 + "\n")
 
+# Shared engine - created lazily on first use, connections come from its pool
+_ENGINE = None
+
 def get_database_connection():
-    """Create and return a SQLAlchemy engine for SQL Server"""
+    """Return the shared SQLAlchemy engine for SQL Server, creating it on first use"""
+    global _ENGINE
+    if _ENGINE is not None:
+        return _ENGINE
     try:
         # Create connection string for SQL Server
         connection_string = f"mssql+pyodbc://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?driver=ODBC+Driver+17+for+SQL+Server"
         
-        # Create SQLAlchemy engine with SSMS-like parameters
-        engine = create_engine(
+        # Create SQLAlchemy engine with SSMS-like parameters and a connection pool
+        _ENGINE = create_engine(
             connection_string,
             connect_args={
                 'appname': 'Microsoft SQL Server Management Studio - Query',
@@ -198,28 +222,30 @@ def get_database_connection():
                 'login_timeout': 30,
                 'timeout': 30
             },
+            pool_size=8,
+            max_overflow=4,
+            pool_pre_ping=True,  # Validate pooled connections on checkout
+            pool_recycle=1800,
+            fast_executemany=True,
             echo=False  # Set to True for SQL query logging
         )
-        return engine
+        return _ENGINE
     except Exception as e:
         raise Exception(f"SQL Server connection failed: {str(e)}")
 
 def execute_query(query, params=None):
     """Execute a SQL query and return results as a pandas DataFrame"""
-    engine = None
     try:
         engine = get_database_connection()
-        # Use SQLAlchemy text() for parameterized queries
-        if params:
-            df = pd.read_sql_query(text(query), engine, params=params)
-        else:
-            df = pd.read_sql_query(text(query), engine)
+        with engine.connect() as connection:
+            # Use SQLAlchemy text() for parameterized queries
+            if params:
+                df = pd.read_sql_query(text(query), connection, params=params)
+            else:
+                df = pd.read_sql_query(text(query), connection)
         return df
     except Exception as e:
         raise Exception(f"Query execution failed: {str(e)}")
-    finally:
-        if engine:
-            engine.dispose()
 
 @timing_decorator("Load Demand Data")
 def load_demand_data():
@@ -376,15 +402,49 @@ def load_pos_data():
     """
     return execute_query(query)
 
+# Table loaders in the order process_single_scenario unpacks them, with their report phase names
+DATA_LOADERS = [
+    ("Load Demand Data", load_demand_data),
+    ("Load Planned Demand Data", load_planned_demand_data),
+    ("Load Component Demand Data", load_component_demand_data),
+    ("Load IPIS Data", load_ipis_data),
+    ("Load Hours Data", load_hours_data),
+    ("Load POs Data", load_pos_data),
+]
+
+def _timed_load(phase_name, loader):
+    """Run an undecorated loader on a worker thread and return (phase_name, duration, df)"""
+    start = time.time()
+    df = loader.__wrapped__()
+    return phase_name, time.time() - start, df
+
+@timing_decorator("Load All Data")
+def load_all_data():
+    """Run the six independent table loads concurrently on the pooled engine"""
+    with ThreadPoolExecutor(max_workers=len(DATA_LOADERS)) as executor:
+        futures = [executor.submit(_timed_load, name, loader) for name, loader in DATA_LOADERS]
+        results = [future.result() for future in futures]
+    
+    # The tracker is not thread-safe, so per-table timings are recorded here on the caller
+    for phase_name, duration, _ in results:
+        performance_tracker.add_phase_time(phase_name, duration)
+    return tuple(df for _, _, df in results)
+
+# Set once the first connection test succeeds - the pool's pre-ping revalidates after that
+_CONNECTION_VERIFIED = False
+
 def test_database_connection():
-    """Test the database connection and return status"""
+    """Test the database connection and return status (only round-trips until the first success)"""
+    global _CONNECTION_VERIFIED
+    if _CONNECTION_VERIFIED:
+        return True, "Database connection successful"
     try:
         engine = get_database_connection()
         if engine:
             # Test the connection by executing a simple query
             with engine.connect() as connection:
                 connection.execute(text("SELECT 1"))
-            engine.dispose()
+            _CONNECTION_VERIFIED = True
             return True, "Database connection successful"
     except Exception as e:
         return False, f"Database connection failed: {str(e)}"
@@ -401,7 +461,6 @@ def get_table_info():
                 WHERE table_type = 'BASE TABLE'
             """))
             tables = [row[0] for row in result.fetchall()]
-        engine.dispose()
         return tables
     except Exception as e:
         return []
@@ -416,10 +475,82 @@ def normalize_so_number(so_val):
         return so_str.replace('.0', '')
     return so_str
 
+def normalize_so_series(so_series):
+    """Vectorized normalize_so_number for a whole column of SO numbers"""
+    so_str = so_series.astype(str).str.strip()
+    trimmed = so_str.str[:-2]
+    # Remove trailing .0 if it's a whole number
+    is_float_text = so_str.str.endswith('.0') & trimmed.str.isdigit()
+    so_str = so_str.where(~is_float_text, trimmed)
+    return so_str.where(so_series.notna(), "")
+
+def _accumulate_by_code_numpy(codes, qtys, out):
+    """out[codes[i]] += qtys[i] for every i (unbuffered, so repeated codes all add)"""
+    np.add.at(out, codes, qtys)
+    return out
+
+if njit is not None:
+    @njit(cache=True)
+    def accumulate_by_code(codes, qtys, out):
+        """out[codes[i]] += qtys[i] for every i, compiled with numba"""
+        for i in range(len(codes)):
+            out[codes[i]] += qtys[i]
+        return out
+else:
+    accumulate_by_code = _accumulate_by_code_numpy
+
+def sum_by_key(df, key_col, value_col):
+    """Sum value_col per key_col into a plain dict by accumulating over integer part codes"""
+    codes, keys = pd.factorize(df[key_col], sort=False)
+    values = df[value_col]
+    out_dtype = np.int64 if pd.api.types.is_integer_dtype(values) else np.float64
+    qtys = pd.to_numeric(values, errors='coerce').fillna(0).to_numpy(dtype=out_dtype)
+    
+    # Null keys factorize to -1 and are dropped, matching groupby
+    valid = codes >= 0
+    totals = accumulate_by_code(codes[valid].astype(np.int64), qtys[valid], np.zeros(len(keys), dtype=out_dtype))
+    return dict(zip(keys, totals.tolist()))
+
+def find_strategy_extremes(strategy_results):
+    """Return the best (orders, hours, qty) and worst (orders) strategy results from one metrics array"""
+    # One (strategies x 3) array of the compared metrics; argmax/argmin pick the first strategy on ties, as max/min did
+    metrics = np.array([
+        (s['metrics']['releasable_count'], s['metrics']['releasable_hours'], s['metrics']['releasable_qty'])
+        for s in strategy_results
+    ], dtype=np.float64)
+    best_orders, best_hours, best_qty = metrics.argmax(axis=0)
+    worst_orders = metrics[:, 0].argmin()
+    return (strategy_results[best_orders], strategy_results[best_hours],
+            strategy_results[best_qty], strategy_results[worst_orders])
+
+def safe_pct(part, whole):
+    """part/whole as a percentage, 0.0 when whole is 0 (empty file or category) instead of raising"""
+    return part / whole * 100 if whole else 0.0
+
+def format_pct(part, whole):
+    """Format part/whole as a one-decimal percentage ("0.0%" when whole is 0)"""
+    return f"{safe_pct(part, whole):.1f}%"
+
+def find_best_strategies(strategy_results):
+    """Return the best (orders, hours, qty) strategy results in a single pass"""
+    return find_strategy_extremes(strategy_results)[:3]
+
 def safe_metric(metrics, key, default=0):
     """Safely get a metric value with a default if missing"""
     return metrics.get(key, default)
 
+def best_and_worst(scenarios, key='releasable_count'):
+    """Return the (best, worst) scenarios by a metric in a single pass"""
+    best = worst = scenarios[0]
+    best_val = worst_val = best['metrics'][key]
+    for s in scenarios[1:]:
+        val = s['metrics'][key]
+        if val > best_val:
+            best, best_val = s, val
+        elif val < worst_val:
+            worst, worst_val = s, val
+    return best, worst
+
 def format_metric(value, format_type='number'):
     """Format metric values consistently"""
     try:
@@ -456,7 +587,7 @@ def build_stock_dictionary(df_ipis):
     # Use IPIS as the authoritative source
     if not df_ipis.empty:
         df_ipis["PART_NO"] = df_ipis["PART_NO"].astype(str)
-        ipis_stock = df_ipis.groupby("PART_NO")["Available Qty"].sum().to_dict()
+        ipis_stock = sum_by_key(df_ipis, "PART_NO", "Available Qty")
         stock.update(ipis_stock)
     else:
         print("WARNING: IPIS sheet is empty - no stock data available!")
@@ -475,18 +606,9 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
     
     # Load the data from database with proper timing separation
     try:
-        # Test database connection first (this will be included in the data loading timing)
-        performance_tracker.start_phase("Database Connection")
-        test_connection = get_database_connection()
-        performance_tracker.end_phase()
-        
-        # Load all data tables
-        df_main = load_demand_data()
-        df_struct = load_planned_demand_data()
-        df_component_demand = load_component_demand_data()
-        df_ipis = load_ipis_data()
-        df_hours = load_hours_data()
-        df_pos = load_pos_data()
+        # Connection was already tested by the caller - pooled checkouts are pre-pinged
+        # Load all data tables (concurrently - they are independent queries)
+        df_main, df_struct, df_component_demand, df_ipis, df_hours, df_pos = load_all_data()
     except Exception as e:
         performance_tracker.end_phase()  # End total processing
         raise Exception(f"Failed to load data from database: {str(e)}")
@@ -609,8 +731,7 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
 
     if not df_component_demand.empty:
         df_component_demand["Component Part Number"] = df_component_demand["Component Part Number"].astype(str)
-        committed_summary = df_component_demand.groupby("Component Part Number")["Component Qty Required"].sum()
-        committed_components = committed_summary.to_dict()
+        committed_components = sum_by_key(df_component_demand, "Component Part Number", "Component Qty Required")
         committed_parts_count = len(committed_components)
         total_committed_qty = sum(committed_components.values())
         
@@ -649,7 +770,7 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
 
     # Build labor standards dictionary (unchanged)
     df_hours["PART_NO"] = df_hours["PART_NO"].astype(str)
-    labor_standards = df_hours.groupby("PART_NO")["Hours per Unit"].sum().to_dict()
+    labor_standards = sum_by_key(df_hours, "PART_NO", "Hours per Unit")
     
     if status_callback:
         strategy_name = sorting_strategy["name"] if sorting_strategy else "Default"
@@ -657,16 +778,19 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
     
     # Build planned demand structure
     planned_demand = df_struct[df_struct["Component Part Number"].notna()].copy()
-    planned_demand["SO Number"] = planned_demand["SO Number"].astype(str).str.strip()
     planned_demand["Component Part Number"] = planned_demand["Component Part Number"].astype(str)
     
     # Apply normalization to both planned demand and main data
-    planned_demand["SO Number"] = planned_demand["SO Number"].apply(normalize_so_number)
+    planned_demand["SO Number"] = normalize_so_series(planned_demand["SO Number"])
     
     # Pre-process main data (unchanged)
     df_main['Start Date'] = pd.to_datetime(df_main['Start Date'], errors='coerce')
-    df_main["Part"] = df_main["Part"].astype(str)
-    df_main["Planner"] = df_main["Planner"].fillna("UNKNOWN").astype(str)
+    # Output text for the date, formatted once for the whole column rather than per order
+    df_main["_StartDateStr"] = df_main["Start Date"].dt.strftime('%Y-%m-%d').fillna("No Date")
+    # Part and Planner as categoricals: each distinct string is stored once, and the strategy sorts
+    # and planner filters work on integer codes (categories are lexically ordered, so sorts are unchanged)
+    df_main["Part"] = df_main["Part"].astype(str).astype("category")
+    df_main["Planner"] = df_main["Planner"].fillna("UNKNOWN").astype(str).astype("category")
     df_main["Demand"] = pd.to_numeric(df_main["Demand"], errors='coerce').fillna(0)
     
     # Filter data based on selected categories
@@ -702,29 +826,23 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
         excluded = total_original - total_filtered
         status_callback(f"🔁 [Scenario {scenario_num}/{total_scenarios}] Filtered data: {total_filtered:,}/{total_original:,} orders selected ({excluded:,} excluded) ({strategy_name})...")
     
-    # Calculate hours for sorting (unchanged)
-    filtered_df_main["Hours_Calc"] = filtered_df_main.apply(lambda row: 
-        labor_standards.get(str(row["Part"]), 0) * row["Demand"], axis=1)
+    # Calculate hours for sorting - labor standards are looked up once per distinct part, then
+    # spread to the orders through the category codes
+    part_cats = pd.Series(filtered_df_main["Part"].cat.categories, dtype=object)
+    hours_per_unit = part_cats.map(labor_standards).fillna(0).to_numpy(dtype=np.float64)
+    filtered_df_main["Hours_Calc"] = hours_per_unit[filtered_df_main["Part"].cat.codes.to_numpy()] * filtered_df_main["Demand"].to_numpy(dtype=np.float64)
     
-    # Apply sorting strategy (unchanged)
+    # Apply sorting strategy - one stable multi-key sort (NaT/missing values last)
     if sorting_strategy:
-        # Handle missing values appropriately for each column type
-        for col in sorting_strategy["columns"]:
-            if col == "Start Date":
-                # Put NaT (missing dates) at the end
-                filtered_df_main = filtered_df_main.sort_values(sorting_strategy["columns"], 
-                                            ascending=sorting_strategy["ascending"], 
-                                            na_position='last')
-            else:
-                filtered_df_main = filtered_df_main.sort_values(sorting_strategy["columns"], 
-                                            ascending=sorting_strategy["ascending"])
+        filtered_df_main = filtered_df_main.sort_values(sorting_strategy["columns"], 
+                                    ascending=sorting_strategy["ascending"], 
+                                    na_position='last', kind='mergesort')
     else:
         # Default sorting (original behavior)
-        filtered_df_main = filtered_df_main.sort_values(['Start Date', 'SO Number'], na_position='last')
+        filtered_df_main = filtered_df_main.sort_values(['Start Date', 'SO Number'], na_position='last', kind='mergesort')
     
     filtered_df_main = filtered_df_main.reset_index(drop=True)
     
-    results = []
     # Start order processing timing
     performance_tracker.start_phase("Order Processing")
     
@@ -743,7 +861,50 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
         print(f"\n🎯 DEBUG: Starting to process orders that use component {DEBUG_COMPONENT_PART}")
         print("="*80)
     
-    for _, row in filtered_df_main.iterrows():
+    # Per-order columns pulled out once - the loop indexes plain arrays instead of building a Series per row
+    # SO numbers normalized as a column; a missing one falls back to ORDER_<position> as before
+    order_fallback = pd.Series([f"ORDER_{k}" for k in range(1, total + 1)], index=filtered_df_main.index, dtype=object)
+    so_arr = normalize_so_series(filtered_df_main["SO Number"].where(filtered_df_main["SO Number"].notna(), order_fallback)).to_numpy(dtype=object)
+    # Part and Planner were cast to str and Demand filled with 0 in preprocessing, so no per-order str()/notna
+    part_arr = filtered_df_main["Part"].to_numpy(dtype=object)
+    demand_arr = filtered_df_main["Demand"].to_numpy()
+    planner_arr = filtered_df_main["Planner"].to_numpy(dtype=object)
+    start_date_arr = filtered_df_main["Start Date"].to_numpy(dtype=object)
+    start_date_str_arr = filtered_df_main["_StartDateStr"].to_numpy(dtype=object)
+    # Piggyback orders: "NS<part>99" appears as a planned component (one set probe per order, vectorized)
+    # Probed once per distinct part and spread to the orders through the category codes
+    pb_arr = ("NS" + part_cats + "99").isin(set(planned_demand["Component Part Number"])).to_numpy()[filtered_df_main["Part"].cat.codes.to_numpy()]
+    
+    # BOM rows grouped per SO once, so each order does a dict lookup instead of filtering planned_demand
+    bom_groups = {so_number: group for so_number, group in planned_demand.groupby("SO Number", sort=False)}
+    empty_bom = planned_demand.iloc[:0]
+    
+    # Future POs per part in sheet order: part -> [(PO number, due date text, qty due), ...]
+    # Parts, dates and quantities are converted and compared against "now" once, here.
+    # po_max_qty holds the running max of qty due per part (non-decreasing), so the first PO
+    # covering a shortage is found with a binary search instead of scanning the list.
+    po_due_dates = pd.to_datetime(df_pos["Promised Due Date"], errors='coerce')
+    future_po_rows = pd.DataFrame({
+        "Part Number": df_pos["Part Number"].astype(str),
+        "PO Number": df_pos["PO Number"],
+        "Due": po_due_dates.dt.strftime('%Y-%m-%d'),
+        "Qty Due": pd.to_numeric(df_pos["Qty Due"], errors='coerce')
+    })[po_due_dates >= datetime.now()]
+    po_index = {}
+    po_max_qty = {}
+    for part_no, group in future_po_rows.groupby("Part Number", sort=False):
+        po_index[part_no] = list(zip(group["PO Number"], group["Due"], group["Qty Due"]))
+        po_max_qty[part_no] = np.maximum.accumulate(group["Qty Due"].fillna(-np.inf).to_numpy(dtype=np.float64))
+    
+    # Result columns filled by position; SO Number, Planner and Start Date come straight from the input arrays
+    part_out = np.empty(total, dtype=object)
+    pb_out = np.empty(total, dtype=object)
+    hours_out = np.zeros(total, dtype=np.float64)
+    status_out = np.empty(total, dtype=object)
+    shortages_out = np.empty(total, dtype=object)
+    components_out = np.empty(total, dtype=object)
+    
+    for i in range(total):
         processed += 1
         
         # UPDATE UI EVERY 100 ORDERS
@@ -775,14 +936,12 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
                     else:
                         status_callback(f"🔁 [Scenario {scenario_num}/{total_scenarios}] {strategy_name} - {processed:,}/{total:,} ({progress_pct:.1f}%) | {est_remaining:.0f}s remaining")
         
-        so = str(row["SO Number"]).strip() if pd.notna(row["SO Number"]) else f"ORDER_{processed}"
-        part = str(row["Part"]) if pd.notna(row["Part"]) else None
-        demand_qty = row["Demand"] if pd.notna(row["Demand"]) and row["Demand"] > 0 else 0
-        planner = str(row["Planner"]) if pd.notna(row["Planner"]) else "UNKNOWN"
-        start_date = row["Start Date"]
-        
-        # NORMALIZE SO NUMBER for consistent matching
-        so = normalize_so_number(so)
+        so = so_arr[i]  # Already normalized for consistent matching
+        part = part_arr[i]
+        demand_qty = demand_arr[i] if demand_arr[i] > 0 else 0
+        planner = planner_arr[i]
+        start_date = start_date_arr[i]
+        start_date_str = start_date_str_arr[i]
         
         # DEBUG: Show when processing specific SO or part
         debug_so_match = DEBUG_SO_NUMBER is not None and str(so) == str(DEBUG_SO_NUMBER)
@@ -807,17 +966,13 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
                 print(f"\n🔍 DEBUG COMPONENT ALLOCATION: SO {so} directly uses {debug_component} as parent part")
             else:
                 # Check if this SO's BOM contains the debug component
-                try:
-                    bom_check = planned_demand[planned_demand["SO Number"] == so]
-                    if not bom_check.empty:
-                        bom_components = bom_check["Component Part Number"].astype(str).tolist()
-                        if debug_component in bom_components:
-                            debug_component_allocation_found = True
-                            comp_row = bom_check[bom_check["Component Part Number"].astype(str) == debug_component].iloc[0]
-                            comp_qty = comp_row["Component Qty Required"]
-                            print(f"\n🔍 DEBUG COMPONENT ALLOCATION: SO {so} (Parent: {part}) requires {comp_qty} units of {debug_component}")
-                except:
-                    pass
+                bom_check = bom_groups.get(so, empty_bom)
+                bom_components = bom_check["Component Part Number"].astype(str).tolist()
+                if debug_component in bom_components:
+                    debug_component_allocation_found = True
+                    comp_row = bom_check[bom_check["Component Part Number"].astype(str) == debug_component].iloc[0]
+                    comp_qty = comp_row["Component Qty Required"]
+                    print(f"\n🔍 DEBUG COMPONENT ALLOCATION: SO {so} (Parent: {part}) requires {comp_qty} units of {debug_component}")
         
         # Skip orders with missing critical data
         if part is None or part == "nan" or demand_qty <= 0:
@@ -825,32 +980,18 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
             if DEBUG_MODE and (debug_so_match or debug_part_match):
                 print(f"   ⚠️  Order skipped: part={part}, demand={demand_qty}")
             
-            results.append({
-                "SO Number": so,
-                "Part": part or "MISSING",
-                "Planner": planner,
-                "Start Date": start_date.strftime('%Y-%m-%d') if pd.notna(start_date) else "No Date",
-                "PB": "-",
-                "Demand": demand_qty,
-                "Hours": 0,
-                "Status": "⚠️ Skipped",
-                "Shortages": "-",
-                "Components": "Missing part number or zero demand"
-            })
+            part_out[i] = part or "MISSING"
+            pb_out[i] = "-"
+            status_out[i] = "⚠️ Skipped"
+            shortages_out[i] = "-"
+            components_out[i] = "Missing part number or zero demand"
             continue
         
         # Check if this is a piggyback order
-        try:
-            pb_check = f"NS{part}99"
-            is_pb = "PB" if pb_check in planned_demand["Component Part Number"].values else "-"
-        except:
-            is_pb = "-"
+        is_pb = "PB" if pb_arr[i] else "-"
         
-        # Get planned demand for this SO
-        try:
-            bom = planned_demand[planned_demand["SO Number"] == so]
-        except:
-            bom = pd.DataFrame()
+        # Get planned demand for this SO (an empty frame when the SO has no BOM rows)
+        bom = bom_groups.get(so, empty_bom)
         
         # DEBUG: Show BOM lookup results for specific SO
         debug_so_match = DEBUG_SO_NUMBER is not None and str(so) == str(DEBUG_SO_NUMBER)
@@ -888,9 +1029,9 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
                 print(f"  No components found - treating as raw material")
                 # Show a few sample records from planned demand
                 print(f"  Sample planned demand records:")
-                for i, (_, row) in enumerate(planned_demand.head(5).iterrows()):
+                for j, (_, row) in enumerate(planned_demand.head(5).iterrows()):
                     raw_so = row["SO Number"]
-                    print(f"    Row {i}: SO='{raw_so}' (type: {type(raw_so)}, repr: {repr(raw_so)}), Component='{row['Component Part Number']}', Qty={row['Component Qty Required']}")
+                    print(f"    Row {j}: SO='{raw_so}' (type: {type(raw_so)}, repr: {repr(raw_so)}), Component='{row['Component Part Number']}', Qty={row['Component Qty Required']}")
             print("-" * 80)
         
         # ENHANCED DEBUG: Show BOM lookup for any SO that uses the debug component
@@ -922,6 +1063,7 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
         # Check material availability
         releasable = True
         shortage_details = []
+        shortage_parts_only = []  # Part numbers of the shortages, captured as they are found
         components_needed = {}
         
         # Calculate labor hours for this order
@@ -980,16 +1122,10 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
                         print(f"    Sufficient: {true_available} >= {required_qty} = {will_be_sufficient}")
                         
                         # Show all POs for this part
-                        future_pos = df_pos[
-                            (df_pos['Part Number'].astype(str) == str(comp_part)) &
-                            (pd.to_datetime(df_pos['Promised Due Date'], errors='coerce') >= datetime.now())
-                        ]
-                        if not future_pos.empty:
+                        part_pos = po_index.get(comp_part, ())
+                        if part_pos:
                             print(f"\n  📋 Future POs for {comp_part}:")
-                            for _, po_row in future_pos.iterrows():
-                                po_id = po_row['PO Number']
-                                po_qty = po_row['Qty Due']
-                                po_date = pd.to_datetime(po_row['Promised Due Date']).strftime('%Y-%m-%d')
+                            for po_id, po_date, po_qty in part_pos:
                                 print(f"    PO {po_id}: {po_qty} due {po_date}")
                         else:
                             print(f"\n  📋 No future POs found for {comp_part}")
@@ -1007,25 +1143,23 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
                         all_components_available = False
                         shortage = abs(available_after_usage)  # Changed to use available_after_usage directly
                         # Search POs for potential resolution
-                        future_pos = df_pos[
-                            (df_pos["Part Number"].astype(str) == comp_part) &
-                            (pd.to_datetime(df_pos["Promised Due Date"], errors="coerce") >= datetime.now())
-                        ]
                         po_match = None
-                        for _, po_row in future_pos.iterrows():
-                            po_qty = po_row["Qty Due"]
-                            if po_qty >= shortage:
-                                po_match = po_row
-                                break
+                        po_reach = po_max_qty.get(comp_part)
+                        if po_reach is not None:
+                            k = int(np.searchsorted(po_reach, shortage))
+                            if k < po_reach.size:
+                                po_id, po_date, _ = po_index[comp_part][k]
+                                po_match = (po_id, po_date)
                         if po_match is not None:
-                            po_id = po_match["PO Number"]
-                            po_date = pd.to_datetime(po_match["Promised Due Date"]).strftime('%Y-%m-%d')
+                            po_id, po_date = po_match
                             shortage_details.append(f"{comp_part} short {shortage} – PO {po_id} due {po_date}")
                         else:
                             shortage_details.append(f"{comp_part} (need {required_qty}, have {true_available}, short {shortage})")
+                        shortage_parts_only.append(comp_part)
                 except Exception as e:
                     all_components_available = False
                     shortage_details.append(f"Component processing error: {str(e)}")
+                    shortage_parts_only.append(str(comp.get("Component Part Number", "Component")))
                     continue
 
             # Only after all checks, allocate components if all are available
@@ -1038,91 +1172,66 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
             else:
                 releasable = False
 
-        elif len(bom) == 0:
+        else:
             # This SO has no planned component demand - treat as raw material/purchased part
-            try:
-                total_used = used_components.get(part, 0)
-                true_available = stock.get(part, 0) - total_used  # Changed to use true_available
-                available_after_usage = true_available - demand_qty  # Added to match debug logic
+            total_used = used_components.get(part, 0)
+            true_available = stock.get(part, 0) - total_used  # Changed to use true_available
+            available_after_usage = true_available - demand_qty  # Added to match debug logic
+            
+            # DEBUG: Show allocation calculation for raw material parts (only for raw material orders)
+            debug_part_match = DEBUG_COMPONENT_PART is not None and str(part) == str(DEBUG_COMPONENT_PART)
+            debug_so_match = DEBUG_SO_NUMBER is not None and str(so) == str(DEBUG_SO_NUMBER)
+            
+            if DEBUG_MODE and (debug_part_match or debug_so_match):
+                print(f"\n=== DEBUG: Raw Material {part} for SO {so} ===")
+                print(f"  📊 STOCK ALLOCATION CALCULATION:")
+                print(f"    Initial stock:           {stock.get(part, 0):>8}")
+                print(f"    Committed qty:           {committed_components.get(part, 0) if 'committed_components' in locals() else 0:>8}")
+                print(f"    Already allocated:       {total_used:>8}")
+                print(f"    Available for this SO:   {true_available:>8}")
+                print(f"")
+                print(f"    Required for SO {so}:    {demand_qty:>8}")
+                print(f"    Would remain after:      {available_after_usage:>8}")
+                print(f"")
+                print(f"    ✅ CAN FULFILL ORDER:    {true_available >= demand_qty}")
                 
-                # DEBUG: Show allocation calculation for raw material parts (only for raw material orders)
-                debug_part_match = DEBUG_COMPONENT_PART is not None and str(part) == str(DEBUG_COMPONENT_PART)
-                debug_so_match = DEBUG_SO_NUMBER is not None and str(so) == str(DEBUG_SO_NUMBER)
+                if true_available >= demand_qty:
+                    print(f"    📦 ALLOCATION: {demand_qty} units allocated to SO {so}")
+                    print(f"    📦 REMAINING: {available_after_usage} units left in stock")
+                else:
+                    print(f"    ❌ SHORTAGE: Need {demand_qty}, have {true_available}, short {abs(available_after_usage)}")
                 
-                if DEBUG_MODE and (debug_part_match or debug_so_match):
-                    print(f"\n=== DEBUG: Raw Material {part} for SO {so} ===")
-                    print(f"  📊 STOCK ALLOCATION CALCULATION:")
-                    print(f"    Initial stock:           {stock.get(part, 0):>8}")
-                    print(f"    Committed qty:           {committed_components.get(part, 0) if 'committed_components' in locals() else 0:>8}")
-                    print(f"    Already allocated:       {total_used:>8}")
-                    print(f"    Available for this SO:   {true_available:>8}")
-                    print(f"")
-                    print(f"    Required for SO {so}:    {demand_qty:>8}")
-                    print(f"    Would remain after:      {available_after_usage:>8}")
-                    print(f"")
-                    print(f"    ✅ CAN FULFILL ORDER:    {true_available >= demand_qty}")
-                    
-                    if true_available >= demand_qty:
-                        print(f"    📦 ALLOCATION: {demand_qty} units allocated to SO {so}")
-                        print(f"    📦 REMAINING: {available_after_usage} units left in stock")
-                    else:
-                        print(f"    ❌ SHORTAGE: Need {demand_qty}, have {true_available}, short {abs(available_after_usage)}")
-                    
-                    # Show detailed calculation breakdown for raw material
-                    print(f"\n  🔍 DETAILED CALCULATION BREAKDOWN:")
-                    print(f"    Stock lookup: stock.get('{part}', 0) = {stock.get(part, 0)}")
-                    print(f"    Used lookup: used_components.get('{part}', 0) = {total_used}")
-                    print(f"    Calculation: {stock.get(part, 0)} - {total_used} = {true_available}")
-                    print(f"    Required: {demand_qty}")
-                    print(f"    Sufficient: {true_available} >= {demand_qty} = {true_available >= demand_qty}")
-                    
-                    # Show all POs for this part
-                    future_pos = df_pos[
-                        (df_pos['Part Number'].astype(str) == str(part)) &
-                        (pd.to_datetime(df_pos['Promised Due Date'], errors='coerce') >= datetime.now())
-                    ]
-                    if not future_pos.empty:
-                        print(f"\n  📋 Future POs for {part}:")
-                        for _, po_row in future_pos.iterrows():
-                            po_id = po_row['PO Number']
-                            po_qty = po_row['Qty Due']
-                            po_date = pd.to_datetime(po_row['Promised Due Date']).strftime('%Y-%m-%d')
-                            print(f"    PO {po_id}: {po_qty} due {po_date}")
-                    else:
-                        print(f"\n  📋 No future POs found for {part}")
-                    
-                    print("-" * 80)
+                # Show detailed calculation breakdown for raw material
+                print(f"\n  🔍 DETAILED CALCULATION BREAKDOWN:")
+                print(f"    Stock lookup: stock.get('{part}', 0) = {stock.get(part, 0)}")
+                print(f"    Used lookup: used_components.get('{part}', 0) = {total_used}")
+                print(f"    Calculation: {stock.get(part, 0)} - {total_used} = {true_available}")
+                print(f"    Required: {demand_qty}")
+                print(f"    Sufficient: {true_available} >= {demand_qty} = {true_available >= demand_qty}")
                 
-                if true_available >= demand_qty:  # Changed to use true_available
-                    used_components[part] = used_components.get(part, 0) + demand_qty
-                    releasable = True
+                # Show all POs for this part
+                part_pos = po_index.get(part, ())
+                if part_pos:
+                    print(f"\n  📋 Future POs for {part}:")
+                    for po_id, po_date, po_qty in part_pos:
+                        print(f"    PO {po_id}: {po_qty} due {po_date}")
                 else:
-                    releasable = False
-                    shortage = abs(available_after_usage)  # Changed to use available_after_usage
-                    shortage_details.append(f"{part} (need {demand_qty}, have {true_available}, short {shortage})")
-            except:
+                    print(f"\n  📋 No future POs found for {part}")
+                
+                print("-" * 80)
+            
+            if true_available >= demand_qty:  # Changed to use true_available
+                used_components[part] = used_components.get(part, 0) + demand_qty
+                releasable = True
+            else:
                 releasable = False
-                shortage_details.append(f"{part} (stock lookup failed)")
+                shortage = abs(available_after_usage)  # Changed to use available_after_usage
+                shortage_details.append(f"{part} (need {demand_qty}, have {true_available}, short {shortage})")
+                shortage_parts_only.append(part)
 
         # Build result record
-        shortage_parts_only = []
         components_info = "; ".join(shortage_details) if shortage_details else str(components_needed) if components_needed else "-"
 
-        # Extract just the part numbers from shortage details
-        for detail in shortage_details:
-            if " short " in detail and "–" in detail:
-                part_short = detail.split(" short ")[0].strip()
-                shortage_parts_only.append(part_short)
-            elif "(" in detail and " (need " in detail:
-                part_short = detail.split(" (need ")[0].strip()
-                shortage_parts_only.append(part_short)
-            elif "(" in detail:
-                part_short = detail.split("(")[0].strip()
-                shortage_parts_only.append(part_short)
-            else:
-                part_short = detail.split()[0] if detail.split() else detail
-                shortage_parts_only.append(part_short)
-
         clean_shortages = "; ".join(shortage_parts_only) if shortage_parts_only else "-"
 
         # DEBUG: Show final order decision
@@ -1134,21 +1243,26 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
             print(f"    Components needed: {components_needed if components_needed else 'None (raw material)'}")
             print("=" * 80)
 
-        results.append({
-            "SO Number": so,
-            "Part": part,
-            "Planner": planner,
-            "Start Date": start_date.strftime('%Y-%m-%d') if pd.notna(start_date) else "No Date",
-            "PB": is_pb,
-            "Demand": demand_qty,
-            "Hours": round(labor_hours, 4),
-            "Status": "✅ Release" if releasable else "❌ Hold",
-            "Shortages": clean_shortages,
-            "Components": components_info
-        })
+        part_out[i] = part
+        pb_out[i] = is_pb
+        hours_out[i] = round(labor_hours, 4)
+        status_out[i] = "✅ Release" if releasable else "❌ Hold"
+        shortages_out[i] = clean_shortages
+        components_out[i] = components_info
 
     # Calculate summary metrics
-    df_results = pd.DataFrame(results)
+    df_results = pd.DataFrame({
+        "SO Number": so_arr,
+        "Part": part_out,
+        "Planner": planner_arr,
+        "Start Date": start_date_str_arr,
+        "PB": pb_out,
+        "Demand": np.where(demand_arr > 0, demand_arr, 0),
+        "Hours": hours_out,
+        "Status": status_out,
+        "Shortages": shortages_out,
+        "Components": components_out
+    })
     total_orders = len(df_results)
     releasable_count = len(df_results[df_results['Status'] == '✅ Release'])
     held_count = total_orders - releasable_count
@@ -1306,28 +1420,20 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
             # Show all Shop Orders that tried to allocate this component
             print(f"\n  📋 ALL SHOP ORDERS THAT TRIED TO ALLOCATE {debug_part}:")
             component_allocation_count = 0
-            for result in results:
-                result_so = result["SO Number"]
-                result_part = result["Part"]
-                result_status = result["Status"]
-                
+            for result_so, result_part, result_status in zip(so_arr, part_out, status_out):
                 # Check if this SO directly uses the component as parent part
                 if str(result_part) == debug_part:
                     component_allocation_count += 1
                     print(f"    {component_allocation_count:2d}. SO {result_so}: Direct use as parent part - {result_status}")
                 else:
                     # Check if this SO's BOM contains the component
-                    try:
-                        bom_check = planned_demand[planned_demand["SO Number"] == result_so]
-                        if not bom_check.empty:
-                            bom_components = bom_check["Component Part Number"].astype(str).tolist()
-                            if debug_part in bom_components:
-                                component_allocation_count += 1
-                                comp_row = bom_check[bom_check["Component Part Number"].astype(str) == debug_part].iloc[0]
-                                comp_qty = comp_row["Component Qty Required"]
-                                print(f"    {component_allocation_count:2d}. SO {result_so} (Parent: {result_part}): Requires {comp_qty} units - {result_status}")
-                    except:
-                        pass
+                    bom_check = bom_groups.get(result_so, empty_bom)
+                    bom_components = bom_check["Component Part Number"].astype(str).tolist()
+                    if debug_part in bom_components:
+                        component_allocation_count += 1
+                        comp_row = bom_check[bom_check["Component Part Number"].astype(str) == debug_part].iloc[0]
+                        comp_qty = comp_row["Component Qty Required"]
+                        print(f"    {component_allocation_count:2d}. SO {result_so} (Parent: {result_part}): Requires {comp_qty} units - {result_status}")
             
             if component_allocation_count == 0:
                 print(f"    No Shop Orders found that use component {debug_part}")
@@ -1427,6 +1533,122 @@ def process_single_scenario(scenario_name, status_callback=None, scenario_num=1,
         }
     }
 
+def write_analysis_workbook(target, scenarios, summary_data, comparison_df=None):
+    """Write the styled analysis workbook (scenario sheets, Summary, Strategy Comparison) to a path or buffer"""
+    # Write everything to Excel in a single writer session with xlsxwriter, formats set up front.
+    # No constant_memory: to_excel writes frames column by column, which that row-streaming mode drops.
+    with pd.ExcelWriter(target, engine='xlsxwriter',
+                        engine_kwargs={'options': {'strings_to_numbers': False}}) as writer:
+        # Define formats once at the start
+        workbook = writer.book
+        header_format = workbook.add_format({'bold': True, 'bg_color': '#E0E0E0'})
+        separator_format = workbook.add_format({'bg_color': '#F5F5F5'})
+        bold_format = workbook.add_format({'bold': True})
+        decimal_format = workbook.add_format({'num_format': '#,##0.0'})
+        whole_format = workbook.add_format({'num_format': '#,##0'})
+        pct_format = workbook.add_format({'num_format': '0.0%'})
+        
+        def text_width(values, cap=None):
+            """Column width that fits the longest value, plus padding"""
+            width = max((len(str(value)) for value in values), default=0) + 2
+            return min(width, cap) if cap else width
+
+        # Write each scenario to its own sheet first
+        for scenario in scenarios:
+            sheet_name = scenario['name'][:31]  # Excel sheet name limit
+            df = scenario['results_df'].copy()
+            
+            # Convert numeric columns to proper number format
+            numeric_columns = ['Demand', 'Hours']
+            for col in numeric_columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+            
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+            
+            # Column formats: hours with 1 decimal place, demand as whole numbers
+            worksheet = writer.sheets[sheet_name]
+            for idx, col in enumerate(df.columns):
+                if col == 'Hours':
+                    worksheet.set_column(idx, idx, None, decimal_format)
+                elif col == 'Demand':
+                    worksheet.set_column(idx, idx, None, whole_format)
+        
+        # Write the summary sheet row by row with its formatting
+        summary_items = list(summary_data.itertuples(index=False, name=None))
+        worksheet = workbook.add_worksheet('Summary')
+        worksheet.write_row(0, 0, ['Metric', 'Value'], header_format)
+        bold_prefixes = ('Total', 'Releasable', 'BVI', 'Malosa', 'Manufacturing', 'Assembly', 'Packaging', 'Virtuoso')
+        for row, (metric, value) in enumerate(summary_items, 1):
+            if metric.startswith('---'):
+                # Separator rows are shaded across columns A and B
+                worksheet.write_row(row, 0, [metric, value], separator_format)
+                continue
+            
+            if any(term in metric for term in ['Hours', 'Time']):
+                value_format = decimal_format
+            elif any(term in metric for term in ['Orders', 'Count', 'Quantity']):
+                value_format = whole_format
+            elif 'Rate' in metric or 'Speed' in metric:
+                value_format = decimal_format
+            else:
+                value_format = None
+            
+            # Bold important metrics
+            worksheet.write(row, 0, metric, bold_format if metric.startswith(bold_prefixes) else None)
+            worksheet.write(row, 1, value, value_format)
+        
+        # Auto-adjust column widths in Summary
+        worksheet.set_column(0, 0, text_width(['Metric'] + [metric for metric, _ in summary_items]))
+        worksheet.set_column(1, 1, text_width(['Value'] + [value for _, value in summary_items]))
+        
+        # Write comparison sheet if it exists
+        if comparison_df is not None:
+            comparison_df_formatted = comparison_df.copy()
+            
+            # Convert string numbers back to numeric format
+            numeric_columns = [
+                'Total Orders', 'Releasable Orders', 'Held Orders', 'Piggyback Orders',
+                'Total Hours', 'Releasable Hours', 'BVI Kits', 'BVI Kit Hours', 'BVI Kit Qty',
+                'Malosa Kits', 'Malosa Kit Hours', 'Malosa Kit Qty', 'Total Kits', 'Total Kit Hours',
+                'Total Kit Qty', 'Manufacturing (3802)', 'Manufacturing Hours', 'Manufacturing Qty',
+                'Assembly (3803)', 'Assembly Hours', 'Assembly Qty', 'Packaging (3804)', 'Packaging Hours',
+                'Packaging Qty', 'Malosa Inst (3805)', 'Malosa Inst Hours', 'Malosa Inst Qty',
+                'Virtuoso (3806)', 'Virtuoso Hours', 'Virtuoso Qty', 'Total Instruments',
+                'Total Inst Hours', 'Total Inst Qty', 'Committed Parts', 'Committed Qty',
+                'Kit Samples', 'Kit Samples Hours', 'Kit Samples Qty'
+            ]
+            
+            for col in numeric_columns:
+                if col in comparison_df_formatted.columns:
+                    # Remove commas and convert to numeric
+                    comparison_df_formatted[col] = comparison_df_formatted[col].astype(str).str.replace(',', '').str.replace('$', '')
+                    comparison_df_formatted[col] = pd.to_numeric(comparison_df_formatted[col], errors='coerce')
+            
+            # Handle percentage columns separately
+            pct_columns = ['Release Rate (%)', 'Qty Release Rate (%)', 'Labor Release Rate (%)']
+            for col in pct_columns:
+                if col in comparison_df_formatted.columns:
+                    # Remove % sign and convert to numeric percentage
+                    comparison_df_formatted[col] = comparison_df_formatted[col].astype(str).str.rstrip('%').astype(float) / 100
+            
+            # Styled header row written directly, the data goes underneath it
+            comp_worksheet = workbook.add_worksheet('Strategy Comparison')
+            comp_worksheet.write_row(0, 0, list(comparison_df_formatted.columns), header_format)
+            comparison_df_formatted.to_excel(writer, sheet_name='Strategy Comparison', startrow=1, header=False, index=False)
+            
+            # Number format and width for every column (width capped at 50)
+            for col_idx, col_name in enumerate(comparison_df_formatted.columns):
+                if col_name in pct_columns:
+                    column_format = pct_format
+                elif 'Hours' in str(col_name):
+                    column_format = decimal_format
+                elif any(term in str(col_name) for term in ['Orders', 'Qty', 'Count', 'Parts']):
+                    column_format = whole_format
+                else:
+                    column_format = None
+                width = text_width([col_name] + comparison_df_formatted[col_name].tolist(), cap=50)
+                comp_worksheet.set_column(col_idx, col_idx, width, column_format)
+
 def load_and_process_database():
     global quick_analysis_excel_buffer
     """Load and process data from database instead of Excel files"""
@@ -1447,7 +1669,7 @@ def load_and_process_database():
         root.update_idletasks()
         
         start_time = time.time()
-        main_frame.configure(style='TFrame')
+        main_frame['style'] = DEFAULT_STYLE
         
         scenarios = []
         scenarios_for_comparison = []  # Will store all tested scenarios for comparison tables
@@ -1466,7 +1688,6 @@ def load_and_process_database():
             total_scenarios = len(strategies)
             
             update_progress(f"🔥 MIN/MAX MODE: Testing {len(strategies)} sorting strategies on database = {total_scenarios} total scenarios")
-            time.sleep(1)
             
             scenario_num = 0
             all_strategy_results = []  # Store ALL results for comparison
@@ -1503,13 +1724,9 @@ def load_and_process_database():
                     update_progress(f"✅ [{scenario_num}/{total_scenarios}] {strategy['name']}: {metrics['releasable_count']:,}/{metrics['total_orders']:,} orders ({scenario_duration:.1f}s) | {estimated_remaining:.0f}s remaining")
                 else:
                     update_progress(f"✅ [{scenario_num}/{total_scenarios}] {strategy['name']}: {metrics['releasable_count']:,}/{metrics['total_orders']:,} orders ({scenario_duration:.1f}s) | OPTIMIZATION COMPLETE!")
-                
-                time.sleep(0.2)  # Brief pause between strategies
             
             # Find the best strategies
-            best_orders_strategy = max(all_strategy_results, key=lambda s: s['metrics']['releasable_count'])
-            best_hours_strategy = max(all_strategy_results, key=lambda s: s['metrics']['releasable_hours'])
-            best_qty_strategy = max(all_strategy_results, key=lambda s: s['metrics']['releasable_qty'])
+            best_orders_strategy, best_hours_strategy, best_qty_strategy = find_best_strategies(all_strategy_results)
             
             # Create NEW scenario objects with clear names for the best strategies
             # Best Orders Strategy
@@ -1543,7 +1760,6 @@ def load_and_process_database():
             scenarios.append(best_qty_scenario)
             
             update_progress(f"🏆 Database optimized: Orders={best_orders_strategy['sorting_strategy']} ({best_orders_strategy['metrics']['releasable_count']:,}), Hours={best_hours_strategy['sorting_strategy']} ({best_hours_strategy['metrics']['releasable_hours']:,.0f}), Qty={best_qty_strategy['sorting_strategy']} ({best_qty_strategy['metrics']['releasable_qty']:,})")
-            time.sleep(0.5)
             
             # Use all_strategy_results for comparison tables
             scenarios_for_comparison = all_strategy_results
@@ -1574,12 +1790,16 @@ def load_and_process_database():
             # Show completion with actual metrics and time
             metrics = scenario_result['metrics']
             update_progress(f"✅ [Scenario {scenario_num}/{total_scenarios}] Complete: {metrics['releasable_count']:,}/{metrics['total_orders']:,} releasable ({scenario_duration:.1f}s) | COMPLETE!")
-            
-            time.sleep(0.3)
         
         # Calculate total processing time
         end_time = time.time()
         processing_time = end_time - start_time
+        # Counts reused by the Summary sheet, the summary text and the status bar
+        strategy_count = len(get_sorting_strategies())
+        comparison_count = len(scenarios_for_comparison)
+        scenario_count = len(scenarios)
+        # Display names per source file, shared by the comparison sheet and the summary text
+        basenames = {fp: os.path.basename(fp) for fp in dict.fromkeys(s['filepath'] for s in scenarios_for_comparison)}
         
         # Helper function to aggregate metrics from a list of scenarios
         def aggregate_metrics(scenario_list, is_min_max_mode_for_totals=False):
@@ -1647,7 +1867,7 @@ def load_and_process_database():
                 source_metrics = aggregate_metrics(best_orders_scenarios, is_min_max_mode_for_totals=True)
             else: # Standard mode
                 total_orders_processed = sum(s['metrics']['total_orders'] for s in scenarios)
-                if len(scenarios) == 1:
+                if scenario_count == 1:
                     source_metrics = scenarios[0]['metrics']
                 else: # Standard mode, multiple files
                     source_metrics = aggregate_metrics(scenarios)
@@ -1655,13 +1875,17 @@ def load_and_process_database():
         orders_per_second = total_orders_processed / processing_time if processing_time > 0 else 0
         
         # Create summary sheet (move this above export logic so it's always defined)
+        # Values needing a branch or a join are worked out once, ahead of the (Metric, Value) rows
+        timed_count = comparison_count if minmax_mode else scenario_count
+        avg_time_text = f"{processing_time/timed_count:.2f}" if timed_count else "N/A"
+        processed_file_names = "; ".join(os.path.basename(f) for f in files_processed_list_for_summary)
         summary_items = [
             ('Tool Version', f"{VERSION} ({VERSION_DATE})"),
             ('Processing Date', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
             ('Processing Mode', "Min/Max Optimization" if minmax_mode else "Standard"),
             ('Files Processed Count', len(files_processed_list_for_summary)),
-            ('Strategies Tested / Scenarios', len(scenarios_for_comparison) if minmax_mode else len(scenarios)),
-            ('Optimal Strategies / Scenarios Saved', len(scenarios)),
+            ('Strategies Tested / Scenarios', comparison_count if minmax_mode else scenario_count),
+            ('Optimal Strategies / Scenarios Saved', scenario_count),
             ('--- Material Categories Processed ---', '---'),
             ('Kits Included', "Yes" if include_kits_var.get() else "No"),
             ('Instruments Included', "Yes" if include_instruments_var.get() else "No"),
@@ -1734,11 +1958,73 @@ def load_and_process_database():
             ('--- Processing Performance ---', '---'),
             ('Total Processing Time (seconds)', f"{processing_time:.2f}"),
             ('Processing Speed (orders/second)', f"{orders_per_second:.1f}"),
-            ('Avg Time per Strategy/Scenario (seconds)', f"{processing_time/len(scenarios_for_comparison):.2f}" if minmax_mode and scenarios_for_comparison else (f"{processing_time/len(scenarios):.2f}" if scenarios else "N/A")),
-            ('Processed File Names', "; ".join([os.path.basename(f) for f in files_processed_list_for_summary]))
+            ('Avg Time per Strategy/Scenario (seconds)', avg_time_text),
+            ('Processed File Names', processed_file_names)
         ]
         summary_data = pd.DataFrame(summary_items, columns=['Metric', 'Value'])
         
+        # Comparison data only when there is something to compare - a single scenario gets no sheet
+        comparison_df = None
+        if comparison_count > 1:
+            comparison_data = []
+            for scenario in scenarios_for_comparison:
+                metrics = scenario['metrics']
+                comparison_data.append({
+                    'Scenario': scenario['name'],
+                    'File': basenames[scenario['filepath']],
+                    'Sorting Strategy': scenario['sorting_strategy'],
+                    'Total Orders': metrics['total_orders'],
+                    'Releasable Orders': metrics['releasable_count'],
+                    'Held Orders': metrics['held_count'],
+                    'Release Rate (%)': f"{metrics['releasable_count']/metrics['total_orders']*100:.1f}%" if metrics['total_orders'] > 0 else "0%",
+                    '---1': '---',
+                    'Total Qty': f"{metrics['total_qty']:,}",
+                    'Releasable Qty': f"{metrics['releasable_qty']:,}",
+                    'Qty Release Rate (%)': f"{metrics['releasable_qty']/metrics['total_qty']*100:.1f}%" if metrics['total_qty'] > 0 else "0%",
+                    'Piggyback Orders': metrics['pb_count'],
+                    'Total Hours': f"{metrics['total_hours']:,.1f}",
+                    'Releasable Hours': f"{metrics['releasable_hours']:,.1f}",
+                    'Labor Release Rate (%)': f"{metrics['releasable_hours']/metrics['total_hours']*100:.1f}%" if metrics['total_hours'] > 0 else "0%",
+                    '---2': '---',
+                    'BVI Kits': metrics['releasable_bvi_kits_count'],
+                    'BVI Kit Hours': f"{metrics['releasable_bvi_kits_hours']:,.1f}",
+                    'BVI Kit Qty': f"{metrics['releasable_bvi_kits_qty']:,}",
+                    'Malosa Kits': metrics['releasable_malosa_kits_count'],
+                    'Malosa Kit Hours': f"{metrics['releasable_malosa_kits_hours']:,.1f}",
+                    'Malosa Kit Qty': f"{metrics['releasable_malosa_kits_qty']:,}",
+                    'Total Kits': metrics['releasable_kits_count'],
+                    'Total Kit Hours': f"{metrics['releasable_kits_hours']:,.1f}",
+                    'Total Kit Qty': f"{metrics['releasable_kits_qty']:,}",
+                    '---3': '---',
+                    'Manufacturing (3802)': metrics['releasable_manufacturing_count'],
+                    'Manufacturing Hours': f"{metrics['releasable_manufacturing_hours']:,.1f}",
+                    'Manufacturing Qty': f"{metrics['releasable_manufacturing_qty']:,}",
+                    'Assembly (3803)': metrics['releasable_assembly_count'],
+                    'Assembly Hours': f"{metrics['releasable_assembly_hours']:,.1f}",
+                    'Assembly Qty': f"{metrics['releasable_assembly_qty']:,}",
+                    'Packaging (3804)': metrics['releasable_packaging_count'],
+                    'Packaging Hours': f"{metrics['releasable_packaging_hours']:,.1f}",
+                    'Packaging Qty': f"{metrics['releasable_packaging_qty']:,}",
+                    'Malosa Inst (3805)': metrics['releasable_malosa_instruments_count'],
+                    'Malosa Inst Hours': f"{metrics['releasable_malosa_instruments_hours']:,.1f}",
+                    'Malosa Inst Qty': f"{metrics['releasable_malosa_instruments_qty']:,}",
+                    'Virtuoso (3806)': metrics['releasable_virtuoso_count'],
+                    'Virtuoso Hours': f"{metrics['releasable_virtuoso_hours']:,.1f}",
+                    'Virtuoso Qty': f"{metrics['releasable_virtuoso_qty']:,}",
+                    'Total Instruments': metrics['releasable_instruments_count'],
+                    'Total Inst Hours': f"{metrics['releasable_instruments_hours']:,.1f}",
+                    'Total Inst Qty': f"{metrics['releasable_instruments_qty']:,}",
+                    '---4': '---',
+                    'Committed Parts': metrics['committed_parts_count'],
+                    'Committed Qty': f"{metrics['total_committed_qty']:,}",
+                    'Kit Samples': metrics['releasable_kit_samples_count'],
+                    'Kit Samples Hours': f"{metrics['releasable_kit_samples_hours']:,.1f}",
+                    'Kit Samples Qty': f"{metrics['releasable_kit_samples_qty']:,}"
+                })
+            comparison_df = pd.DataFrame(comparison_data)
+        elif DEBUG_MODE:
+            print("🔍 DEBUG: Only one scenario - Strategy Comparison sheet skipped")
+
         # Save results
         if not no_export_var.get():
             quick_analysis_excel_buffer = None  # Not used in normal mode
@@ -1748,7 +2034,7 @@ def load_and_process_database():
             
             if minmax_mode:
                 output_file = os.path.join(desktop_path, f"MinMax_Optimization_Analysis_{VERSION}_{timestamp}.xlsx")
-            elif len(scenarios) > 1:
+            elif scenario_count > 1:
                 output_file = os.path.join(desktop_path, f"Multi_Scenario_Analysis_{VERSION}_{timestamp}.xlsx")
             else:
                 output_file = os.path.join(desktop_path, f"Material_Release_Plan_{VERSION}_{timestamp}.xlsx")
@@ -1756,226 +2042,27 @@ def load_and_process_database():
             status_var.set("💾 Saving optimization results...")
             root.update_idletasks()
             
-            # Create comparison data if multiple scenarios
-            if len(scenarios_for_comparison) > 1:
-                comparison_data = []
-                for scenario in scenarios_for_comparison:
-                    metrics = scenario['metrics']
-                    comparison_data.append({
-                        'Scenario': scenario['name'],
-                        'File': os.path.basename(scenario['filepath']),
-                        'Sorting Strategy': scenario['sorting_strategy'],
-                        'Total Orders': metrics['total_orders'],
-                        'Releasable Orders': metrics['releasable_count'],
-                        'Held Orders': metrics['held_count'],
-                        'Release Rate (%)': f"{metrics['releasable_count']/metrics['total_orders']*100:.1f}%" if metrics['total_orders'] > 0 else "0%",
-                        '---1': '---',
-                        'Total Qty': f"{metrics['total_qty']:,}",
-                        'Releasable Qty': f"{metrics['releasable_qty']:,}",
-                        'Qty Release Rate (%)': f"{metrics['releasable_qty']/metrics['total_qty']*100:.1f}%" if metrics['total_qty'] > 0 else "0%",
-                        'Piggyback Orders': metrics['pb_count'],
-                        'Total Hours': f"{metrics['total_hours']:,.1f}",
-                        'Releasable Hours': f"{metrics['releasable_hours']:,.1f}",
-                        'Labor Release Rate (%)': f"{metrics['releasable_hours']/metrics['total_hours']*100:.1f}%" if metrics['total_hours'] > 0 else "0%",
-                        '---2': '---',
-                        'BVI Kits': metrics['releasable_bvi_kits_count'],
-                        'BVI Kit Hours': f"{metrics['releasable_bvi_kits_hours']:,.1f}",
-                        'BVI Kit Qty': f"{metrics['releasable_bvi_kits_qty']:,}",
-                        'Malosa Kits': metrics['releasable_malosa_kits_count'],
-                        'Malosa Kit Hours': f"{metrics['releasable_malosa_kits_hours']:,.1f}",
-                        'Malosa Kit Qty': f"{metrics['releasable_malosa_kits_qty']:,}",
-                        'Total Kits': metrics['releasable_kits_count'],
-                        'Total Kit Hours': f"{metrics['releasable_kits_hours']:,.1f}",
-                        'Total Kit Qty': f"{metrics['releasable_kits_qty']:,}",
-                        '---3': '---',
-                        'Manufacturing (3802)': metrics['releasable_manufacturing_count'],
-                        'Manufacturing Hours': f"{metrics['releasable_manufacturing_hours']:,.1f}",
-                        'Manufacturing Qty': f"{metrics['releasable_manufacturing_qty']:,}",
-                        'Assembly (3803)': metrics['releasable_assembly_count'],
-                        'Assembly Hours': f"{metrics['releasable_assembly_hours']:,.1f}",
-                        'Assembly Qty': f"{metrics['releasable_assembly_qty']:,}",
-                        'Packaging (3804)': metrics['releasable_packaging_count'],
-                        'Packaging Hours': f"{metrics['releasable_packaging_hours']:,.1f}",
-                        'Packaging Qty': f"{metrics['releasable_packaging_qty']:,}",
-                        'Malosa Inst (3805)': metrics['releasable_malosa_instruments_count'],
-                        'Malosa Inst Hours': f"{metrics['releasable_malosa_instruments_hours']:,.1f}",
-                        'Malosa Inst Qty': f"{metrics['releasable_malosa_instruments_qty']:,}",
-                        'Virtuoso (3806)': metrics['releasable_virtuoso_count'],
-                        'Virtuoso Hours': f"{metrics['releasable_virtuoso_hours']:,.1f}",
-                        'Virtuoso Qty': f"{metrics['releasable_virtuoso_qty']:,}",
-                        'Total Instruments': metrics['releasable_instruments_count'],
-                        'Total Inst Hours': f"{metrics['releasable_instruments_hours']:,.1f}",
-                        'Total Inst Qty': f"{metrics['releasable_instruments_qty']:,}",
-                        '---4': '---',
-                        'Committed Parts': metrics['committed_parts_count'],
-                        'Committed Qty': f"{metrics['total_committed_qty']:,}",
-                        'Kit Samples': metrics['releasable_kit_samples_count'],
-                        'Kit Samples Hours': f"{metrics['releasable_kit_samples_hours']:,.1f}",
-                        'Kit Samples Qty': f"{metrics['releasable_kit_samples_qty']:,}"
-                    })
-                comparison_df = pd.DataFrame(comparison_data)
-
-            # Write everything to Excel in a single writer session
-            with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-                # Define styles once at the start
-                header_fill = PatternFill(start_color='E0E0E0', end_color='E0E0E0', fill_type='solid')
-                separator_fill = PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
-                bold_font = Font(bold=True)
-
-                # Write each scenario to its own sheet first
-                for scenario in scenarios:
-                    sheet_name = scenario['name'][:31]  # Excel sheet name limit
-                    df = scenario['results_df'].copy()
-                    
-                    # Convert numeric columns to proper number format
-                    numeric_columns = ['Demand', 'Hours']
-                    for col in numeric_columns:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-                    
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
-                    
-                    # Get the worksheet and apply number formats
-                    worksheet = writer.sheets[sheet_name]
-                    for idx, col in enumerate(df.columns, 1):
-                        col_letter = get_column_letter(idx)
-                        if col == 'Hours':
-                            # Format hours with 1 decimal place
-                            for cell in worksheet[col_letter][1:]:
-                                cell.number_format = '#,##0.0'
-                        elif col == 'Demand':
-                            # Format demand as whole numbers
-                            for cell in worksheet[col_letter][1:]:
-                                cell.number_format = '#,##0'
-                
-                # Write the summary sheet with formatting
-                summary_data.to_excel(writer, sheet_name='Summary', index=False)
-                worksheet = writer.sheets['Summary']
-                
-                # Apply number formats to summary sheet
-                for row in range(2, worksheet.max_row + 1):
-                    value_cell = worksheet.cell(row=row, column=2)
-                    metric_cell = worksheet.cell(row=row, column=1)
-                    
-                    if any(term in metric_cell.value for term in ['Hours', 'Time']):
-                        value_cell.number_format = '#,##0.0'
-                    elif any(term in metric_cell.value for term in ['Orders', 'Count', 'Quantity']):
-                        value_cell.number_format = '#,##0'
-                    elif 'Rate' in metric_cell.value or 'Speed' in metric_cell.value:
-                        value_cell.number_format = '#,##0.0'
-                    
-                    # Apply visual formatting to Summary sheet
-                    if metric_cell.value.startswith('---'):
-                        # Apply separator formatting
-                        for col in range(1, 3):  # Columns A and B
-                            cell = worksheet.cell(row=row, column=col)
-                            cell.fill = separator_fill
-                    elif any(metric_cell.value.startswith(prefix) for prefix in ['Total', 'Releasable', 'BVI', 'Malosa', 'Manufacturing', 'Assembly', 'Packaging', 'Virtuoso']):
-                        # Bold important metrics
-                        metric_cell.font = bold_font
-                
-                # Format header row in Summary
-                for col in range(1, 3):  # Columns A and B
-                    cell = worksheet.cell(row=1, column=col)
-                    cell.font = bold_font
-                    cell.fill = header_fill
-                
-                # Auto-adjust column widths in Summary
-                for column in worksheet.columns:
-                    max_length = 0
-                    column = [cell for cell in column]
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                        adjusted_width = (max_length + 2)
-                        worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
-                
-                # Write comparison sheet if it exists
-                if len(scenarios_for_comparison) > 1:
-                    comparison_df_formatted = comparison_df.copy()
-                    
-                    # Convert string numbers back to numeric format
-                    numeric_columns = [
-                        'Total Orders', 'Releasable Orders', 'Held Orders', 'Piggyback Orders',
-                        'Total Hours', 'Releasable Hours', 'BVI Kits', 'BVI Kit Hours', 'BVI Kit Qty',
-                        'Malosa Kits', 'Malosa Kit Hours', 'Malosa Kit Qty', 'Total Kits', 'Total Kit Hours',
-                        'Total Kit Qty', 'Manufacturing (3802)', 'Manufacturing Hours', 'Manufacturing Qty',
-                        'Assembly (3803)', 'Assembly Hours', 'Assembly Qty', 'Packaging (3804)', 'Packaging Hours',
-                        'Packaging Qty', 'Malosa Inst (3805)', 'Malosa Inst Hours', 'Malosa Inst Qty',
-                        'Virtuoso (3806)', 'Virtuoso Hours', 'Virtuoso Qty', 'Total Instruments',
-                        'Total Inst Hours', 'Total Inst Qty', 'Committed Parts', 'Committed Qty',
-                        'Kit Samples', 'Kit Samples Hours', 'Kit Samples Qty'
-                    ]
-                    
-                    for col in numeric_columns:
-                        if col in comparison_df_formatted.columns:
-                            # Remove commas and convert to numeric
-                            comparison_df_formatted[col] = comparison_df_formatted[col].astype(str).str.replace(',', '').str.replace('$', '')
-                            comparison_df_formatted[col] = pd.to_numeric(comparison_df_formatted[col], errors='coerce')
-                    
-                    # Handle percentage columns separately
-                    pct_columns = ['Release Rate (%)', 'Qty Release Rate (%)', 'Labor Release Rate (%)']
-                    for col in pct_columns:
-                        if col in comparison_df_formatted.columns:
-                            # Remove % sign and convert to numeric percentage
-                            comparison_df_formatted[col] = comparison_df_formatted[col].astype(str).str.rstrip('%').astype(float) / 100
-                    
-                    comparison_df_formatted.to_excel(writer, sheet_name='Strategy Comparison', index=False)
-                    
-                    # Format the comparison sheet
-                    comp_worksheet = writer.sheets['Strategy Comparison']
-                    
-                    # Apply number formats to all cells in numeric columns
-                    for col_idx, col_name in enumerate(comparison_df_formatted.columns, 1):
-                        col_letter = get_column_letter(col_idx)
-                        
-                        if col_name in pct_columns:
-                            # Format as percentage
-                            for cell in comp_worksheet[col_letter][1:]:
-                                cell.number_format = '0.0%'
-                        elif 'Hours' in str(col_name):
-                            # Format with 1 decimal place
-                            for cell in comp_worksheet[col_letter][1:]:
-                                cell.number_format = '#,##0.0'
-                        elif any(term in str(col_name) for term in ['Orders', 'Qty', 'Count', 'Parts']):
-                            # Format as whole number with thousands separator
-                            for cell in comp_worksheet[col_letter][1:]:
-                                cell.number_format = '#,##0'
-                    
-                    # Format headers and apply column widths
-                    for col in range(1, comp_worksheet.max_column + 1):
-                        cell = comp_worksheet.cell(row=1, column=col)
-                        cell.font = bold_font
-                        cell.fill = header_fill
-                        
-                        # Auto-adjust column width
-                        max_length = 0
-                        column = [cell for cell in comp_worksheet[get_column_letter(col)]]
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except:
-                                pass
-                            adjusted_width = min((max_length + 2), 50)  # Cap width at 50
-                            comp_worksheet.column_dimensions[get_column_letter(col)].width = adjusted_width
+            write_analysis_workbook(output_file, scenarios, summary_data, comparison_df)
         else:
             output_file = None  # No file created
 
         # Display results
         if minmax_mode:
             # Min/Max optimization summary
-            files_processed = list(set([s['filepath'] for s in scenarios_for_comparison]))
+            # Group strategy results by file in one pass (insertion order keeps files in run order)
+            scenarios_by_file = defaultdict(list)
+            for s in scenarios_for_comparison:
+                scenarios_by_file[s['filepath']].append(s)
+            files_processed = list(scenarios_by_file)
             
-            summary_text = f"""🔥 MIN/MAX OPTIMIZATION COMPLETE!
+            # Summary blocks are collected in a list and joined once at the end
+            summary_parts = [f"""🔥 MIN/MAX OPTIMIZATION COMPLETE!
 
 📊 OPTIMIZATION ANALYSIS:
    Files Analyzed: {len(files_processed)}
-   Sorting Strategies Tested: {len(get_sorting_strategies())}
-   Total Strategy Tests: {len(scenarios_for_comparison)}
-   Best Strategies Saved: {len(scenarios)} individual sheets (3 per file: Orders, Hours, Qty)
+   Sorting Strategies Tested: {strategy_count}
+   Total Strategy Tests: {comparison_count}
+   Best Strategies Saved: {scenario_count} individual sheets (3 per file: Orders, Hours, Qty)
 
 🔧 MATERIAL CATEGORIES PROCESSED:
    Kits (3001, 3801, 5001): {'✓ Included' if include_kits_var.get() else '✗ Excluded'}
@@ -1983,59 +2070,56 @@ def load_and_process_database():
    Virtuoso (3806): {'✓ Included' if include_virtuoso_var.get() else '✗ Excluded'}
    Kit Samples (KIT SAMPLES): {'✓ Included' if include_kit_samples_var.get() else '✗ Excluded'}
 
-"""
+"""]
             
-            for filepath in files_processed:
-                file_scenarios = [s for s in scenarios_for_comparison if s['filepath'] == filepath]
-                best_orders = max(file_scenarios, key=lambda s: s['metrics']['releasable_count'])
-                best_hours = max(file_scenarios, key=lambda s: s['metrics']['releasable_hours'])
-                best_qty = max(file_scenarios, key=lambda s: s['metrics']['releasable_qty'])
-                worst_orders = min(file_scenarios, key=lambda s: s['metrics']['releasable_count'])
+            for filepath, file_scenarios in scenarios_by_file.items():
+                best_orders, best_hours, best_qty, worst_orders = find_strategy_extremes(file_scenarios)
+                bo, bh, bq, wo = best_orders['metrics'], best_hours['metrics'], best_qty['metrics'], worst_orders['metrics']
                 
-                improvement_orders = best_orders['metrics']['releasable_count'] - worst_orders['metrics']['releasable_count']
-                improvement_pct = improvement_orders / worst_orders['metrics']['total_orders'] * 100
+                improvement_orders = bo['releasable_count'] - wo['releasable_count']
+                improvement_pct = safe_pct(improvement_orders, wo['total_orders'])
                 
-                summary_text += f"""📁 FILE: {os.path.basename(filepath)}
+                summary_parts.append(f"""📁 FILE: {basenames[filepath]}
    🏆 BEST STRATEGY (Orders): {best_orders['sorting_strategy']}
-      → {best_orders['metrics']['releasable_count']:>6}/{best_orders['metrics']['total_orders']:>6} orders releasable ({best_orders['metrics']['releasable_count']/best_orders['metrics']['total_orders']*100:.1f}%)
+      → {bo['releasable_count']:>6}/{bo['total_orders']:>6} orders releasable ({format_pct(bo['releasable_count'], bo['total_orders'])})
       
       🔧 KITS:
-        BVI Kits:          {best_orders['metrics']['releasable_bvi_kits_count']:>6} orders,  {best_orders['metrics']['releasable_bvi_kits_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_bvi_kits_qty']:>8} qty
-        Malosa Kits:       {best_orders['metrics']['releasable_malosa_kits_count']:>6} orders,  {best_orders['metrics']['releasable_malosa_kits_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_malosa_kits_qty']:>8} qty
-              → {best_orders['metrics']['releasable_count']:>6}/{best_orders['metrics']['total_orders']:>6} orders releasable ({best_orders['metrics']['releasable_count']/best_orders['metrics']['total_orders']*100:.1f}%)
+        BVI Kits:          {bo['releasable_bvi_kits_count']:>6} orders,  {bo['releasable_bvi_kits_hours']:>8.1f} hrs,  {bo['releasable_bvi_kits_qty']:>8} qty
+        Malosa Kits:       {bo['releasable_malosa_kits_count']:>6} orders,  {bo['releasable_malosa_kits_hours']:>8.1f} hrs,  {bo['releasable_malosa_kits_qty']:>8} qty
+              → {bo['releasable_count']:>6}/{bo['total_orders']:>6} orders releasable ({format_pct(bo['releasable_count'], bo['total_orders'])})
         
         🔧 KITS:
-        BVI Kits:          {best_orders['metrics']['releasable_bvi_kits_count']:>6} orders,  {best_orders['metrics']['releasable_bvi_kits_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_bvi_kits_qty']:>8} qty
-        Malosa Kits:       {best_orders['metrics']['releasable_malosa_kits_count']:>6} orders,  {best_orders['metrics']['releasable_malosa_kits_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_malosa_kits_qty']:>8} qty
-        Total Kits:        {best_orders['metrics']['releasable_kits_count']:>6} orders,  {best_orders['metrics']['releasable_kits_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_kits_qty']:>8} qty
+        BVI Kits:          {bo['releasable_bvi_kits_count']:>6} orders,  {bo['releasable_bvi_kits_hours']:>8.1f} hrs,  {bo['releasable_bvi_kits_qty']:>8} qty
+        Malosa Kits:       {bo['releasable_malosa_kits_count']:>6} orders,  {bo['releasable_malosa_kits_hours']:>8.1f} hrs,  {bo['releasable_malosa_kits_qty']:>8} qty
+        Total Kits:        {bo['releasable_kits_count']:>6} orders,  {bo['releasable_kits_hours']:>8.1f} hrs,  {bo['releasable_kits_qty']:>8} qty
         
         🔬 INSTRUMENTS:
-        Manufacturing:     {best_orders['metrics']['releasable_manufacturing_count']:>6} orders,  {best_orders['metrics']['releasable_manufacturing_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_manufacturing_qty']:>8} qty
-        Assembly:         {best_orders['metrics']['releasable_assembly_count']:>6} orders,  {best_orders['metrics']['releasable_assembly_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_assembly_qty']:>8} qty
-        Packaging:        {best_orders['metrics']['releasable_packaging_count']:>6} orders,  {best_orders['metrics']['releasable_packaging_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_packaging_qty']:>8} qty
-        Malosa Inst:      {best_orders['metrics']['releasable_malosa_instruments_count']:>6} orders,  {best_orders['metrics']['releasable_malosa_instruments_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_malosa_instruments_qty']:>8} qty
-        Total Instruments:{best_orders['metrics']['releasable_instruments_count']:>6} orders,  {best_orders['metrics']['releasable_instruments_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_instruments_qty']:>8} qty
+        Manufacturing:     {bo['releasable_manufacturing_count']:>6} orders,  {bo['releasable_manufacturing_hours']:>8.1f} hrs,  {bo['releasable_manufacturing_qty']:>8} qty
+        Assembly:         {bo['releasable_assembly_count']:>6} orders,  {bo['releasable_assembly_hours']:>8.1f} hrs,  {bo['releasable_assembly_qty']:>8} qty
+        Packaging:        {bo['releasable_packaging_count']:>6} orders,  {bo['releasable_packaging_hours']:>8.1f} hrs,  {bo['releasable_packaging_qty']:>8} qty
+        Malosa Inst:      {bo['releasable_malosa_instruments_count']:>6} orders,  {bo['releasable_malosa_instruments_hours']:>8.1f} hrs,  {bo['releasable_malosa_instruments_qty']:>8} qty
+        Total Instruments:{bo['releasable_instruments_count']:>6} orders,  {bo['releasable_instruments_hours']:>8.1f} hrs,  {bo['releasable_instruments_qty']:>8} qty
         
         🎵 VIRTUOSO:
-        Virtuoso (3806):   {best_orders['metrics']['releasable_virtuoso_count']:>6} orders,  {best_orders['metrics']['releasable_virtuoso_hours']:>8.1f} hrs,  {best_orders['metrics']['releasable_virtuoso_qty']:>8} qty
+        Virtuoso (3806):   {bo['releasable_virtuoso_count']:>6} orders,  {bo['releasable_virtuoso_hours']:>8.1f} hrs,  {bo['releasable_virtuoso_qty']:>8} qty
 
    🏆 BEST STRATEGY (Hours): {best_hours['sorting_strategy']}
-      → {best_hours['metrics']['releasable_hours']:,.0f}/{best_hours['metrics']['total_hours']:,.0f} hours releasable ({best_hours['metrics']['releasable_hours']/best_hours['metrics']['total_hours']*100:.1f}%)
+      → {bh['releasable_hours']:,.0f}/{bh['total_hours']:,.0f} hours releasable ({format_pct(bh['releasable_hours'], bh['total_hours'])})
    
    🏆 BEST STRATEGY (Qty): {best_qty['sorting_strategy']}
-      → {best_qty['metrics']['releasable_qty']:,}/{best_qty['metrics']['total_qty']:,} units releasable ({best_qty['metrics']['releasable_qty']/best_qty['metrics']['total_qty']*100:.1f}%)
+      → {bq['releasable_qty']:,}/{bq['total_qty']:,} units releasable ({format_pct(bq['releasable_qty'], bq['total_qty'])})
    
    📉 WORST STRATEGY: {worst_orders['sorting_strategy']}
-      → {worst_orders['metrics']['releasable_count']:,} orders releasable
+      → {wo['releasable_count']:,} orders releasable
    
    🔺 IMPROVEMENT POTENTIAL: +{improvement_orders:,} more orders ({improvement_pct:.1f}% boost)
 
-"""
+""")
             
-            summary_text += f"""⏱️ PERFORMANCE METRICS:
+            summary_parts.append(f"""⏱️ PERFORMANCE METRICS:
    Total Processing Time: {processing_time:.2f} seconds
    Processing Speed: {orders_per_second:.1f} orders/second
-   Average per Strategy: {processing_time/len(scenarios_for_comparison):.1f} seconds
+   Average per Strategy: {processing_time/comparison_count:.1f} seconds
    
 💾 Results saved to: {os.path.basename(output_file) if output_file else 'No export (Quick Analysis Mode)'}
    
@@ -2044,17 +2128,19 @@ def load_and_process_database():
    ✓ Triple optimization: Orders + Hours + Quantity
    ✓ Only optimal results saved as individual sheets
    ✓ Complete strategy comparison table
-   ✓ Improvement potential analysis"""
+   ✓ Improvement potential analysis""")
+            summary_text = "".join(summary_parts)
             
-        elif len(scenarios) > 1:
+        elif scenario_count > 1:
             # Multi-scenario summary (standard mode)
-            best_scenario = max(scenarios, key=lambda s: s['metrics']['releasable_count'])
-            worst_scenario = min(scenarios, key=lambda s: s['metrics']['releasable_count'])
+            best_scenario, worst_scenario = best_and_worst(scenarios)
             improvement = best_scenario['metrics']['releasable_count'] - worst_scenario['metrics']['releasable_count']
+            best_pct = safe_pct(best_scenario['metrics']['releasable_count'], best_scenario['metrics']['total_orders'])
+            worst_pct = safe_pct(worst_scenario['metrics']['releasable_count'], worst_scenario['metrics']['total_orders'])
             
             summary_text = f"""✅ MULTI-SCENARIO ANALYSIS COMPLETE!
 
-📊 SCENARIOS COMPARED: {len(scenarios)}
+📊 SCENARIOS COMPARED: {scenario_count}
 
 🔧 MATERIAL CATEGORIES PROCESSED:
    Kits (3001, 3801, 5001): {'✓ Included' if include_kits_var.get() else '✗ Excluded'}
@@ -2062,8 +2148,8 @@ def load_and_process_database():
    Virtuoso (3806): {'✓ Included' if include_virtuoso_var.get() else '✗ Excluded'}
    Kit Samples (KIT SAMPLES): {'✓ Included' if include_kit_samples_var.get() else '✗ Excluded'}
 
-🏆 BEST PERFORMER: {os.path.basename(best_scenario['filepath'])}
-   ✅ {best_scenario['metrics']['releasable_count']:,} releasable orders ({best_scenario['metrics']['releasable_count']/best_scenario['metrics']['total_orders']*100:.1f}%)
+🏆 BEST PERFORMER: {basenames[best_scenario['filepath']]}
+   ✅ {best_scenario['metrics']['releasable_count']:,} releasable orders ({best_pct:.1f}%)
    🔧 BVI Kits: {best_scenario['metrics']['releasable_bvi_kits_count']:,} orders, {best_scenario['metrics']['releasable_bvi_kits_hours']:,.0f} hrs, {best_scenario['metrics']['releasable_bvi_kits_qty']:,} qty
    🔧 Malosa Kits: {best_scenario['metrics']['releasable_malosa_kits_count']:,} orders, {best_scenario['metrics']['releasable_malosa_kits_hours']:,.0f} hrs, {best_scenario['metrics']['releasable_malosa_kits_qty']:,} qty
    🔬 Manufacturing: {best_scenario['metrics']['releasable_manufacturing_count']:,} orders, {best_scenario['metrics']['releasable_manufacturing_hours']:,.0f} hrs, {best_scenario['metrics']['releasable_manufacturing_qty']:,} qty
@@ -2075,8 +2161,8 @@ def load_and_process_database():
 🎵 VIRTUOSO:
    Virtuoso (3806): {best_scenario['metrics']['releasable_virtuoso_count']:,} orders, {best_scenario['metrics']['releasable_virtuoso_hours']:,.0f} hrs, {best_scenario['metrics']['releasable_virtuoso_qty']:,} qty
 
-📉 BASELINE: {os.path.basename(worst_scenario['filepath'])}
-   ✅ {worst_scenario['metrics']['releasable_count']:,} releasable orders ({worst_scenario['metrics']['releasable_count']/worst_scenario['metrics']['total_orders']*100:.1f}%)
+📉 BASELINE: {basenames[worst_scenario['filepath']]}
+   ✅ {worst_scenario['metrics']['releasable_count']:,} releasable orders ({worst_pct:.1f}%)
 
 🔺 IMPROVEMENT: +{improvement:,} more orders releasable
 
@@ -2094,8 +2180,8 @@ def load_and_process_database():
 
 📊 RESULTS SUMMARY:
    Total Orders:     {format_metric(safe_metric(metrics, 'total_orders')):>8}
-   ✅ Releasable:    {format_metric(safe_metric(metrics, 'releasable_count')):>8} ({format_metric(safe_metric(metrics, 'releasable_count') / safe_metric(metrics, 'total_orders') * 100, 'percentage')})
-   ❌ On Hold:       {format_metric(safe_metric(metrics, 'held_count')):>8} ({format_metric(safe_metric(metrics, 'held_count') / safe_metric(metrics, 'total_orders') * 100, 'percentage')})
+   ✅ Releasable:    {format_metric(safe_metric(metrics, 'releasable_count')):>8} ({format_metric(safe_pct(safe_metric(metrics, 'releasable_count'), safe_metric(metrics, 'total_orders')), 'percentage')})
+   ❌ On Hold:       {format_metric(safe_metric(metrics, 'held_count')):>8} ({format_metric(safe_pct(safe_metric(metrics, 'held_count'), safe_metric(metrics, 'total_orders')), 'percentage')})
    🏷️ Piggyback:     {format_metric(safe_metric(metrics, 'pb_count')):>8}
    ⚠️ Skipped:       {format_metric(safe_metric(metrics, 'skipped_count')):>8}
 
@@ -2122,7 +2208,7 @@ def load_and_process_database():
 
 ⏱️ LABOR HOURS SUMMARY:
    Total Hours:              {format_metric(safe_metric(metrics, 'total_hours'), 'hours'):>8}
-   ✅ Releasable Hours:       {format_metric(safe_metric(metrics, 'releasable_hours'), 'hours'):>8} ({format_metric(safe_metric(metrics, 'releasable_hours') / safe_metric(metrics, 'total_hours') * 100, 'percentage')})
+   ✅ Releasable Hours:       {format_metric(safe_metric(metrics, 'releasable_hours'), 'hours'):>8} ({format_metric(safe_pct(safe_metric(metrics, 'releasable_hours'), safe_metric(metrics, 'total_hours')), 'percentage')})
 
 ⏱️ PERFORMANCE METRICS:
    Processing Time: {processing_time:.2f} seconds
@@ -2139,130 +2225,23 @@ def load_and_process_database():
         
         # For status bar
         if minmax_mode:
-            status_var.set(f"🔥 MIN/MAX OPTIMIZATION COMPLETE! {len(scenarios_for_comparison)} strategies tested, {len(scenarios)} best results saved in {processing_time:.1f}s")
-        elif len(scenarios) > 1:
-            best_scenario = max(scenarios, key=lambda s: s['metrics']['releasable_count'])
-            worst_scenario = min(scenarios, key=lambda s: s['metrics']['releasable_count'])
-            improvement = best_scenario['metrics']['releasable_count'] - worst_scenario['metrics']['releasable_count']
-            status_var.set(f"✅ ALL {len(scenarios)} SCENARIOS COMPLETE! Best: {best_scenario['metrics']['releasable_count']:,} releasable (+{improvement:,} vs worst) | Total time: {processing_time:.1f}s")
+            status_var.set(f"🔥 MIN/MAX OPTIMIZATION COMPLETE! {comparison_count} strategies tested, {scenario_count} best results saved in {processing_time:.1f}s")
+        elif scenario_count > 1:
+            # best_scenario/improvement already computed for the summary above
+            status_var.set(f"✅ ALL {scenario_count} SCENARIOS COMPLETE! Best: {best_scenario['metrics']['releasable_count']:,} releasable (+{improvement:,} vs worst) | Total time: {processing_time:.1f}s")
         else:
             total_orders = scenarios[0]['metrics']['total_orders']
             total_releasable = scenarios[0]['metrics']['releasable_count']
             status_var.set(f"✅ PROCESSING COMPLETE! {total_releasable:,}/{total_orders:,} orders releasable in {processing_time:.1f}s")
             
         # Set frame color based on mode - blue for quick mode, green for normal mode
-        if no_export_var.get():
-            main_frame.configure(style='Quick.TFrame')  # Blue for quick mode
-        else:
-            main_frame.configure(style='Success.TFrame')  # Green for normal mode
+        main_frame['style'] = QUICK_STYLE if no_export_var.get() else SUCCESS_STYLE
         
         # Quick Analysis: Write to BytesIO buffer, don't save to disk
-        quick_analysis_excel_buffer = BytesIO()
-        with pd.ExcelWriter(quick_analysis_excel_buffer, engine='openpyxl') as writer:
-            # ... existing code for writing Excel ...
-            # (copy all Excel writing code here, but use writer as above)
-            # Define styles once at the start
-            header_fill = PatternFill(start_color='E0E0E0', end_color='E0E0E0', fill_type='solid')
-            separator_fill = PatternFill(start_color='F5F5F5', end_color='F5F5F5', fill_type='solid')
-            bold_font = Font(bold=True)
-            for scenario in scenarios:
-                sheet_name = scenario['name'][:31]
-                df = scenario['results_df'].copy()
-                numeric_columns = ['Demand', 'Hours']
-                for col in numeric_columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-                worksheet = writer.sheets[sheet_name]
-                for idx, col in enumerate(df.columns, 1):
-                    col_letter = get_column_letter(idx)
-                    if col == 'Hours':
-                        for cell in worksheet[col_letter][1:]:
-                            cell.number_format = '#,##0.0'
-                    elif col == 'Demand':
-                        for cell in worksheet[col_letter][1:]:
-                            cell.number_format = '#,##0'
-            summary_data.to_excel(writer, sheet_name='Summary', index=False)
-            worksheet = writer.sheets['Summary']
-            for row in range(2, worksheet.max_row + 1):
-                value_cell = worksheet.cell(row=row, column=2)
-                metric_cell = worksheet.cell(row=row, column=1)
-                if any(term in metric_cell.value for term in ['Hours', 'Time']):
-                    value_cell.number_format = '#,##0.0'
-                elif any(term in metric_cell.value for term in ['Orders', 'Count', 'Quantity']):
-                    value_cell.number_format = '#,##0'
-                elif 'Rate' in metric_cell.value or 'Speed' in metric_cell.value:
-                    value_cell.number_format = '#,##0.0'
-                if metric_cell.value.startswith('---'):
-                    for col in range(1, 3):
-                        cell = worksheet.cell(row=row, column=col)
-                        cell.fill = separator_fill
-                elif any(metric_cell.value.startswith(prefix) for prefix in ['Total', 'Releasable', 'BVI', 'Malosa', 'Manufacturing', 'Assembly', 'Packaging', 'Virtuoso']):
-                    metric_cell.font = bold_font
-            for col in range(1, 3):
-                cell = worksheet.cell(row=1, column=col)
-                cell.font = bold_font
-                cell.fill = header_fill
-            for column in worksheet.columns:
-                max_length = 0
-                column = [cell for cell in column]
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                    adjusted_width = (max_length + 2)
-                    worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
-            if len(scenarios_for_comparison) > 1:
-                comparison_df_formatted = comparison_df.copy()
-                numeric_columns = [
-                    'Total Orders', 'Releasable Orders', 'Held Orders', 'Piggyback Orders',
-                    'Total Hours', 'Releasable Hours', 'BVI Kits', 'BVI Kit Hours', 'BVI Kit Qty',
-                    'Malosa Kits', 'Malosa Kit Hours', 'Malosa Kit Qty', 'Total Kits', 'Total Kit Hours',
-                    'Total Kit Qty', 'Manufacturing (3802)', 'Manufacturing Hours', 'Manufacturing Qty',
-                    'Assembly (3803)', 'Assembly Hours', 'Assembly Qty', 'Packaging (3804)', 'Packaging Hours',
-                    'Packaging Qty', 'Malosa Inst (3805)', 'Malosa Inst Hours', 'Malosa Inst Qty',
-                    'Virtuoso (3806)', 'Virtuoso Hours', 'Virtuoso Qty', 'Total Instruments',
-                    'Total Inst Hours', 'Total Inst Qty', 'Committed Parts', 'Committed Qty',
-                    'Kit Samples', 'Kit Samples Hours', 'Kit Samples Qty'
-                ]
-                for col in numeric_columns:
-                    if col in comparison_df_formatted.columns:
-                        comparison_df_formatted[col] = comparison_df_formatted[col].astype(str).str.replace(',', '').str.replace('$', '')
-                        comparison_df_formatted[col] = pd.to_numeric(comparison_df_formatted[col], errors='coerce')
-                pct_columns = ['Release Rate (%)', 'Qty Release Rate (%)', 'Labor Release Rate (%)']
-                for col in pct_columns:
-                    if col in comparison_df_formatted.columns:
-                        comparison_df_formatted[col] = comparison_df_formatted[col].astype(str).str.rstrip('%').astype(float) / 100
-                comparison_df_formatted.to_excel(writer, sheet_name='Strategy Comparison', index=False)
-                comp_worksheet = writer.sheets['Strategy Comparison']
-                for col_idx, col_name in enumerate(comparison_df_formatted.columns, 1):
-                    col_letter = get_column_letter(col_idx)
-                    if col_name in pct_columns:
-                        for cell in comp_worksheet[col_letter][1:]:
-                            cell.number_format = '0.0%'
-                    elif 'Hours' in str(col_name):
-                        for cell in comp_worksheet[col_letter][1:]:
-                            cell.number_format = '#,##0.0'
-                    elif any(term in str(col_name) for term in ['Orders', 'Qty', 'Count', 'Parts']):
-                        for cell in comp_worksheet[col_letter][1:]:
-                            cell.number_format = '#,##0'
-                for col in range(1, comp_worksheet.max_column + 1):
-                    cell = comp_worksheet.cell(row=1, column=col)
-                    cell.font = bold_font
-                    cell.fill = header_fill
-                    max_length = 0
-                    column = [cell for cell in comp_worksheet[get_column_letter(col)]]
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                        adjusted_width = min((max_length + 2), 50)
-                        comp_worksheet.column_dimensions[get_column_letter(col)].width = adjusted_width
+        if no_export_var.get():
+            quick_analysis_excel_buffer = BytesIO()
+            write_analysis_workbook(quick_analysis_excel_buffer, scenarios, summary_data, comparison_df)
             quick_analysis_excel_buffer.seek(0)
-            output_file = None
         # ... existing code ...
         # Show/hide download button
         if no_export_var.get():
@@ -2352,10 +2331,10 @@ def generate_performance_report():
     return "\n".join(report)
 
 def copy_summary_to_clipboard():
+    """Copy the summary text to the clipboard in one append - the running mainloop serves it, so no forced redraw"""
     summary_text_content = results_text.get("1.0", tk.END).strip()
     root.clipboard_clear()
     root.clipboard_append(summary_text_content)
-    root.update()
     copy_btn.config(text="✅ Copied!")
     root.after(2000, lambda: copy_btn.config(text="📋 Copy Summary"))
 
@@ -2497,8 +2476,8 @@ process_btn.grid(row=6, column=0, pady=(10, 20))
 style = ttk.Style()
 style.configure('Big.TButton', font=('Arial', 12, 'bold'))
 style.configure('Big.TCheckbutton', font=('Arial', 10, 'bold'))
-style.configure('Success.TFrame', background='#7ff09a')  # Green for normal mode
-style.configure('Quick.TFrame', background='#87ceeb')    # Blue for quick mode
+style.configure(SUCCESS_STYLE, background='#7ff09a')  # Green for normal mode
+style.configure(QUICK_STYLE, background='#87ceeb')    # Blue for quick mode
 
 # Status
 status_var = tk.StringVar()
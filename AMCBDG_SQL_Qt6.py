@@ -1,8 +1,8 @@
 import sys
 import os
 import time
-from datetime import datetime
 import pandas as pd
+import numpy as np
 import openpyxl
 from openpyxl.styles import PatternFill, Font
 from openpyxl.utils import get_column_letter
@@ -11,16 +11,35 @@ from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
 import psutil
 import gc
-from io import BytesIO
+import functools
+from collections import defaultdict
+import threading
+import queue
+import multiprocessing
+from io import BytesIO, StringIO
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+# Optional columnar (Arrow) fetch - loaders fall back to pandas/pyodbc when not installed
+try:
+    import turbodbc
+except ImportError:
+    turbodbc = None
+
+# Optional JIT for the allocation check/commit kernels - numpy fallback when numba isn't installed
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # Qt6 imports
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QLabel, QPushButton, QCheckBox, QTextEdit, QScrollArea, 
+    QLabel, QPushButton, QCheckBox, QPlainTextEdit, QScrollArea, 
     QFrame, QGroupBox, QFileDialog, QMessageBox, QProgressBar,
     QSplitter, QSizePolicy
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal, QTimer, QMimeData, QSignalBlocker
 from PyQt6.QtGui import QFont, QPalette, QColor
 
 # Load environment variables
@@ -32,6 +51,7 @@ VERSION_DATE = "2025-07-29"
 DEBUG_MODE = False
 DEBUG_COMPONENT_PART = None  # Set to a specific part number (as string) to track, e.g. "8034855"
 DEBUG_SO_NUMBER = 9682591  # Set to a specific SO number (as string) to track, e.g. "9678417"
+SUMMARY_HEAD_FILES = 5  # Min/max file blocks rendered before the results pane is first shown
 
 # Global variables
 quick_analysis_excel_buffer = None
@@ -45,83 +65,129 @@ DB_PORT = os.getenv('DB_PORT', '1433')
 
 # Print debug configuration at startup
 if DEBUG_MODE:
-    print("\n" + "="*60)
-    print("🔍 DEBUG MODE ACTIVATED")
-    print("="*60)
+    # Built as one string and printed once rather than one stdout write per line
+    debug_banner = ["\n" + "="*60, "🔍 DEBUG MODE ACTIVATED", "="*60]
     if DEBUG_COMPONENT_PART is None and DEBUG_SO_NUMBER is None:
-        print("⚠️  NO DEBUG FILTERS SET")
-        print("   Set DEBUG_COMPONENT_PART or DEBUG_SO_NUMBER to see detailed output")
-        print("   Example: DEBUG_COMPONENT_PART = '8039831' or DEBUG_SO_NUMBER = '9678487'")
-        print("   Current settings will show general processing info only")
+        debug_banner += [
+            "⚠️  NO DEBUG FILTERS SET",
+            "   Set DEBUG_COMPONENT_PART or DEBUG_SO_NUMBER to see detailed output",
+            "   Example: DEBUG_COMPONENT_PART = '8039831' or DEBUG_SO_NUMBER = '9678487'",
+            "   Current settings will show general processing info only",
+        ]
     else:
-        print("🎯 DEBUG FILTERS ACTIVE:")
-        print(f"   Component Part: {DEBUG_COMPONENT_PART if DEBUG_COMPONENT_PART else 'Not specified'}")
-        print(f"   SO Number: {DEBUG_SO_NUMBER if DEBUG_SO_NUMBER else 'Not specified'}")
-    print("="*60)
-    print("Debug output will appear in the terminal/console during processing")
-    print("="*60 + "\n")
+        debug_banner += [
+            "🎯 DEBUG FILTERS ACTIVE:",
+            f"   Component Part: {DEBUG_COMPONENT_PART if DEBUG_COMPONENT_PART else 'Not specified'}",
+            f"   SO Number: {DEBUG_SO_NUMBER if DEBUG_SO_NUMBER else 'Not specified'}",
+        ]
+    debug_banner += [
+        "="*60,
+        "Debug output will appear in the terminal/console during processing",
+        "="*60 + "\n",
+        
+        # Show data source information
+        "📊 DATA SOURCES AND COLUMN MAPPINGS:",
+        "   📦 IPIS Table (Stock):",
+        "     - Column: 'PART_NO' → Used for stock lookup",
+        "     - Column: 'Available Qty' → Stock quantity",
+        "     - Logic: Grouped by PART_NO, sum of Available Qty",
+        "",
+        "   🔒 Component Demand Table (Committed):",
+        "     - Column: 'Component Part Number' → Component identifier",
+        "     - Column: 'Component Qty Required' → Committed quantity",
+        "     - Logic: Grouped by Component Part Number, sum of Component Qty Required",
+        "",
+        "   📋 Planned Demand Table (BOM):",
+        "     - Column: 'SO Number' → Shop Order identifier",
+        "     - Column: 'Component Part Number' → Component identifier",
+        "     - Column: 'Component Qty Required' → Required quantity",
+        "     - Logic: Filtered by SO Number to get BOM components",
+        "",
+        "   📄 POs Table (Purchase Orders):",
+        "     - Column: 'Part Number' → Part identifier",
+        "     - Column: 'Qty Due' → Quantity on order",
+        "     - Column: 'Promised Due Date' → Expected delivery",
+        "     - Logic: Filtered by Part Number and future dates",
+        "",
+        "   ⏱️ Hours Table (Labor Standards):",
+        "     - Column: 'PART_NO' → Part identifier",
+        "     - Column: 'Hours per Unit' → Labor hours",
+        "     - Logic: Grouped by PART_NO, sum of Hours per Unit",
+        "",
+        "   📋 Demand Table (Main Orders):",
+        "     - Column: 'SO No' → Shop Order identifier",
+        "     - Column: 'Part No' → Parent part identifier",
+        "     - Column: 'Rev Qty Due' → Order quantity",
+        "     - Column: 'Start Date' → Order start date",
+        "     - Column: 'Planner' → Planner code",
+        "="*60 + "\n",
+    ]
+    print("\n".join(debug_banner))
+
+# Summary records returned by the tracker - slotted, so the report reads attributes rather than dict keys
+class PhaseStats:
+    __slots__ = ('total_time', 'avg_time', 'count', 'min_time', 'max_time')
+    
+    def __init__(self, times):
+        self.total_time = sum(times)
+        self.count = len(times)
+        self.avg_time = self.total_time / self.count
+        self.min_time = min(times)
+        self.max_time = max(times)
+
+class MemoryStats:
+    __slots__ = ('peak_memory_mb', 'avg_memory_mb', 'initial_memory_mb', 'final_memory_mb')
     
-    # Show data source information
-    print("📊 DATA SOURCES AND COLUMN MAPPINGS:")
-    print("   📦 IPIS Table (Stock):")
-    print("     - Column: 'PART_NO' → Used for stock lookup")
-    print("     - Column: 'Available Qty' → Stock quantity")
-    print("     - Logic: Grouped by PART_NO, sum of Available Qty")
-    print("")
-    print("   🔒 Component Demand Table (Committed):")
-    print("     - Column: 'Component Part Number' → Component identifier")
-    print("     - Column: 'Component Qty Required' → Committed quantity")
-    print("     - Logic: Grouped by Component Part Number, sum of Component Qty Required")
-    print("")
-    print("   📋 Planned Demand Table (BOM):")
-    print("     - Column: 'SO Number' → Shop Order identifier")
-    print("     - Column: 'Component Part Number' → Component identifier")
-    print("     - Column: 'Component Qty Required' → Required quantity")
-    print("     - Logic: Filtered by SO Number to get BOM components")
-    print("")
-    print("   📄 POs Table (Purchase Orders):")
-    print("     - Column: 'Part Number' → Part identifier")
-    print("     - Column: 'Qty Due' → Quantity on order")
-    print("     - Column: 'Promised Due Date' → Expected delivery")
-    print("     - Logic: Filtered by Part Number and future dates")
-    print("")
-    print("   ⏱️ Hours Table (Labor Standards):")
-    print("     - Column: 'PART_NO' → Part identifier")
-    print("     - Column: 'Hours per Unit' → Labor hours")
-    print("     - Logic: Grouped by PART_NO, sum of Hours per Unit")
-    print("")
-    print("   📋 Demand Table (Main Orders):")
-    print("     - Column: 'SO No' → Shop Order identifier")
-    print("     - Column: 'Part No' → Parent part identifier")
-    print("     - Column: 'Rev Qty Due' → Order quantity")
-    print("     - Column: 'Start Date' → Order start date")
-    print("     - Column: 'Planner' → Planner code")
-    print("="*60 + "\n") 
+    def __init__(self, memory_values):
+        self.peak_memory_mb = max(memory_values)
+        self.avg_memory_mb = sum(memory_values) / len(memory_values)
+        self.initial_memory_mb = memory_values[0]
+        self.final_memory_mb = memory_values[-1]
 
 # Performance tracking utilities
 class PerformanceTracker:
     """Track performance metrics across different phases"""
     
-    def __init__(self):
+    def __init__(self, sample_interval=0.25):
         self.phases = {}
         self.current_phase = None
         self.phase_start_time = None
-        self.memory_usage = []
+        self.memory_usage = []  # (timestamp, rss_mb) samples taken by the sampler thread
         self.process = psutil.Process()
+        self.sample_interval = sample_interval
+        self._sampler = None
+        self._stop_sampling = threading.Event()
+    
+    def _sample_memory(self):
+        """Background loop: record RSS every sample_interval seconds until stopped"""
+        while True:
+            self.memory_usage.append((time.time(), self.process.memory_info().rss / 1024 / 1024))
+            if self._stop_sampling.wait(self.sample_interval):
+                break
+    
+    def start_sampling(self):
+        """Start the memory sampler thread if it is not already running"""
+        if self._sampler is None or not self._sampler.is_alive():
+            self._stop_sampling.clear()
+            self._sampler = threading.Thread(target=self._sample_memory, name="MemorySampler", daemon=True)
+            self._sampler.start()
+    
+    def stop_sampling(self):
+        """Stop the memory sampler thread"""
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
     
     def start_phase(self, phase_name):
         """Start timing a new phase"""
         if self.current_phase:
             self.end_phase()
         
+        # Memory is sampled in the background - phases only record timestamps
+        self.start_sampling()
         self.current_phase = phase_name
         self.phase_start_time = time.time()
-        memory_info = self.process.memory_info()
-        self.memory_usage.append({
-            'phase': phase_name,
-            'memory_mb': memory_info.rss / 1024 / 1024,
-            'timestamp': time.time()
-        })
     
     def end_phase(self):
         """End the current phase and record timing"""
@@ -131,43 +197,23 @@ class PerformanceTracker:
                 self.phases[self.current_phase] = []
             self.phases[self.current_phase].append(duration)
             
-            # Record final memory usage for this phase
-            memory_info = self.process.memory_info()
-            self.memory_usage.append({
-                'phase': f"{self.current_phase}_end",
-                'memory_mb': memory_info.rss / 1024 / 1024,
-                'timestamp': time.time()
-            })
-            
             self.current_phase = None
             self.phase_start_time = None
     
+    def add_phase_time(self, phase_name, duration):
+        """Record a duration measured outside start_phase/end_phase (e.g. on a worker thread)"""
+        self.phases.setdefault(phase_name, []).append(duration)
+    
     def get_phase_summary(self):
-        """Get summary of all phases"""
-        summary = {}
-        for phase, times in self.phases.items():
-            if times:
-                summary[phase] = {
-                    'total_time': sum(times),
-                    'avg_time': sum(times) / len(times),
-                    'count': len(times),
-                    'min_time': min(times),
-                    'max_time': max(times)
-                }
-        return summary
+        """Get (phase, PhaseStats) pairs for all phases with recorded times"""
+        return [(phase, PhaseStats(times)) for phase, times in self.phases.items() if times]
     
     def get_memory_summary(self):
-        """Get memory usage summary"""
+        """Get memory usage summary (MemoryStats) from the sampled RSS series, or None if nothing was sampled"""
         if not self.memory_usage:
-            return {}
-        
-        memory_values = [m['memory_mb'] for m in self.memory_usage]
-        return {
-            'peak_memory_mb': max(memory_values),
-            'avg_memory_mb': sum(memory_values) / len(memory_values),
-            'initial_memory_mb': self.memory_usage[0]['memory_mb'] if self.memory_usage else 0,
-            'final_memory_mb': self.memory_usage[-1]['memory_mb'] if self.memory_usage else 0
-        }
+            return None
+        
+        return MemoryStats([mb for _, mb in self.memory_usage])
     
     def cleanup(self):
         """Clean up and end any current phase"""
@@ -180,6 +226,7 @@ performance_tracker = PerformanceTracker()
 def timing_decorator(phase_name):
     """Decorator to automatically time function execution"""
     def decorator(func):
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
             performance_tracker.start_phase(phase_name)
             try:
@@ -190,14 +237,20 @@ def timing_decorator(phase_name):
         return wrapper
     return decorator
 
+# Shared engine - created lazily on first use, connections come from its pool
+_ENGINE = None
+
 def get_database_connection():
-    """Create and return a SQLAlchemy engine for SQL Server"""
+    """Return the shared SQLAlchemy engine for SQL Server, creating it on first use"""
+    global _ENGINE
+    if _ENGINE is not None:
+        return _ENGINE
     try:
         # Create connection string for SQL Server
         connection_string = f"mssql+pyodbc://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?driver=ODBC+Driver+17+for+SQL+Server"
         
-        # Create SQLAlchemy engine with SSMS-like parameters
-        engine = create_engine(
+        # Create SQLAlchemy engine with SSMS-like parameters and a connection pool
+        _ENGINE = create_engine(
             connection_string,
             connect_args={
                 'appname': 'Microsoft SQL Server Management Studio - Query',
@@ -205,40 +258,95 @@ def get_database_connection():
                 'login_timeout': 30,
                 'timeout': 30
             },
+            pool_size=8,
+            max_overflow=4,
+            pool_pre_ping=True,  # Validate pooled connections on checkout
+            pool_recycle=1800,
+            fast_executemany=True,
             echo=False  # Set to True for SQL query logging
         )
-        return engine
+        return _ENGINE
     except Exception as e:
         raise Exception(f"SQL Server connection failed: {str(e)}")
 
-def execute_query(query, params=None):
-    """Execute a SQL query and return results as a pandas DataFrame"""
-    engine = None
+def _shrink_frame(df, dtype=None, key_columns=None):
+    """Apply dtype hints, str join keys (nulls kept) and integer downcasting to a loaded frame"""
+    if dtype:
+        df = df.astype(dtype)
+    for col in key_columns or ():
+        if col in df.columns:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    # Downcast integers only - float quantities stay float64 so allocation comparisons are unchanged
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+def _fetch_arrow(sql):
+    """Fetch a query as columnar Arrow buffers via turbodbc and convert to a DataFrame"""
+    connection = turbodbc.connect(
+        driver='ODBC Driver 17 for SQL Server',
+        server=f"{DB_HOST},{DB_PORT}",
+        database=DB_NAME,
+        uid=DB_USER,
+        pwd=DB_PASSWORD
+    )
+    try:
+        cursor = connection.cursor()
+        cursor.execute(sql)
+        return cursor.fetchallarrow().to_pandas()
+    finally:
+        connection.close()
+
+def execute_query(query, params=None, parse_dates=None, dtype=None, categories=None, key_columns=None, chunksize=None, arrow=False):
+    """Execute a SQL query and return results as a pandas DataFrame
+    
+    parse_dates/dtype/categories shrink the frame on read: dates arrive as datetime64,
+    integer columns are downcast and the listed low-cardinality columns become category.
+    key_columns are cast to str once here (nulls kept) so lookups never need to re-cast.
+    With chunksize, rows are fetched and shrunk in chunks so the raw fetch buffers of
+    only one chunk are alive at a time.
+    arrow=True fetches through turbodbc's Arrow path when it is installed.
+    """
+    # Loaders pass module-level text() statements; plain strings are wrapped here
+    statement = text(query) if isinstance(query, str) else query
+    
+    if arrow and turbodbc is not None and not params and not chunksize:
+        try:
+            df = _shrink_frame(_fetch_arrow(str(statement)), dtype, key_columns)
+            for col in categories or ():
+                if col in df.columns:
+                    df[col] = df[col].astype('category')
+            return df
+        except Exception as e:
+            print(f"WARNING: Arrow fetch failed, falling back to pyodbc: {str(e)}")
+    
     try:
         engine = get_database_connection()
-        # Use SQLAlchemy text() for parameterized queries
-        if params:
-            df = pd.read_sql_query(text(query), engine, params=params)
-        else:
-            df = pd.read_sql_query(text(query), engine)
-        return df
+        with engine.connect() as connection:
+            result = pd.read_sql_query(statement, connection, params=params or None,
+                                       parse_dates=parse_dates, chunksize=chunksize)
+            if chunksize:
+                chunks = [_shrink_frame(chunk, dtype, key_columns) for chunk in result]
+                df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+            else:
+                df = _shrink_frame(result, dtype, key_columns)
     except Exception as e:
         raise Exception(f"Query execution failed: {str(e)}")
-    finally:
-        if engine:
-            engine.dispose()
+    
+    # Categories are set after any concat so every chunk shares one set of codes
+    for col in categories or ():
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
 
-@timing_decorator("Load Demand Data")
-def load_demand_data():
-    """Load demand data from database"""
-    query = """
+_Q_DEMAND = text("""
     SELECT
 		so.ORDER_NO AS 'SO No',
 		so.PART_NO AS 'Part No',
 		ipt.PLANNER_BUYER AS 'Planner',
 		ipt.PRIME_COMMODITY AS 'Comm Group',
 		so.ROWSTATE AS 'Status',
-		so.REVISED_START_DATE AS 'Start Date',
+		CAST(so.REVISED_START_DATE AS datetime2) AS 'Start Date',
 		so.REVISED_QTY_DUE AS 'Rev Qty Due',
 		CASE WHEN RIGHT(so.PART_NO,1) = 'S' THEN 'Sterile' ELSE 'Non-Sterile' END AS 'Sterility'
     FROM IFS.SHOP_ORD_TAB AS so
@@ -249,13 +357,21 @@ def load_demand_data():
 		AND ipt.PLANNER_BUYER IN ('3001','3801','5001','KIT SAMPLES','3802','3803','3804','3805')
 	ORDER BY so.REVISED_START_DATE, so.ORDER_NO
 	;
-    """
-    return execute_query(query)
+    """)
 
-@timing_decorator("Load Planned Demand Data")
-def load_planned_demand_data():
-    """Load planned demand (BOM) data from database"""
-    query = """
+@timing_decorator("Load Demand Data")
+def load_demand_data():
+    """Load demand data from database"""
+    return execute_query(
+        _Q_DEMAND,
+        parse_dates=['Start Date'],
+        dtype={'Rev Qty Due': 'float64'},
+        categories=['Comm Group', 'Status', 'Sterility'],
+        key_columns=['Part No', 'Planner'],
+        arrow=True
+    )
+
+_Q_PLANNED_DEMAND = text("""
     SELECT
 		mac.ORDER_NO AS 'SO Number',
 		so.PART_NO AS 'Kit Number',
@@ -269,100 +385,114 @@ def load_planned_demand_data():
 	WHERE
 		so.CONTRACT = '2051'
 		AND mac.ROWSTATE IN ('Planned')
+		AND mac.PART_NO IS NOT NULL
 	ORDER BY so.REVISED_START_DATE, mac.ORDER_NO
-    """
-    return execute_query(query)
+    """)
 
-@timing_decorator("Load Component Demand Data")
-def load_component_demand_data():
-    """Load committed component demand data from database"""
-    query = """
+@timing_decorator("Load Planned Demand Data")
+def load_planned_demand_data():
+    """Load planned demand (BOM) data from database"""
+    # Largest row-level table - stream it rather than materialising every raw row at once
+    return execute_query(_Q_PLANNED_DEMAND, key_columns=['Component Part Number'], chunksize=50_000)
+
+_Q_COMPONENT_DEMAND = text("""
     SELECT
-		mac.ORDER_NO AS 'SO Number',
-		so.PART_NO AS 'Kit Number',
 		mac.PART_NO AS 'Component Part Number',
-		mac.LINE_ITEM_NO AS 'Line Number',
-		mac.DATE_REQUIRED AS 'Date Needed',
-		mac.QTY_REQUIRED AS 'Component Qty Required'
+		SUM(mac.QTY_REQUIRED) AS 'Component Qty Required'
 	FROM IFS.SHOP_MATERIAL_ALLOC_TAB AS mac
 	LEFT JOIN IFS.SHOP_ORD_TAB AS so
 		ON mac.ORDER_NO = so.ORDER_NO AND mac.CONTRACT = so.CONTRACT
 	WHERE
 		so.CONTRACT = '2051'
 		AND mac.ROWSTATE IN ('Released','Reserved')
-	ORDER BY so.REVISED_START_DATE, mac.ORDER_NO
-	"""
-    return execute_query(query)
+	GROUP BY mac.PART_NO
+	""")
+
+@timing_decorator("Load Component Demand Data")
+def load_component_demand_data():
+    """Load committed component quantities, summed per component part server-side"""
+    return execute_query(_Q_COMPONENT_DEMAND, key_columns=['Component Part Number'], arrow=True)
+
+_Q_IPIS = text("""
+    SELECT
+		stk.PART_NO,
+		SUM(stk.AVAILABLE_QTY) AS 'Available Qty'
+	FROM (
+		SELECT
+			ipt.PART_NO,
+			ipt.LOCATION_NO,
+			ipt.LOT_BATCH_NO,
+			ipt.QTY_ONHAND - ipt.QTY_RESERVED AS AVAILABLE_QTY
+		FROM IFS.INVENTORY_PART_IN_STOCK_TAB AS ipt
+		WHERE 
+			ipt.CONTRACT = '2051'
+			AND ipt.WAREHOUSE <> 'QUALITY'
+			AND ipt.AVAILABILITY_CONTROL_ID IS NULL
+		UNION
+		SELECT
+			ipt.PART_NO,
+			ipt.LOCATION_NO,
+			ipt.LOT_BATCH_NO,
+			ipt.QTY_ONHAND - ipt.QTY_RESERVED AS AVAILABLE_QTY
+		FROM IFS.INVENTORY_PART_IN_STOCK_TAB AS ipt
+		WHERE 
+			ipt.CONTRACT = '2051'
+			AND ipt.WAREHOUSE <> 'QUALITY'
+			AND ipt.AVAILABILITY_CONTROL_ID IN ('GOODS-INWARDS')
+	) AS stk
+	GROUP BY stk.PART_NO
+	""")
 
 @timing_decorator("Load IPIS Data")
 def load_ipis_data():
-    """Load stock data from IPIS table"""
-    query = """
-    SELECT
-		ipt.PART_NO,
-		ipt.LOCATION_NO,
-		ipt.LOT_BATCH_NO,
-		ipt.QTY_ONHAND - ipt.QTY_RESERVED AS 'Available Qty'
-	FROM IFS.INVENTORY_PART_IN_STOCK_TAB AS ipt
-	WHERE 
-		ipt.CONTRACT = '2051'
-		AND ipt.WAREHOUSE <> 'QUALITY'
-		AND ipt.AVAILABILITY_CONTROL_ID IS NULL
-	UNION
-	SELECT
-		ipt.PART_NO,
-		ipt.LOCATION_NO,
-		ipt.LOT_BATCH_NO,
-		ipt.QTY_ONHAND - ipt.QTY_RESERVED AS 'Available Qty'
-	FROM IFS.INVENTORY_PART_IN_STOCK_TAB AS ipt
-	WHERE 
-		ipt.CONTRACT = '2051'
-		AND ipt.WAREHOUSE <> 'QUALITY'
-		AND ipt.AVAILABILITY_CONTROL_ID IN ('GOODS-INWARDS')
-	"""
-    return execute_query(query)
+    """Load available stock from IPIS, summed per part server-side"""
+    return execute_query(_Q_IPIS, key_columns=['PART_NO'], arrow=True)
 
-@timing_decorator("Load Hours Data")
-def load_hours_data():
-    """Load labor standards data from database"""
-    query = """
+_Q_HOURS = text("""
     SELECT
 		hrs.PART_NO,
-		hrs.LABOR_CLASS_NO,
-		CASE
-			WHEN hrs.RUN_TIME_CODE IN (1,3) THEN hrs.LABOR_RUN_FACTOR
-			WHEN hrs.RUN_TIME_CODE IN (2) THEN ISNULL(1/NULLIF(hrs.LABOR_RUN_FACTOR,0),0)
-			ELSE 'Error' END AS 'Hours per Unit',
-		'Kits' AS 'Area'
-	FROM IFS.ROUTING_OPERATION_TAB AS hrs
-	WHERE CONTRACT = '2051'
+		SUM(hrs.HOURS_PER_UNIT) AS 'Hours per Unit'
+	FROM (
+		SELECT
+			hrs.PART_NO,
+			hrs.LABOR_CLASS_NO,
+			CASE
+				WHEN hrs.RUN_TIME_CODE IN (1,3) THEN hrs.LABOR_RUN_FACTOR
+				WHEN hrs.RUN_TIME_CODE IN (2) THEN ISNULL(1/NULLIF(hrs.LABOR_RUN_FACTOR,0),0)
+				ELSE 'Error' END AS HOURS_PER_UNIT,
+			'Kits' AS 'Area'
+		FROM IFS.ROUTING_OPERATION_TAB AS hrs
+		WHERE CONTRACT = '2051'
+			AND PHASE_OUT_DATE IS NULL
+			AND LABOR_CLASS_NO IN ('4936', '4948')
+		UNION
+		SELECT
+			hrs.PART_NO,
+			hrs.LABOR_CLASS_NO,
+			CASE
+				WHEN hrs.RUN_TIME_CODE IN (1,3) THEN hrs.LABOR_RUN_FACTOR
+				WHEN hrs.RUN_TIME_CODE IN (2) THEN ISNULL(1/NULLIF(hrs.LABOR_RUN_FACTOR,0),0)
+				ELSE 'Error' END AS HOURS_PER_UNIT,
+			CASE
+				WHEN hrs.LABOR_CLASS_NO IN ('4931') THEN 'Manufacturing'
+				WHEN hrs.LABOR_CLASS_NO IN ('4940') THEN 'Assembly'
+				WHEN hrs.LABOR_CLASS_NO IN ('4941', '4947') THEN 'Packaging'
+				WHEN hrs.LABOR_CLASS_NO IN ('4942') THEN 'Boxing'
+				ELSE 'N/A' END AS 'Area'
+		FROM IFS.ROUTING_OPERATION_TAB AS hrs
+		WHERE CONTRACT = '2051'
 		AND PHASE_OUT_DATE IS NULL
-		AND LABOR_CLASS_NO IN ('4936', '4948')
-	UNION
-	SELECT
-		hrs.PART_NO,
-		hrs.LABOR_CLASS_NO,
-		CASE
-			WHEN hrs.RUN_TIME_CODE IN (1,3) THEN hrs.LABOR_RUN_FACTOR
-			WHEN hrs.RUN_TIME_CODE IN (2) THEN ISNULL(1/NULLIF(hrs.LABOR_RUN_FACTOR,0),0)
-			ELSE 'Error' END AS 'Hours per Unit',
-		CASE
-			WHEN hrs.LABOR_CLASS_NO IN ('4931') THEN 'Manufacturing'
-			WHEN hrs.LABOR_CLASS_NO IN ('4940') THEN 'Assembly'
-			WHEN hrs.LABOR_CLASS_NO IN ('4941', '4947') THEN 'Packaging'
-			WHEN hrs.LABOR_CLASS_NO IN ('4942') THEN 'Boxing'
-			ELSE 'N/A' END AS 'Area'
-	FROM IFS.ROUTING_OPERATION_TAB AS hrs
-	WHERE CONTRACT = '2051'
-	AND PHASE_OUT_DATE IS NULL
-	AND LABOR_CLASS_NO IN ('4931', '4940', '4941', '4942', '4947');
-    """
-    return execute_query(query)
+		AND LABOR_CLASS_NO IN ('4931', '4940', '4941', '4942', '4947')
+	) AS hrs
+	GROUP BY hrs.PART_NO;
+    """)
 
-@timing_decorator("Load POs Data")
-def load_pos_data():
-    """Load purchase orders data from database"""
-    query = """
+@timing_decorator("Load Hours Data")
+def load_hours_data():
+    """Load labor standards, summed to hours per unit for each part server-side"""
+    return execute_query(_Q_HOURS, key_columns=['PART_NO'], arrow=True)
+
+_Q_POS = text("""
     DECLARE @POWeeksOut INT;
 	SET @POWeeksOut = 7;
 	SELECT
@@ -380,18 +510,58 @@ def load_pos_data():
 		AND pol.PROMISED_DELIVERY_DATE <= DATEADD(DAY, (@POWeeksOut+1)*7 - DATEPART(WEEKDAY, GETDATE()), GETDATE())
 		AND pol.INVOICING_SUPPLIER NOT IN ('1060')
 		ORDER BY pol.PROMISED_DELIVERY_DATE
-    """
-    return execute_query(query)
+    """)
+
+@timing_decorator("Load POs Data")
+def load_pos_data():
+    """Load purchase orders data from database"""
+    return execute_query(_Q_POS, key_columns=['Part Number'])
+
+# Table loaders in the order process_single_scenario unpacks them, with their report phase names
+DATA_LOADERS = [
+    ("Load Demand Data", load_demand_data),
+    ("Load Planned Demand Data", load_planned_demand_data),
+    ("Load Component Demand Data", load_component_demand_data),
+    ("Load IPIS Data", load_ipis_data),
+    ("Load Hours Data", load_hours_data),
+    ("Load POs Data", load_pos_data),
+]
+
+def _timed_load(phase_name, loader):
+    """Run an undecorated loader on a worker thread and return (phase_name, duration, df)"""
+    start = time.time()
+    df = loader.__wrapped__()
+    return phase_name, time.time() - start, df
+
+@timing_decorator("Load All Data")
+def load_all_data():
+    """Run the six independent table loads concurrently on the pooled engine"""
+    with ThreadPoolExecutor(max_workers=len(DATA_LOADERS)) as executor:
+        futures = [executor.submit(_timed_load, name, loader) for name, loader in DATA_LOADERS]
+        results = [future.result() for future in futures]
+    
+    # The tracker is not thread-safe, so per-table timings are recorded here on the caller
+    for phase_name, duration, _ in results:
+        performance_tracker.add_phase_time(phase_name, duration)
+    return tuple(df for _, _, df in results)
+
+_Q_PING = text("SELECT 1")
+
+# Set once the first connection test succeeds - the pool's pre-ping revalidates after that
+_CONNECTION_VERIFIED = False
 
 def test_database_connection():
-    """Test the database connection and return status"""
+    """Test the database connection and return status (only round-trips until the first success)"""
+    global _CONNECTION_VERIFIED
+    if _CONNECTION_VERIFIED:
+        return True, "Database connection successful"
     try:
         engine = get_database_connection()
         if engine:
             # Test the connection by executing a simple query
             with engine.connect() as connection:
-                connection.execute(text("SELECT 1"))
-            engine.dispose()
+                connection.execute(_Q_PING)
+            _CONNECTION_VERIFIED = True
             return True, "Database connection successful"
     except Exception as e:
         return False, f"Database connection failed: {str(e)}"
@@ -408,7 +578,6 @@ def get_table_info():
                 WHERE table_type = 'BASE TABLE'
             """))
             tables = [row[0] for row in result.fetchall()]
-        engine.dispose()
         return tables
     except Exception as e:
         return []
@@ -423,6 +592,73 @@ def normalize_so_number(so_val):
         return so_str.replace('.0', '')
     return so_str
 
+def normalize_so_series(so_series):
+    """Vectorized normalize_so_number for a whole column of SO numbers"""
+    so_str = so_series.astype(str).str.strip()
+    trimmed = so_str.str[:-2]
+    # Remove trailing .0 if it's a whole number
+    is_float_text = so_str.str.endswith('.0') & trimmed.str.isdigit()
+    so_str = so_str.where(~is_float_text, trimmed)
+    return so_str.where(so_series.notna(), "")
+
+# Per-file block of the min/max summary, bound once so the loop only fills in values
+_FILE_SUMMARY = (
+    "📁 FILE: {basename}\n"
+    "   🏆 BEST STRATEGY (Orders): {bo_name}\n"
+    "      → {bo_rc:>6}/{bo_to:>6} orders releasable ({bo_pct:.1f}%)\n"
+    "   \n"
+    "   🏆 BEST STRATEGY (Hours): {bh_name}\n"
+    "      → {bh_rh:,.0f}/{bh_th:,.0f} hours releasable ({bh_pct:.1f}%)\n"
+    "   \n"
+    "   🏆 BEST STRATEGY (Qty): {bq_name}\n"
+    "      → {bq_rq:,}/{bq_tq:,} units releasable ({bq_pct:.1f}%)\n"
+    "   \n"
+    "   📉 WORST STRATEGY: {wo_name}\n"
+    "      → {wo_rc:,} orders releasable\n"
+    "   \n"
+    "   🔺 IMPROVEMENT POTENTIAL: +{improvement:,} more orders ({improvement_pct:.1f}% boost)\n"
+    "\n"
+).format
+
+# Releasable-by-category blocks of the single-scenario summary: (heading, [(label, metric key prefix)])
+_RELEASABLE_SECTIONS = (
+    ("🔧 RELEASABLE KITS:", (
+        ("BVI Kits (3001, 3801):", 'releasable_bvi_kits'),
+        ("Malosa Kits (5001):", 'releasable_malosa_kits'),
+        ("Total Kits:", 'releasable_kits'),
+    )),
+    ("🔬 RELEASABLE INSTRUMENTS:", (
+        ("Manufacturing (3802):", 'releasable_manufacturing'),
+        ("Assembly (3803):", 'releasable_assembly'),
+        ("Packaging (3804):", 'releasable_packaging'),
+        ("Malosa Instruments (3805):", 'releasable_malosa_instruments'),
+        ("Total Instruments:", 'releasable_instruments'),
+    )),
+    ("🎵 RELEASABLE VIRTUOSO:", (
+        ("Virtuoso (3806):", 'releasable_virtuoso'),
+    )),
+)
+
+def find_strategy_extremes(strategy_results):
+    """Return the best (orders, hours, qty) and worst (orders) strategy results from one metrics array"""
+    # One (strategies x 3) array of the compared metrics; argmax/argmin pick the first strategy on ties, as max/min did
+    metrics = np.array([
+        (s['metrics']['releasable_count'], s['metrics']['releasable_hours'], s['metrics']['releasable_qty'])
+        for s in strategy_results
+    ], dtype=np.float64)
+    best_orders, best_hours, best_qty = metrics.argmax(axis=0)
+    worst_orders = metrics[:, 0].argmin()
+    return (strategy_results[best_orders], strategy_results[best_hours],
+            strategy_results[best_qty], strategy_results[worst_orders])
+
+def find_best_strategies(strategy_results):
+    """Return the best (orders, hours, qty) strategy results in a single pass"""
+    return find_strategy_extremes(strategy_results)[:3]
+
+def percent_factor(total):
+    """Multiplier turning a part of total into a percentage; 0 when total is empty"""
+    return 100.0 / total if total else 0.0
+
 def safe_metric(metrics, key, default=0):
     """Safely get a metric value with a default if missing"""
     return metrics.get(key, default)
@@ -460,24 +696,463 @@ def build_stock_dictionary(df_ipis):
     """Build stock dict using IPIS as primary source"""
     stock = {}
     
-    # Use IPIS as the authoritative source
+    # Use IPIS as the authoritative source (already summed per part by the query)
     if not df_ipis.empty:
-        df_ipis["PART_NO"] = df_ipis["PART_NO"].astype(str)
-        ipis_stock = df_ipis.groupby("PART_NO")["Available Qty"].sum().to_dict()
-        stock.update(ipis_stock)
+        stock.update(zip(df_ipis["PART_NO"], df_ipis["Available Qty"]))
     else:
         print("WARNING: IPIS sheet is empty - no stock data available!")
     
     return stock 
 
-# Processing worker thread for Qt6
-class ProcessingWorker(QThread):
+def _find_shortages_numpy(comp_idx, req_qty, stock, used):
+    """Positions in comp_idx whose required qty exceeds stock minus used (numpy fallback)"""
+    return np.flatnonzero(~(stock[comp_idx] - used[comp_idx] >= req_qty))  # NaN stock counts as short
+
+def _commit_allocation_numpy(comp_idx, req_qty, used):
+    """Add each required qty onto used at its part code (numpy fallback)"""
+    np.add.at(used, comp_idx, req_qty)
+
+if njit is not None:
+    @njit(cache=True)
+    def find_shortages(comp_idx, req_qty, stock, used):
+        """Positions in comp_idx whose required qty exceeds stock minus used, compiled with numba"""
+        shortages = np.empty(len(comp_idx), dtype=np.int64)
+        n_short = 0
+        for j in range(len(comp_idx)):
+            if not (stock[comp_idx[j]] - used[comp_idx[j]] >= req_qty[j]):
+                shortages[n_short] = j
+                n_short += 1
+        return shortages[:n_short]
+
+    @njit(cache=True)
+    def commit_allocation(comp_idx, req_qty, used):
+        """Add each required qty onto used at its part code, compiled with numba"""
+        for j in range(len(comp_idx)):
+            used[comp_idx[j]] += req_qty[j]
+else:
+    find_shortages = _find_shortages_numpy
+    commit_allocation = _commit_allocation_numpy
+
+def simulate_scenario(base_data, scenario_name, scenario_num, total_scenarios, sorting_strategy, progress_callback):
+    """Run one sorting strategy over the shared base data (no Qt/tracker state, so it also runs in a worker process)"""
+    
+    strategy_name = sorting_strategy["name"] if sorting_strategy else "Default"
+    
+    # Tables and lookups are shared by every strategy - only the order and allocation differ
+    filtered_df_main = base_data['filtered_df_main']
+    bom_groups = base_data['bom_groups']
+    po_index = base_data['po_index']
+    po_max_qty = base_data['po_max_qty']
+    stock_arr = base_data['stock_arr']
+    committed_arr = base_data['committed_arr']
+    committed_parts_count = base_data['committed_parts_count']
+    total_committed_qty = base_data['total_committed_qty']
+    
+    # Initialize used quantities with the committed quantities - a single contiguous memcpy of the
+    # read-only template, so every scenario starts from the same state
+    used_arr = committed_arr.copy()
+    float_qty = base_data['float_qty'].copy()
+    demand_is_float = base_data['demand_is_float']
+    
+    # Apply sorting strategy - one stable sort over the shared base frame (NaT/missing last)
+    if sorting_strategy:
+        sort_columns = sorting_strategy["columns"]
+        sort_ascending = sorting_strategy["ascending"]
+    else:
+        # Default sorting (original behavior)
+        sort_columns = ['Start Date', 'SO Number']
+        sort_ascending = True
+    filtered_df_main = filtered_df_main.sort_values(
+        sort_columns, ascending=sort_ascending, na_position='last', kind='stable', ignore_index=True
+    )
+    
+    total = len(filtered_df_main)
+    
+    # Baseline estimate: ~0.15 seconds per order (conservative estimate)
+    baseline_time_per_order = 0.15
+    processing_start_time = time.time()
+
+    # Pull the per-order columns out once - the loop indexes plain arrays instead of iterrows() rows
+    so_arr = filtered_df_main["SO Key"].to_numpy(dtype=object)
+    so_valid = filtered_df_main["SO Key"].notna().to_numpy()
+    part_arr = filtered_df_main["Part"].astype(object).to_numpy()
+    part_valid = filtered_df_main["Part"].notna().to_numpy()
+    part_idx_arr = filtered_df_main["Part"].cat.codes.to_numpy(dtype=np.int64)
+    demand_arr = filtered_df_main["Demand"].to_numpy(dtype=stock_arr.dtype)  # Matches the used array it's added to
+    demand_valid = demand_arr > 0  # False for NaN as well
+    pb_arr = filtered_df_main["Is PB"].to_numpy()
+    hours_arr = filtered_df_main["Hours_Calc"].to_numpy(dtype=np.float64)
+    start_date_arr = filtered_df_main["Start Date"].dt.strftime('%Y-%m-%d').fillna("No Date").to_numpy(dtype=object)
+    
+    # Result columns filled by position (one array per column rather than a dict per order).
+    # Planner, Start Date and Demand come straight from the input columns.
+    so_out = np.empty(total, dtype=object)
+    part_out = np.empty(total, dtype=object)
+    pb_out = np.empty(total, dtype=object)
+    hours_out = np.zeros(total, dtype=np.float64)
+    status_out = np.empty(total, dtype=object)
+    shortages_out = np.empty(total, dtype=object)
+    components_out = np.empty(total, dtype=object)
+
+    def emit_progress(processed):
+        """Emit the live progress line with a time estimate for this scenario"""
+        progress_pct = processed / total * 100
+        elapsed = time.time() - processing_start_time
+        remaining_orders = total - processed
+        
+        # Calculate dynamic time estimates
+        if processed >= 10:  # After 10 orders, use actual performance
+            est_remaining = remaining_orders * (elapsed / processed)
+        else:  # For first few orders, use baseline estimate
+            est_remaining = remaining_orders * baseline_time_per_order
+        
+        if processed == total:
+            progress_callback(f"✅ [Scenario {scenario_num}/{total_scenarios}] Database ({strategy_name}) - Completed {total:,} orders in {elapsed:.1f}s")
+        else:
+            # Show current scenario progress + context about remaining scenarios
+            remaining_scenarios = total_scenarios - scenario_num
+            if remaining_scenarios > 0:
+                progress_callback(f"🔁 [Scenario {scenario_num}/{total_scenarios}] {strategy_name} - {processed:,}/{total:,} ({progress_pct:.1f}%) | {est_remaining:.0f}s + {remaining_scenarios} more")
+            else:
+                progress_callback(f"🔁 [Scenario {scenario_num}/{total_scenarios}] {strategy_name} - {processed:,}/{total:,} ({progress_pct:.1f}%) | {est_remaining:.0f}s remaining")
+    
+    # Process each order sequentially in blocks of 100 - the UI update with TIME ESTIMATES
+    # runs at block boundaries rather than being checked on every order
+    if total:
+        emit_progress(1)
+    for chunk_start in range(0, total, 100):
+        chunk_end = min(chunk_start + 100, total)
+        for i in range(chunk_start, chunk_end):
+            so = so_arr[i] if so_valid[i] else f"ORDER_{i + 1}"  # Normalized at load
+            part = part_arr[i] if part_valid[i] else None
+            demand_qty = demand_arr[i] if demand_valid[i] else 0
+            so_out[i] = so
+            
+            # Skip orders with missing critical data
+            if part is None or part == "nan" or demand_qty <= 0:
+                part_out[i] = part or "MISSING"
+                pb_out[i] = "-"
+                status_out[i] = "⚠️ Skipped"
+                shortages_out[i] = "-"
+                components_out[i] = "Missing part number or zero demand"
+                continue
+            
+            # Check if this is a piggyback order
+            is_pb = "PB" if pb_arr[i] else "-"
+            
+            # Get planned demand for this SO (None when the SO has no BOM rows)
+            bom = bom_groups.get(so)
+            
+            # Check material availability
+            releasable = True
+            shortage_details = []
+            shortage_parts_only = []  # Part numbers of the shortages, captured as they are found
+            components_needed = {}
+            
+            # Labor hours for this order (hours per unit x demand, computed at load)
+            labor_hours = hours_arr[i]
+            
+            if bom is not None:
+                # This SO has planned component demand - use ALL-OR-NOTHING allocation
+                comp_parts, comp_idx, req_arr, req_qtys = bom
+                components_needed = dict(zip(comp_parts, req_qtys))
+            
+                # Check every component first, allocate only if none are short
+                short_pos = find_shortages(comp_idx, req_arr, stock_arr, used_arr)
+                if len(short_pos) == 0:
+                    commit_allocation(comp_idx, req_arr, used_arr)
+                    releasable = True
+                else:
+                    releasable = False
+                    for j in short_pos:
+                        comp_part = comp_parts[j]
+                        required_qty = req_qtys[j]
+                        code = comp_idx[j]
+                        true_available = stock_arr[code] - used_arr[code]
+                        if not float_qty[code]:
+                            true_available = int(true_available)
+                        shortage = abs(true_available - required_qty)
+                        # Search POs for potential resolution
+                        po_match = None
+                        po_reach = po_max_qty.get(comp_part)
+                        if po_reach is not None:
+                            k = int(np.searchsorted(po_reach, shortage))
+                            if k < po_reach.size:
+                                po_id, po_date, _ = po_index[comp_part][k]
+                                po_match = (po_id, po_date)
+                        if po_match is not None:
+                            po_id, po_date = po_match
+                            shortage_details.append(f"{comp_part} short {shortage} – PO {po_id} due {po_date}")
+                        else:
+                            shortage_details.append(f"{comp_part} (need {required_qty}, have {true_available}, short {shortage})")
+                        shortage_parts_only.append(comp_part)
+
+            else:
+                # This SO has no planned component demand - treat as raw material/purchased part
+                # Every non-skipped part has a code in the stock/used arrays, so this can't miss
+                part_idx = part_idx_arr[i]
+                true_available = stock_arr[part_idx] - used_arr[part_idx]  # Changed to use true_available
+                if not float_qty[part_idx]:
+                    true_available = int(true_available)
+                available_after_usage = true_available - demand_qty  # Added to match debug logic
+                
+                if true_available >= demand_qty:  # Changed to use true_available
+                    used_arr[part_idx] += demand_qty
+                    if demand_is_float:
+                        float_qty[part_idx] = True
+                    releasable = True
+                else:
+                    releasable = False
+                    shortage = abs(available_after_usage)  # Changed to use available_after_usage
+                    shortage_details.append(f"{part} (need {demand_qty}, have {true_available}, short {shortage})")
+                    shortage_parts_only.append(part)
+
+            # Build result record
+            components_info = "; ".join(shortage_details) if shortage_details else str(components_needed) if components_needed else "-"
+
+            clean_shortages = "; ".join(shortage_parts_only) if shortage_parts_only else "-"
+
+            part_out[i] = part
+            pb_out[i] = is_pb
+            hours_out[i] = round(labor_hours, 4)
+            status_out[i] = "✅ Release" if releasable else "❌ Hold"
+            shortages_out[i] = clean_shortages
+            components_out[i] = components_info
+            
+        emit_progress(chunk_end)
+
+    # Calculate summary metrics
+    df_results = pd.DataFrame({
+        "SO Number": so_out,
+        "Part": part_out,
+        # Same categorical as the demand frame - the planner filters below compare int codes
+        "Planner": filtered_df_main["Planner"].array,
+        "Start Date": start_date_arr,
+        "PB": pb_out,
+        "Demand": np.where(demand_valid, demand_arr, 0.0),
+        "Hours": hours_out,
+        "Status": status_out,
+        "Shortages": shortages_out,
+        "Components": components_out
+    })
+    
+    # One pivot gives order count, hours and quantity per planner (rows) and status (columns);
+    # the status metrics are its column totals and each category sums its planner rows
+    status_values = ['✅ Release', '❌ Hold', '⚠️ Skipped']
+    piv = df_results.pivot_table(
+        index='Planner', columns='Status', values=['SO Number', 'Hours', 'Demand'],
+        aggfunc={'SO Number': 'count', 'Hours': 'sum', 'Demand': 'sum'},
+        fill_value=0, observed=True
+    ).reindex(columns=pd.MultiIndex.from_product([['SO Number', 'Hours', 'Demand'], status_values]), fill_value=0)
+    status_totals = piv.sum()
+    
+    def planner_totals(planners, status=None):
+        """(order count, hours, qty) for the given planner codes, optionally for one status only"""
+        rows = piv[piv.index.isin(planners)]
+        if status is None:
+            return int(rows['SO Number'].to_numpy().sum()), rows['Hours'].to_numpy().sum(), rows['Demand'].to_numpy().sum()
+        return int(rows[('SO Number', status)].sum()), rows[('Hours', status)].sum(), rows[('Demand', status)].sum()
+    
+    total_orders = len(df_results)
+    releasable_count = int(status_totals[('SO Number', '✅ Release')])
+    held_count = total_orders - releasable_count
+    pb_count = int(df_results['PB'].eq('PB').sum())
+    skipped_count = int(status_totals[('SO Number', '⚠️ Skipped')])
+    
+    total_hours = df_results['Hours'].sum()
+    releasable_hours = status_totals[('Hours', '✅ Release')]
+    held_hours = status_totals[('Hours', '❌ Hold')]
+    
+    # Calculate quantity metrics
+    total_qty = df_results['Demand'].sum()
+    releasable_qty = status_totals[('Demand', '✅ Release')]
+    held_qty = status_totals[('Demand', '❌ Hold')]
+    
+    # Calculate Kit and Instrument metrics with subcategories
+    # BVI Kits (Planner codes 3001, 3801)
+    bvi_kit_planners = ['3001', '3801']
+    total_bvi_kits_count, total_bvi_kits_hours, total_bvi_kits_qty = planner_totals(bvi_kit_planners)
+    releasable_bvi_kits_count, releasable_bvi_kits_hours, releasable_bvi_kits_qty = planner_totals(bvi_kit_planners, '✅ Release')
+    
+    # Malosa Kits (Planner code 5001)
+    malosa_kit_planners = ['5001']
+    total_malosa_kits_count, total_malosa_kits_hours, total_malosa_kits_qty = planner_totals(malosa_kit_planners)
+    releasable_malosa_kits_count, releasable_malosa_kits_hours, releasable_malosa_kits_qty = planner_totals(malosa_kit_planners, '✅ Release')
+    
+    # Total Kits
+    total_kits_count = total_bvi_kits_count + total_malosa_kits_count
+    total_kits_hours = total_bvi_kits_hours + total_malosa_kits_hours
+    total_kits_qty = total_bvi_kits_qty + total_malosa_kits_qty
+    releasable_kits_count = releasable_bvi_kits_count + releasable_malosa_kits_count
+    releasable_kits_hours = releasable_bvi_kits_hours + releasable_malosa_kits_hours
+    releasable_kits_qty = releasable_bvi_kits_qty + releasable_malosa_kits_qty
+    
+    # Manufacturing (Planner code 3802)
+    manufacturing_planners = ['3802']
+    total_manufacturing_count, total_manufacturing_hours, total_manufacturing_qty = planner_totals(manufacturing_planners)
+    releasable_manufacturing_count, releasable_manufacturing_hours, releasable_manufacturing_qty = planner_totals(manufacturing_planners, '✅ Release')
+    
+    # Assembly (Planner code 3803)
+    assembly_planners = ['3803']
+    total_assembly_count, total_assembly_hours, total_assembly_qty = planner_totals(assembly_planners)
+    releasable_assembly_count, releasable_assembly_hours, releasable_assembly_qty = planner_totals(assembly_planners, '✅ Release')
+    
+    # Packaging (Planner code 3804)
+    packaging_planners = ['3804']
+    total_packaging_count, total_packaging_hours, total_packaging_qty = planner_totals(packaging_planners)
+    releasable_packaging_count, releasable_packaging_hours, releasable_packaging_qty = planner_totals(packaging_planners, '✅ Release')
+    
+    # Malosa Instruments (Planner code 3805)
+    malosa_instrument_planners = ['3805']
+    total_malosa_instruments_count, total_malosa_instruments_hours, total_malosa_instruments_qty = planner_totals(malosa_instrument_planners)
+    releasable_malosa_instruments_count, releasable_malosa_instruments_hours, releasable_malosa_instruments_qty = planner_totals(malosa_instrument_planners, '✅ Release')
+    
+    # Virtuoso (Planner code 3806)
+    virtuoso_planners = ['3806']
+    total_virtuoso_count, total_virtuoso_hours, total_virtuoso_qty = planner_totals(virtuoso_planners)
+    releasable_virtuoso_count, releasable_virtuoso_hours, releasable_virtuoso_qty = planner_totals(virtuoso_planners, '✅ Release')
+    
+    # Kit Samples (Planner code KIT SAMPLES)
+    kit_samples_planners = ['KIT SAMPLES']
+    total_kit_samples_count, total_kit_samples_hours, total_kit_samples_qty = planner_totals(kit_samples_planners)
+    releasable_kit_samples_count, releasable_kit_samples_hours, releasable_kit_samples_qty = planner_totals(kit_samples_planners, '✅ Release')
+    
+    # Total Instruments
+    total_instruments_count = (total_manufacturing_count + total_assembly_count + 
+                             total_packaging_count + total_malosa_instruments_count)
+    total_instruments_hours = (total_manufacturing_hours + total_assembly_hours + 
+                             total_packaging_hours + total_malosa_instruments_hours)
+    total_instruments_qty = (total_manufacturing_qty + total_assembly_qty + 
+                           total_packaging_qty + total_malosa_instruments_qty)
+    releasable_instruments_count = (releasable_manufacturing_count + releasable_assembly_count + 
+                                  releasable_packaging_count + releasable_malosa_instruments_count)
+    releasable_instruments_hours = (releasable_manufacturing_hours + releasable_assembly_hours + 
+                                  releasable_packaging_hours + releasable_malosa_instruments_hours)
+    releasable_instruments_qty = (releasable_manufacturing_qty + releasable_assembly_qty + 
+                                releasable_packaging_qty + releasable_malosa_instruments_qty)
+    
+    return {
+        'name': scenario_name,
+        'filepath': 'Database',
+        'sorting_strategy': sorting_strategy["name"] if sorting_strategy else "Default (Start Date)",
+        'results_df': df_results,
+        'metrics': {
+            'total_orders': total_orders,
+            'releasable_count': releasable_count,
+            'held_count': held_count,
+            'pb_count': pb_count,
+            'skipped_count': skipped_count,
+            '---1': '---',
+            'total_hours': total_hours,
+            'releasable_hours': releasable_hours,
+            'held_hours': held_hours,
+            'total_qty': total_qty,
+            'releasable_qty': releasable_qty,
+            'held_qty': held_qty,
+            '---2': '---',
+            'total_kits_count': total_kits_count,
+            'total_kits_hours': total_kits_hours,
+            'total_kits_qty': total_kits_qty,
+            'releasable_kits_count': releasable_kits_count,
+            'releasable_kits_hours': releasable_kits_hours,
+            'releasable_kits_qty': releasable_kits_qty,
+            'total_bvi_kits_count': total_bvi_kits_count,
+            'total_bvi_kits_hours': total_bvi_kits_hours,
+            'total_bvi_kits_qty': total_bvi_kits_qty,
+            'releasable_bvi_kits_count': releasable_bvi_kits_count,
+            'releasable_bvi_kits_hours': releasable_bvi_kits_hours,
+            'releasable_bvi_kits_qty': releasable_bvi_kits_qty,
+            'total_malosa_kits_count': total_malosa_kits_count,
+            'total_malosa_kits_hours': total_malosa_kits_hours,
+            'total_malosa_kits_qty': total_malosa_kits_qty,
+            'releasable_malosa_kits_count': releasable_malosa_kits_count,
+            'releasable_malosa_kits_hours': releasable_malosa_kits_hours,
+            'releasable_malosa_kits_qty': releasable_malosa_kits_qty,
+            '---3': '---',
+            'total_instruments_count': total_instruments_count,
+            'total_instruments_hours': total_instruments_hours,
+            'total_instruments_qty': total_instruments_qty,
+            'releasable_instruments_count': releasable_instruments_count,
+            'releasable_instruments_hours': releasable_instruments_hours,
+            'releasable_instruments_qty': releasable_instruments_qty,
+            'total_manufacturing_count': total_manufacturing_count,
+            'total_manufacturing_hours': total_manufacturing_hours,
+            'total_manufacturing_qty': total_manufacturing_qty,
+            'releasable_manufacturing_count': releasable_manufacturing_count,
+            'releasable_manufacturing_hours': releasable_manufacturing_hours,
+            'releasable_manufacturing_qty': releasable_manufacturing_qty,
+            'total_assembly_count': total_assembly_count,
+            'total_assembly_hours': total_assembly_hours,
+            'total_assembly_qty': total_assembly_qty,
+            'releasable_assembly_count': releasable_assembly_count,
+            'releasable_assembly_hours': releasable_assembly_hours,
+            'releasable_assembly_qty': releasable_assembly_qty,
+            'total_packaging_count': total_packaging_count,
+            'total_packaging_hours': total_packaging_hours,
+            'total_packaging_qty': total_packaging_qty,
+            'releasable_packaging_count': releasable_packaging_count,
+            'releasable_packaging_hours': releasable_packaging_hours,
+            'releasable_packaging_qty': releasable_packaging_qty,
+            'total_malosa_instruments_count': total_malosa_instruments_count,
+            'total_malosa_instruments_hours': total_malosa_instruments_hours,
+            'total_malosa_instruments_qty': total_malosa_instruments_qty,
+            'releasable_malosa_instruments_count': releasable_malosa_instruments_count,
+            'releasable_malosa_instruments_hours': releasable_malosa_instruments_hours,
+            'releasable_malosa_instruments_qty': releasable_malosa_instruments_qty,
+            '---4': '---',
+            'total_virtuoso_count': total_virtuoso_count,
+            'total_virtuoso_hours': total_virtuoso_hours,
+            'total_virtuoso_qty': total_virtuoso_qty,
+            'releasable_virtuoso_count': releasable_virtuoso_count,
+            'releasable_virtuoso_hours': releasable_virtuoso_hours,
+            'releasable_virtuoso_qty': releasable_virtuoso_qty,
+            '---5': '---',
+            'committed_parts_count': committed_parts_count,
+            'total_committed_qty': total_committed_qty,
+            'total_kit_samples_count': total_kit_samples_count,
+            'total_kit_samples_hours': total_kit_samples_hours,
+            'total_kit_samples_qty': total_kit_samples_qty,
+            'releasable_kit_samples_count': releasable_kit_samples_count,
+            'releasable_kit_samples_hours': releasable_kit_samples_hours,
+            'releasable_kit_samples_qty': releasable_kit_samples_qty
+        }
+    }
+
+# Per-process state for the min/max strategy sweep - set once by the pool initializer so the
+# base data is pickled once per worker process, not once per strategy
+_SCENARIO_BASE_DATA = None
+_SCENARIO_PROGRESS_QUEUE = None
+
+def _init_scenario_process(base_data, progress_queue):
+    """Pool initializer: keep the shared base data and the progress queue for this worker process"""
+    global _SCENARIO_BASE_DATA, _SCENARIO_PROGRESS_QUEUE
+    _SCENARIO_BASE_DATA = base_data
+    _SCENARIO_PROGRESS_QUEUE = progress_queue
+
+def _run_scenario_process(scenario_name, scenario_num, total_scenarios, sorting_strategy):
+    """Run one strategy in a worker process and return (scenario result, duration)"""
+    start = time.time()
+    result = simulate_scenario(
+        _SCENARIO_BASE_DATA, scenario_name, scenario_num, total_scenarios, sorting_strategy,
+        _SCENARIO_PROGRESS_QUEUE.put
+    )
+    return result, time.time() - start
+
+# Signals for the processing worker - a QRunnable is not a QObject, so they live on a helper object
+class ProcessingSignals(QObject):
     progress_updated = pyqtSignal(str)
     finished = pyqtSignal(dict)
     error_occurred = pyqtSignal(str)
-    
+
+# Processing worker for Qt6 - runs on the main window's persistent QThreadPool
+class ProcessingWorker(QRunnable):
     def __init__(self, minmax_mode, include_kits, include_instruments, include_virtuoso, include_kit_samples):
         super().__init__()
+        self.setAutoDelete(False)  # The main window keeps the reference
+        self.signals = ProcessingSignals()
+        self.progress_updated = self.signals.progress_updated
+        self.finished = self.signals.finished
+        self.error_occurred = self.signals.error_occurred
         self.minmax_mode = minmax_mode
         self.include_kits = include_kits
         self.include_instruments = include_instruments
@@ -485,6 +1160,7 @@ class ProcessingWorker(QThread):
         self.include_kit_samples = include_kit_samples
         self.scenarios = []
         self.scenarios_for_comparison = []
+        self.base_data = None  # Loaded once per run and shared across strategies
         
     def run(self):
         try:
@@ -509,43 +1185,11 @@ class ProcessingWorker(QThread):
                 
                 self.progress_updated.emit(f"🔥 MIN/MAX MODE: Testing {len(strategies)} sorting strategies on database = {total_scenarios} total scenarios")
                 
-                scenario_num = 0
-                all_strategy_results = []  # Store ALL results for comparison
-                
-                for strategy_idx, strategy in enumerate(strategies):
-                    scenario_num += 1
-                    scenario_name = f"Database_{strategy['name'].replace(' ', '_').replace('(', '').replace(')', '')}"
-                    
-                    # Process with specific sorting strategy
-                    scenario_start_time = time.time()
-                    scenario_result = self.process_single_scenario(
-                        scenario_name, scenario_num, total_scenarios, strategy
-                    )
-                    scenario_end_time = time.time()
-                    scenario_duration = scenario_end_time - scenario_start_time
-                    
-                    # Store result for this strategy
-                    all_strategy_results.append(scenario_result)
-                    
-                    # Show completion
-                    metrics = scenario_result['metrics']
-                    remaining_scenarios = total_scenarios - scenario_num
-                    
-                    if remaining_scenarios > 0:
-                        total_elapsed = time.time() - start_time
-                        avg_time_per_scenario = total_elapsed / scenario_num
-                        estimated_remaining = remaining_scenarios * avg_time_per_scenario
-                        
-                        self.progress_updated.emit(f"✅ [{scenario_num}/{total_scenarios}] {strategy['name']}: {metrics['releasable_count']:,}/{metrics['total_orders']:,} orders ({scenario_duration:.1f}s) | {estimated_remaining:.0f}s remaining")
-                    else:
-                        self.progress_updated.emit(f"✅ [{scenario_num}/{total_scenarios}] {strategy['name']}: {metrics['releasable_count']:,}/{metrics['total_orders']:,} orders ({scenario_duration:.1f}s) | OPTIMIZATION COMPLETE!")
-                    
-                    time.sleep(0.2)  # Brief pause between strategies
+                # Store ALL results for comparison (in strategy order)
+                all_strategy_results = self.run_strategies(strategies, start_time)
                 
                 # Find the best strategies
-                best_orders_strategy = max(all_strategy_results, key=lambda s: s['metrics']['releasable_count'])
-                best_hours_strategy = max(all_strategy_results, key=lambda s: s['metrics']['releasable_hours'])
-                best_qty_strategy = max(all_strategy_results, key=lambda s: s['metrics']['releasable_qty'])
+                best_orders_strategy, best_hours_strategy, best_qty_strategy = find_best_strategies(all_strategy_results)
                 
                 # Create NEW scenario objects with clear names for the best strategies
                 # Best Orders Strategy
@@ -579,7 +1223,6 @@ class ProcessingWorker(QThread):
                 self.scenarios.append(best_qty_scenario)
                 
                 self.progress_updated.emit(f"🏆 Database optimized: Orders={best_orders_strategy['sorting_strategy']} ({best_orders_strategy['metrics']['releasable_count']:,}), Hours={best_hours_strategy['sorting_strategy']} ({best_hours_strategy['metrics']['releasable_hours']:,.0f}), Qty={best_qty_strategy['sorting_strategy']} ({best_qty_strategy['metrics']['releasable_qty']:,})")
-                time.sleep(0.5)
                 
                 # Use all_strategy_results for comparison tables
                 self.scenarios_for_comparison = all_strategy_results
@@ -606,12 +1249,11 @@ class ProcessingWorker(QThread):
                 # Show completion with actual metrics and time
                 metrics = scenario_result['metrics']
                 self.progress_updated.emit(f"✅ [Scenario {scenario_num}/{total_scenarios}] Complete: {metrics['releasable_count']:,}/{metrics['total_orders']:,} releasable ({scenario_duration:.1f}s) | COMPLETE!")
-                
-                time.sleep(0.3)
             
             # Calculate total processing time
             end_time = time.time()
             processing_time = end_time - start_time
+            performance_tracker.stop_sampling()
             
             # Return results
             results = {
@@ -624,31 +1266,111 @@ class ProcessingWorker(QThread):
             self.finished.emit(results)
             
         except Exception as e:
+            performance_tracker.stop_sampling()
             self.error_occurred.emit(f"Processing failed: {str(e)}")
     
-    def process_single_scenario(self, scenario_name, scenario_num=1, total_scenarios=1, sorting_strategy=None):
-        """Process a single scenario from database and return results with live progress updates"""
-        
-        # Start overall processing timing
-        performance_tracker.start_phase("Total Processing")
+    def report_strategy_done(self, strategy, scenario_result, duration, completed, total_scenarios, start_time):
+        """Emit the completion line for one min/max strategy with the remaining-time estimate"""
+        metrics = scenario_result['metrics']
+        remaining_scenarios = total_scenarios - completed
+        
+        if remaining_scenarios > 0:
+            total_elapsed = time.time() - start_time
+            avg_time_per_scenario = total_elapsed / completed
+            estimated_remaining = remaining_scenarios * avg_time_per_scenario
+            
+            self.progress_updated.emit(f"✅ [{completed}/{total_scenarios}] {strategy['name']}: {metrics['releasable_count']:,}/{metrics['total_orders']:,} orders ({duration:.1f}s) | {estimated_remaining:.0f}s remaining")
+        else:
+            self.progress_updated.emit(f"✅ [{completed}/{total_scenarios}] {strategy['name']}: {metrics['releasable_count']:,}/{metrics['total_orders']:,} orders ({duration:.1f}s) | OPTIMIZATION COMPLETE!")
+    
+    def run_strategies(self, strategies, start_time):
+        """Run every min/max sorting strategy and return the scenario results in strategy order.
+        
+        Strategies are independent runs over the same read-only base data, so they are spread across
+        worker processes; falls back to running them one after another if a process pool can't be used.
+        """
+        total_scenarios = len(strategies)
+        scenario_names = [
+            f"Database_{strategy['name'].replace(' ', '_').replace('(', '').replace(')', '')}"
+            for strategy in strategies
+        ]
+        
+        workers = min(total_scenarios, os.cpu_count() or 1)
+        if workers > 1:
+            # Load (or reuse) the base data here so the workers receive it ready-built
+            performance_tracker.start_phase("Total Processing")
+            base_data = self.load_base_data()
+            performance_tracker.end_phase()
+            
+            self.progress_updated.emit(f"⚡ Running {total_scenarios} strategies across {workers} processes...")
+            try:
+                return self.run_strategies_parallel(strategies, scenario_names, base_data, workers, start_time)
+            except (BrokenProcessPool, OSError) as e:
+                self.progress_updated.emit(f"⚠️ Parallel run unavailable ({e}) - running strategies one at a time")
+        
+        all_strategy_results = []
+        for scenario_num, (strategy, scenario_name) in enumerate(zip(strategies, scenario_names), start=1):
+            # Process with specific sorting strategy
+            scenario_start_time = time.time()
+            scenario_result = self.process_single_scenario(
+                scenario_name, scenario_num, total_scenarios, strategy
+            )
+            scenario_duration = time.time() - scenario_start_time
+            
+            all_strategy_results.append(scenario_result)
+            self.report_strategy_done(strategy, scenario_result, scenario_duration, scenario_num, total_scenarios, start_time)
+        return all_strategy_results
+    
+    def run_strategies_parallel(self, strategies, scenario_names, base_data, workers, start_time):
+        """Run the strategies in a process pool, relaying worker progress to the GUI while waiting"""
+        total_scenarios = len(strategies)
+        results = [None] * total_scenarios
+        progress_queue = multiprocessing.Queue()
+        
+        def relay_progress():
+            while True:
+                try:
+                    message = progress_queue.get_nowait()
+                except queue.Empty:
+                    return
+                self.progress_updated.emit(message)
+        
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_scenario_process, initargs=(base_data, progress_queue)
+        ) as executor:
+            futures = {
+                executor.submit(_run_scenario_process, scenario_name, scenario_num, total_scenarios, strategy): scenario_num - 1
+                for scenario_num, (strategy, scenario_name) in enumerate(zip(strategies, scenario_names), start=1)
+            }
+            pending = set(futures)
+            completed = 0
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                relay_progress()
+                for future in done:
+                    idx = futures[future]
+                    scenario_result, scenario_duration = future.result()
+                    results[idx] = scenario_result
+                    completed += 1
+                    # Worker processes have their own tracker - record each run's time here
+                    performance_tracker.add_phase_time("Order Processing", scenario_duration)
+                    self.report_strategy_done(strategies[idx], scenario_result, scenario_duration, completed, total_scenarios, start_time)
+        
+        relay_progress()
+        return results
+    
+    def load_base_data(self):
+        """Load the database tables and build every strategy-independent input once per run"""
+        if self.base_data is not None:
+            return self.base_data
         
-        strategy_name = sorting_strategy["name"] if sorting_strategy else "Default"
-        self.progress_updated.emit(f"📂 [Scenario {scenario_num}/{total_scenarios}] Loading data from database ({strategy_name})...")
+        self.progress_updated.emit("📂 Loading data from database...")
         
         # Load the data from database with proper timing separation
         try:
-            # Test database connection first (this will be included in the data loading timing)
-            performance_tracker.start_phase("Database Connection")
-            test_connection = get_database_connection()
-            performance_tracker.end_phase()
-            
-            # Load all data tables
-            df_main = load_demand_data()
-            df_struct = load_planned_demand_data()
-            df_component_demand = load_component_demand_data()
-            df_ipis = load_ipis_data()
-            df_hours = load_hours_data()
-            df_pos = load_pos_data()
+            # Connection was already tested by the caller - pooled checkouts are pre-pinged
+            # Load all data tables (concurrently - they are independent queries)
+            df_main, df_struct, df_component_demand, df_ipis, df_hours, df_pos = load_all_data()
         except Exception as e:
             performance_tracker.end_phase()  # End total processing
             raise Exception(f"Failed to load data from database: {str(e)}")
@@ -666,523 +1388,223 @@ class ProcessingWorker(QThread):
             'Rev Qty Due': 'Demand'
         })
         
-        strategy_name = sorting_strategy["name"] if sorting_strategy else "Default"
-        self.progress_updated.emit(f"🔁 [Scenario {scenario_num}/{total_scenarios}] Processing commitments ({strategy_name})...")
+        self.progress_updated.emit("🔁 Processing commitments...")
         
         # Build stock dictionary
         stock = build_stock_dictionary(df_ipis)
         
-        # Build committed_components
-        committed_components = {}
-        committed_parts_count = 0
-        total_committed_qty = 0
-
-        if not df_component_demand.empty:
-            df_component_demand["Component Part Number"] = df_component_demand["Component Part Number"].astype(str)
-            committed_summary = df_component_demand.groupby("Component Part Number")["Component Qty Required"].sum()
-            committed_components = committed_summary.to_dict()
-            committed_parts_count = len(committed_components)
-            total_committed_qty = sum(committed_components.values())
-
-        # Initialize used_components with the committed quantities
-        used_components = committed_components.copy()
+        # Committed quantities as a Series keyed by component - already summed per component by the
+        # query, so it reindexes straight onto the part codes without a dict round-trip
+        committed_components = pd.Series(
+            df_component_demand["Component Qty Required"].to_numpy(),
+            index=df_component_demand["Component Part Number"].to_numpy()
+        )
+        committed_parts_count = len(committed_components)
+        total_committed_qty = df_component_demand["Component Qty Required"].sum() if committed_parts_count else 0
 
-        # Build labor standards dictionary (unchanged)
-        df_hours["PART_NO"] = df_hours["PART_NO"].astype(str)
-        labor_standards = df_hours.groupby("PART_NO")["Hours per Unit"].sum().to_dict()
+        # Build labor standards dictionary (already summed per part by the query)
+        labor_standards = dict(zip(df_hours["PART_NO"], df_hours["Hours per Unit"]))
         
-        strategy_name = sorting_strategy["name"] if sorting_strategy else "Default"
-        self.progress_updated.emit(f"🔁 [Scenario {scenario_num}/{total_scenarios}] Building planned demand structures ({strategy_name})...")
+        self.progress_updated.emit("🔁 Building planned demand structures...")
         
         # Build planned demand structure
         planned_demand = df_struct[df_struct["Component Part Number"].notna()].copy()
-        planned_demand["SO Number"] = planned_demand["SO Number"].astype(str).str.strip()
-        planned_demand["Component Part Number"] = planned_demand["Component Part Number"].astype(str)
         
         # Apply normalization to both planned demand and main data
-        planned_demand["SO Number"] = planned_demand["SO Number"].apply(normalize_so_number)
+        planned_demand["SO Number"] = normalize_so_series(planned_demand["SO Number"])
         
-        # Pre-process main data (unchanged)
-        df_main['Start Date'] = pd.to_datetime(df_main['Start Date'], errors='coerce')
-        df_main["Part"] = df_main["Part"].astype(str)
-        df_main["Planner"] = df_main["Planner"].fillna("UNKNOWN").astype(str)
+        # Pre-process main data (Start Date already arrives as datetime64 via parse_dates)
+        df_main["Planner"] = df_main["Planner"].fillna("UNKNOWN").astype('category')
         df_main["Demand"] = pd.to_numeric(df_main["Demand"], errors='coerce').fillna(0)
+        # A null part number reads as "None" and is still allocated, as in the SQL front-end
+        df_main["Part"] = df_main["Part"].astype(str)
         
-        # Filter data based on selected categories
-        filtered_df_main = df_main.copy()
+        # One shared part dtype so demand, BOM and PO part keys compare as aligned int codes.
+        # Categories are sorted so the Part Number sort strategies keep their A-Z/Z-A order.
+        all_parts = pd.concat([
+            df_main["Part"], planned_demand["Component Part Number"], df_pos["Part Number"]
+        ]).dropna().unique()
+        part_dtype = pd.CategoricalDtype(categories=pd.Index(all_parts).sort_values())
+        df_main["Part"] = df_main["Part"].astype(part_dtype)
+        planned_demand["Component Part Number"] = planned_demand["Component Part Number"].astype(part_dtype)
+        df_pos["Part Number"] = df_pos["Part Number"].astype(part_dtype)
         
+        # Filter data based on selected categories
         # Define planner codes for each category
         kits_planners = ['3001', '3801', '5001']  # BVI Kits (3001, 3801) + Malosa Kits (5001)
         instruments_planners = ['3802', '3803', '3804', '3805']  # Manufacturing, Assembly, Packaging, Malosa Instruments
         virtuoso_planners = ['3806']  # Virtuoso
         kit_samples_planners = ['KIT SAMPLES']
         
-        # Build filter mask based on selected categories
-        filter_mask = pd.Series([False] * len(df_main), index=df_main.index)
+        # Build filter mask based on selected categories - one isin over the union of their codes
+        selected_planners = set()
         
         if self.include_kits:
-            filter_mask |= df_main['Planner'].isin(kits_planners)
+            selected_planners.update(kits_planners)
         
         if self.include_instruments:
-            filter_mask |= df_main['Planner'].isin(instruments_planners)
+            selected_planners.update(instruments_planners)
         
         if self.include_virtuoso:
-            filter_mask |= df_main['Planner'].isin(virtuoso_planners)
+            selected_planners.update(virtuoso_planners)
         
         if self.include_kit_samples:
-            filter_mask |= df_main['Planner'].isin(kit_samples_planners)
+            selected_planners.update(kit_samples_planners)
         
-        # Apply filter
-        filtered_df_main = df_main[filter_mask].copy()
+        filter_mask = df_main['Planner'].isin(selected_planners)
+        
+        # Apply filter (boolean selection already returns a new frame - no extra copy needed)
+        filtered_df_main = df_main.loc[filter_mask]
         
         total_original = len(df_main)
         total_filtered = len(filtered_df_main)
         excluded = total_original - total_filtered
-        self.progress_updated.emit(f"🔁 [Scenario {scenario_num}/{total_scenarios}] Filtered data: {total_filtered:,}/{total_original:,} orders selected ({excluded:,} excluded) ({strategy_name})...")
-        
-        # Calculate hours for sorting (unchanged)
-        filtered_df_main["Hours_Calc"] = filtered_df_main.apply(lambda row: 
-            labor_standards.get(str(row["Part"]), 0) * row["Demand"], axis=1)
-        
-        # Apply sorting strategy (unchanged)
-        if sorting_strategy:
-            # Handle missing values appropriately for each column type
-            for col in sorting_strategy["columns"]:
-                if col == "Start Date":
-                    # Put NaT (missing dates) at the end
-                    filtered_df_main = filtered_df_main.sort_values(sorting_strategy["columns"], 
-                                                ascending=sorting_strategy["ascending"], 
-                                                na_position='last')
-                else:
-                    filtered_df_main = filtered_df_main.sort_values(sorting_strategy["columns"], 
-                                                ascending=sorting_strategy["ascending"])
-        else:
-            # Default sorting (original behavior)
-            filtered_df_main = filtered_df_main.sort_values(['Start Date', 'SO Number'], na_position='last')
+        self.progress_updated.emit(f"🔁 Filtered data: {total_filtered:,}/{total_original:,} orders selected ({excluded:,} excluded)...")
+        
+        # Normalized SO numbers for the BOM lookup, done once here rather than per order per
+        # scenario. Kept beside "SO Number" (missing stays missing) so sorting is unaffected.
+        so_key = normalize_so_series(filtered_df_main["SO Number"]).where(filtered_df_main["SO Number"].notna())
+        
+        # Calculate hours per order - used for sorting and as each order's labor hours
+        hours_std = pd.Series(labor_standards, dtype=np.float64).reindex(
+            filtered_df_main["Part"].astype(object), fill_value=0
+        ).to_numpy(dtype=np.float64)
+        
+        # Piggyback flag per order: NS<part>99 is used as a BOM component somewhere. Built from the
+        # distinct component parts and checked for every order at once, not per order per scenario.
+        pb_parts_set = set(planned_demand["Component Part Number"].dropna().unique().astype(str))
+        is_pb = ("NS" + filtered_df_main["Part"].astype(str) + "99").isin(pb_parts_set)
+        
+        # Add the derived per-order columns in one assign
+        filtered_df_main = filtered_df_main.assign(**{
+            "SO Key": so_key,
+            "Hours_Calc": hours_std * filtered_df_main["Demand"].to_numpy(),
+            "Is PB": is_pb
+        })
         
-        filtered_df_main = filtered_df_main.reset_index(drop=True)
+        # Stock and committed quantities as arrays indexed by the shared part codes, so the
+        # allocation loop does integer indexing instead of dict lookups. Every part the loop can
+        # look up (demand parts and BOM components) is a category. Whole-unit data stays int64;
+        # anything fractional uses float64 for the arithmetic.
+        part_index = part_dtype.categories
+        stock_qty = pd.Series(stock, dtype=None if stock else np.int64).reindex(part_index, fill_value=0)  # No stock reads as 0
+        committed_qty = committed_components.reindex(part_index, fill_value=0)
+        stock_is_float = not pd.api.types.is_integer_dtype(stock_qty)
+        committed_is_float = not pd.api.types.is_integer_dtype(committed_qty)
+        demand_is_float = not pd.api.types.is_integer_dtype(filtered_df_main["Demand"])
+        qty_dtype = np.float64 if (stock_is_float or committed_is_float or demand_is_float) else np.int64
+        stock_arr = pd.to_numeric(stock_qty, errors='coerce').to_numpy(dtype=qty_dtype)
+        committed_arr = pd.to_numeric(committed_qty, errors='coerce').to_numpy(dtype=qty_dtype)
+        # Parts whose available qty reads as a float in the shortage text, independent of the array dtype:
+        # float stock or commitments for the parts that have them, plus any part a scenario gives a float demand
+        float_qty = np.zeros(len(part_index), dtype=bool)
+        if stock_is_float:
+            float_qty |= part_index.isin(list(stock))
+        if committed_is_float:
+            float_qty |= part_index.isin(committed_components.index)
+        # Shared by every strategy: read-only, each scenario takes a contiguous copy of committed_arr
+        # (and float_qty) as its own, so an accidental in-place write to the template fails loudly
+        stock_arr.setflags(write=False)
+        committed_arr.setflags(write=False)
+        float_qty.setflags(write=False)
+        
+        # BOM per SO as (component parts, component part codes, required qty array, required qtys) -
+        # O(1) lookups per order, and the availability check runs over plain arrays instead of iterrows()
+        req_qty = pd.to_numeric(planned_demand["Component Qty Required"], errors='coerce').fillna(0).astype(np.int64)
+        bom_groups = {
+            so_number: (
+                group["Component Part Number"].astype(str).tolist(),
+                group["Component Part Number"].cat.codes.to_numpy(dtype=np.int64),
+                req_qty.loc[group.index].to_numpy(),
+                req_qty.loc[group.index].tolist()  # Python ints for the component text
+            )
+            for so_number, group in planned_demand.groupby("SO Number", sort=False)
+        }
+        
+        # Future POs per part in due-date order: part -> [(PO number, due date text, qty due), ...]
+        # Dates are parsed, compared against one "now" snapshot and formatted once, here.
+        # po_max_qty holds the running max of qty due per part (non-decreasing), so the first PO
+        # covering a shortage is found with a binary search instead of scanning the list.
+        now = pd.Timestamp.now()
+        po_due_dates = pd.to_datetime(df_pos["Promised Due Date"], errors='coerce')
+        po_qty_due = pd.to_numeric(df_pos["Qty Due"], errors='coerce').fillna(0)
+        future_pos = df_pos.assign(_due=po_due_dates, _qty=po_qty_due)[po_due_dates >= now]
+        future_pos = future_pos.sort_values("_due", kind='stable')
+        future_pos["_due_str"] = future_pos["_due"].dt.strftime('%Y-%m-%d')
+        po_index = {}
+        po_max_qty = {}
+        for part_no, group in future_pos.groupby("Part Number", sort=False, observed=True):
+            po_index[part_no] = list(zip(group["PO Number"], group["_due_str"], group["_qty"]))
+            po_max_qty[part_no] = np.maximum.accumulate(group["_qty"].to_numpy(dtype=np.float64))
+        
+        self.base_data = {
+            'filtered_df_main': filtered_df_main,
+            'bom_groups': bom_groups,
+            'po_index': po_index,
+            'po_max_qty': po_max_qty,
+            'stock_arr': stock_arr,
+            'committed_arr': committed_arr,
+            'float_qty': float_qty,
+            'demand_is_float': demand_is_float,
+            'committed_parts_count': committed_parts_count,
+            'total_committed_qty': total_committed_qty
+        }
+        return self.base_data
+    
+    def process_single_scenario(self, scenario_name, scenario_num=1, total_scenarios=1, sorting_strategy=None):
+        """Process a single scenario from database and return results with live progress updates"""
+        
+        # Start overall processing timing
+        performance_tracker.start_phase("Total Processing")
+        
+        base_data = self.load_base_data()
         
-        results = []
         # Start order processing timing
         performance_tracker.start_phase("Order Processing")
         
-        processed = 0
-        total = len(filtered_df_main)
-        
-        # Baseline estimate: ~0.15 seconds per order (conservative estimate)
-        baseline_time_per_order = 0.15
-        processing_start_time = time.time()
-
-        # Process each order sequentially with FREQUENT UI updates + TIME ESTIMATES
-        for _, row in filtered_df_main.iterrows():
-            processed += 1
-            
-            # UPDATE UI EVERY 100 ORDERS
-            if processed % 100 == 0 or processed == total or processed == 1:
-                progress_pct = processed / total * 100
-                
-                # Calculate dynamic time estimates
-                if processed >= 10:  # After 10 orders, use actual performance
-                    elapsed = time.time() - processing_start_time
-                    actual_time_per_order = elapsed / processed
-                    remaining_orders = total - processed
-                    est_remaining = remaining_orders * actual_time_per_order
-                else:  # For first few orders, use baseline estimate
-                    elapsed = time.time() - processing_start_time
-                    remaining_orders = total - processed
-                    est_remaining = remaining_orders * baseline_time_per_order
-                
-                strategy_name = sorting_strategy["name"] if sorting_strategy else "Default"
-                if processed == total:
-                    self.progress_updated.emit(f"✅ [Scenario {scenario_num}/{total_scenarios}] Database ({strategy_name}) - Completed {total:,} orders in {elapsed:.1f}s")
-                else:
-                    # Show current scenario progress + context about remaining scenarios
-                    remaining_scenarios = total_scenarios - scenario_num
-                    if remaining_scenarios > 0:
-                        self.progress_updated.emit(f"🔁 [Scenario {scenario_num}/{total_scenarios}] {strategy_name} - {processed:,}/{total:,} ({progress_pct:.1f}%) | {est_remaining:.0f}s + {remaining_scenarios} more")
-                    else:
-                        self.progress_updated.emit(f"🔁 [Scenario {scenario_num}/{total_scenarios}] {strategy_name} - {processed:,}/{total:,} ({progress_pct:.1f}%) | {est_remaining:.0f}s remaining")
-            
-            so = str(row["SO Number"]).strip() if pd.notna(row["SO Number"]) else f"ORDER_{processed}"
-            part = str(row["Part"]) if pd.notna(row["Part"]) else None
-            demand_qty = row["Demand"] if pd.notna(row["Demand"]) and row["Demand"] > 0 else 0
-            planner = str(row["Planner"]) if pd.notna(row["Planner"]) else "UNKNOWN"
-            start_date = row["Start Date"]
-            
-            # NORMALIZE SO NUMBER for consistent matching
-            so = normalize_so_number(so)
-            
-            # Skip orders with missing critical data
-            if part is None or part == "nan" or demand_qty <= 0:
-                results.append({
-                    "SO Number": so,
-                    "Part": part or "MISSING",
-                    "Planner": planner,
-                    "Start Date": start_date.strftime('%Y-%m-%d') if pd.notna(start_date) else "No Date",
-                    "PB": "-",
-                    "Demand": demand_qty,
-                    "Hours": 0,
-                    "Status": "⚠️ Skipped",
-                    "Shortages": "-",
-                    "Components": "Missing part number or zero demand"
-                })
-                continue
-            
-            # Check if this is a piggyback order
-            try:
-                pb_check = f"NS{part}99"
-                is_pb = "PB" if pb_check in planned_demand["Component Part Number"].values else "-"
-            except:
-                is_pb = "-"
-            
-            # Get planned demand for this SO
-            try:
-                bom = planned_demand[planned_demand["SO Number"] == so]
-            except:
-                bom = pd.DataFrame()
-            
-            # Check material availability
-            releasable = True
-            shortage_details = []
-            components_needed = {}
-            
-            # Calculate labor hours for this order
-            base_hours = labor_standards.get(part, 0)
-            labor_hours = base_hours * demand_qty
-            
-            if len(bom) > 0:
-                # This SO has planned component demand - use ALL-OR-NOTHING allocation
-                all_components_available = True
-                component_requirements = []
-                
-                for _, comp in bom.iterrows():
-                    try:
-                        comp_part = str(comp["Component Part Number"])
-                        required_qty = int(comp["Component Qty Required"]) if pd.notna(comp["Component Qty Required"]) else 0
-                        total_used = used_components.get(comp_part, 0)
-                        true_available = stock.get(comp_part, 0) - total_used
-                        available = max(0, true_available)
-
-                        # Always use the 'what if' calculation for both debug and output
-                        available_after_usage = true_available - required_qty
-                        will_be_sufficient = true_available >= required_qty
-
-                        component_requirements.append({
-                            'part': comp_part,
-                            'required': required_qty,
-                            'available': available
-                        })
-                        components_needed[comp_part] = required_qty
-
-                        # Check availability but DON'T allocate yet
-                        if not will_be_sufficient:
-                            all_components_available = False
-                            shortage = abs(available_after_usage)  # Changed to use available_after_usage directly
-                            # Search POs for potential resolution
-                            future_pos = df_pos[
-                                (df_pos["Part Number"].astype(str) == comp_part) &
-                                (pd.to_datetime(df_pos["Promised Due Date"], errors="coerce") >= datetime.now())
-                            ]
-                            po_match = None
-                            for _, po_row in future_pos.iterrows():
-                                po_qty = po_row["Qty Due"]
-                                if po_qty >= shortage:
-                                    po_match = po_row
-                                    break
-                            if po_match is not None:
-                                po_id = po_match["PO Number"]
-                                po_date = pd.to_datetime(po_match["Promised Due Date"]).strftime('%Y-%m-%d')
-                                shortage_details.append(f"{comp_part} short {shortage} – PO {po_id} due {po_date}")
-                            else:
-                                shortage_details.append(f"{comp_part} (need {required_qty}, have {true_available}, short {shortage})")
-                    except Exception as e:
-                        all_components_available = False
-                        shortage_details.append(f"Component processing error: {str(e)}")
-                        continue
-
-                # Only after all checks, allocate components if all are available
-                if all_components_available:
-                    releasable = True
-                    for req in component_requirements:
-                        comp_part = req['part']
-                        required_qty = req['required']
-                        used_components[comp_part] = used_components.get(comp_part, 0) + required_qty
-                else:
-                    releasable = False
-
-            elif len(bom) == 0:
-                # This SO has no planned component demand - treat as raw material/purchased part
-                try:
-                    total_used = used_components.get(part, 0)
-                    true_available = stock.get(part, 0) - total_used  # Changed to use true_available
-                    available_after_usage = true_available - demand_qty  # Added to match debug logic
-                    
-                    if true_available >= demand_qty:  # Changed to use true_available
-                        used_components[part] = used_components.get(part, 0) + demand_qty
-                        releasable = True
-                    else:
-                        releasable = False
-                        shortage = abs(available_after_usage)  # Changed to use available_after_usage
-                        shortage_details.append(f"{part} (need {demand_qty}, have {true_available}, short {shortage})")
-                except:
-                    releasable = False
-                    shortage_details.append(f"{part} (stock lookup failed)")
-
-            # Build result record
-            shortage_parts_only = []
-            components_info = "; ".join(shortage_details) if shortage_details else str(components_needed) if components_needed else "-"
-
-            # Extract just the part numbers from shortage details
-            for detail in shortage_details:
-                if " short " in detail and "–" in detail:
-                    part_short = detail.split(" short ")[0].strip()
-                    shortage_parts_only.append(part_short)
-                elif "(" in detail and " (need " in detail:
-                    part_short = detail.split(" (need ")[0].strip()
-                    shortage_parts_only.append(part_short)
-                elif "(" in detail:
-                    part_short = detail.split("(")[0].strip()
-                    shortage_parts_only.append(part_short)
-                else:
-                    part_short = detail.split()[0] if detail.split() else detail
-                    shortage_parts_only.append(part_short)
-
-            clean_shortages = "; ".join(shortage_parts_only) if shortage_parts_only else "-"
-
-            results.append({
-                "SO Number": so,
-                "Part": part,
-                "Planner": planner,
-                "Start Date": start_date.strftime('%Y-%m-%d') if pd.notna(start_date) else "No Date",
-                "PB": is_pb,
-                "Demand": demand_qty,
-                "Hours": round(labor_hours, 4),
-                "Status": "✅ Release" if releasable else "❌ Hold",
-                "Shortages": clean_shortages,
-                "Components": components_info
-            })
-
-        # Calculate summary metrics
-        df_results = pd.DataFrame(results)
-        total_orders = len(df_results)
-        releasable_count = len(df_results[df_results['Status'] == '✅ Release'])
-        held_count = total_orders - releasable_count
-        pb_count = len(df_results[df_results['PB'] == 'PB'])
-        skipped_count = len(df_results[df_results['Status'] == '⚠️ Skipped'])
-        
-        total_hours = df_results['Hours'].sum()
-        releasable_hours = df_results[df_results['Status'] == '✅ Release']['Hours'].sum()
-        held_hours = df_results[df_results['Status'] == '❌ Hold']['Hours'].sum()
-        
-        # Calculate quantity metrics
-        total_qty = df_results['Demand'].sum()
-        releasable_qty = df_results[df_results['Status'] == '✅ Release']['Demand'].sum()
-        held_qty = df_results[df_results['Status'] == '❌ Hold']['Demand'].sum()
-        
-        # Calculate Kit and Instrument metrics with subcategories
-        releasable_results = df_results[df_results['Status'] == '✅ Release']
-        held_results = df_results[df_results['Status'] == '❌ Hold']
-        
-        # BVI Kits (Planner codes 3001, 3801)
-        bvi_kit_planners = ['3001', '3801']
-        total_bvi_kits = df_results[df_results['Planner'].isin(bvi_kit_planners)]
-        releasable_bvi_kits = releasable_results[releasable_results['Planner'].isin(bvi_kit_planners)]
-        total_bvi_kits_count = len(total_bvi_kits)
-        total_bvi_kits_hours = total_bvi_kits['Hours'].sum()
-        total_bvi_kits_qty = total_bvi_kits['Demand'].sum()
-        releasable_bvi_kits_count = len(releasable_bvi_kits)
-        releasable_bvi_kits_hours = releasable_bvi_kits['Hours'].sum()
-        releasable_bvi_kits_qty = releasable_bvi_kits['Demand'].sum()
-        
-        # Malosa Kits (Planner code 5001)
-        malosa_kit_planners = ['5001']
-        total_malosa_kits = df_results[df_results['Planner'].isin(malosa_kit_planners)]
-        releasable_malosa_kits = releasable_results[releasable_results['Planner'].isin(malosa_kit_planners)]
-        total_malosa_kits_count = len(total_malosa_kits)
-        total_malosa_kits_hours = total_malosa_kits['Hours'].sum()
-        total_malosa_kits_qty = total_malosa_kits['Demand'].sum()
-        releasable_malosa_kits_count = len(releasable_malosa_kits)
-        releasable_malosa_kits_hours = releasable_malosa_kits['Hours'].sum()
-        releasable_malosa_kits_qty = releasable_malosa_kits['Demand'].sum()
-        
-        # Total Kits
-        total_kits_count = total_bvi_kits_count + total_malosa_kits_count
-        total_kits_hours = total_bvi_kits_hours + total_malosa_kits_hours
-        total_kits_qty = total_bvi_kits_qty + total_malosa_kits_qty
-        releasable_kits_count = releasable_bvi_kits_count + releasable_malosa_kits_count
-        releasable_kits_hours = releasable_bvi_kits_hours + releasable_malosa_kits_hours
-        releasable_kits_qty = releasable_bvi_kits_qty + releasable_malosa_kits_qty
-        
-        # Manufacturing (Planner code 3802)
-        manufacturing_planners = ['3802']
-        total_manufacturing = df_results[df_results['Planner'].isin(manufacturing_planners)]
-        releasable_manufacturing = releasable_results[releasable_results['Planner'].isin(manufacturing_planners)]
-        total_manufacturing_count = len(total_manufacturing)
-        total_manufacturing_hours = total_manufacturing['Hours'].sum()
-        total_manufacturing_qty = total_manufacturing['Demand'].sum()
-        releasable_manufacturing_count = len(releasable_manufacturing)
-        releasable_manufacturing_hours = releasable_manufacturing['Hours'].sum()
-        releasable_manufacturing_qty = releasable_manufacturing['Demand'].sum()
-        
-        # Assembly (Planner code 3803)
-        assembly_planners = ['3803']
-        total_assembly = df_results[df_results['Planner'].isin(assembly_planners)]
-        releasable_assembly = releasable_results[releasable_results['Planner'].isin(assembly_planners)]
-        total_assembly_count = len(total_assembly)
-        total_assembly_hours = total_assembly['Hours'].sum()
-        total_assembly_qty = total_assembly['Demand'].sum()
-        releasable_assembly_count = len(releasable_assembly)
-        releasable_assembly_hours = releasable_assembly['Hours'].sum()
-        releasable_assembly_qty = releasable_assembly['Demand'].sum()
-        
-        # Packaging (Planner code 3804)
-        packaging_planners = ['3804']
-        total_packaging = df_results[df_results['Planner'].isin(packaging_planners)]
-        releasable_packaging = releasable_results[releasable_results['Planner'].isin(packaging_planners)]
-        total_packaging_count = len(total_packaging)
-        total_packaging_hours = total_packaging['Hours'].sum()
-        total_packaging_qty = total_packaging['Demand'].sum()
-        releasable_packaging_count = len(releasable_packaging)
-        releasable_packaging_hours = releasable_packaging['Hours'].sum()
-        releasable_packaging_qty = releasable_packaging['Demand'].sum()
-        
-        # Malosa Instruments (Planner code 3805)
-        malosa_instrument_planners = ['3805']
-        total_malosa_instruments = df_results[df_results['Planner'].isin(malosa_instrument_planners)]
-        releasable_malosa_instruments = releasable_results[releasable_results['Planner'].isin(malosa_instrument_planners)]
-        total_malosa_instruments_count = len(total_malosa_instruments)
-        total_malosa_instruments_hours = total_malosa_instruments['Hours'].sum()
-        total_malosa_instruments_qty = total_malosa_instruments['Demand'].sum()
-        releasable_malosa_instruments_count = len(releasable_malosa_instruments)
-        releasable_malosa_instruments_hours = releasable_malosa_instruments['Hours'].sum()
-        releasable_malosa_instruments_qty = releasable_malosa_instruments['Demand'].sum()
-        
-        # Virtuoso (Planner code 3806)
-        virtuoso_planners = ['3806']
-        total_virtuoso = df_results[df_results['Planner'].isin(virtuoso_planners)]
-        releasable_virtuoso = releasable_results[releasable_results['Planner'].isin(virtuoso_planners)]
-        total_virtuoso_count = len(total_virtuoso)
-        total_virtuoso_hours = total_virtuoso['Hours'].sum()
-        total_virtuoso_qty = total_virtuoso['Demand'].sum()
-        releasable_virtuoso_count = len(releasable_virtuoso)
-        releasable_virtuoso_hours = releasable_virtuoso['Hours'].sum()
-        releasable_virtuoso_qty = releasable_virtuoso['Demand'].sum()
-        
-        # Kit Samples (Planner code KIT SAMPLES)
-        kit_samples_planners = ['KIT SAMPLES']
-        total_kit_samples = df_results[df_results['Planner'].isin(kit_samples_planners)]
-        releasable_kit_samples = releasable_results[releasable_results['Planner'].isin(kit_samples_planners)]
-        total_kit_samples_count = len(total_kit_samples)
-        total_kit_samples_hours = total_kit_samples['Hours'].sum()
-        total_kit_samples_qty = total_kit_samples['Demand'].sum()
-        releasable_kit_samples_count = len(releasable_kit_samples)
-        releasable_kit_samples_hours = releasable_kit_samples['Hours'].sum()
-        releasable_kit_samples_qty = releasable_kit_samples['Demand'].sum()
-        
-        # Total Instruments
-        total_instruments_count = (total_manufacturing_count + total_assembly_count + 
-                                 total_packaging_count + total_malosa_instruments_count)
-        total_instruments_hours = (total_manufacturing_hours + total_assembly_hours + 
-                                 total_packaging_hours + total_malosa_instruments_hours)
-        total_instruments_qty = (total_manufacturing_qty + total_assembly_qty + 
-                               total_packaging_qty + total_malosa_instruments_qty)
-        releasable_instruments_count = (releasable_manufacturing_count + releasable_assembly_count + 
-                                      releasable_packaging_count + releasable_malosa_instruments_count)
-        releasable_instruments_hours = (releasable_manufacturing_hours + releasable_assembly_hours + 
-                                      releasable_packaging_hours + releasable_malosa_instruments_hours)
-        releasable_instruments_qty = (releasable_manufacturing_qty + releasable_assembly_qty + 
-                                    releasable_packaging_qty + releasable_malosa_instruments_qty)
+        result = simulate_scenario(
+            base_data, scenario_name, scenario_num, total_scenarios, sorting_strategy, self.progress_updated.emit
+        )
         
         # End order processing and total processing phases
         performance_tracker.end_phase()  # End Order Processing
         performance_tracker.end_phase()  # End Total Processing
         
-        return {
-            'name': scenario_name,
-            'filepath': 'Database',
-            'sorting_strategy': sorting_strategy["name"] if sorting_strategy else "Default (Start Date)",
-            'results_df': df_results,
-            'metrics': {
-                'total_orders': total_orders,
-                'releasable_count': releasable_count,
-                'held_count': held_count,
-                'pb_count': pb_count,
-                'skipped_count': skipped_count,
-                '---1': '---',
-                'total_hours': total_hours,
-                'releasable_hours': releasable_hours,
-                'held_hours': held_hours,
-                'total_qty': total_qty,
-                'releasable_qty': releasable_qty,
-                'held_qty': held_qty,
-                '---2': '---',
-                'total_kits_count': total_kits_count,
-                'total_kits_hours': total_kits_hours,
-                'total_kits_qty': total_kits_qty,
-                'releasable_kits_count': releasable_kits_count,
-                'releasable_kits_hours': releasable_kits_hours,
-                'releasable_kits_qty': releasable_kits_qty,
-                'total_bvi_kits_count': total_bvi_kits_count,
-                'total_bvi_kits_hours': total_bvi_kits_hours,
-                'total_bvi_kits_qty': total_bvi_kits_qty,
-                'releasable_bvi_kits_count': releasable_bvi_kits_count,
-                'releasable_bvi_kits_hours': releasable_bvi_kits_hours,
-                'releasable_bvi_kits_qty': releasable_bvi_kits_qty,
-                'total_malosa_kits_count': total_malosa_kits_count,
-                'total_malosa_kits_hours': total_malosa_kits_hours,
-                'total_malosa_kits_qty': total_malosa_kits_qty,
-                'releasable_malosa_kits_count': releasable_malosa_kits_count,
-                'releasable_malosa_kits_hours': releasable_malosa_kits_hours,
-                'releasable_malosa_kits_qty': releasable_malosa_kits_qty,
-                '---3': '---',
-                'total_instruments_count': total_instruments_count,
-                'total_instruments_hours': total_instruments_hours,
-                'total_instruments_qty': total_instruments_qty,
-                'releasable_instruments_count': releasable_instruments_count,
-                'releasable_instruments_hours': releasable_instruments_hours,
-                'releasable_instruments_qty': releasable_instruments_qty,
-                'total_manufacturing_count': total_manufacturing_count,
-                'total_manufacturing_hours': total_manufacturing_hours,
-                'total_manufacturing_qty': total_manufacturing_qty,
-                'releasable_manufacturing_count': releasable_manufacturing_count,
-                'releasable_manufacturing_hours': releasable_manufacturing_hours,
-                'releasable_manufacturing_qty': releasable_manufacturing_qty,
-                'total_assembly_count': total_assembly_count,
-                'total_assembly_hours': total_assembly_hours,
-                'total_assembly_qty': total_assembly_qty,
-                'releasable_assembly_count': releasable_assembly_count,
-                'releasable_assembly_hours': releasable_assembly_hours,
-                'releasable_assembly_qty': releasable_assembly_qty,
-                'total_packaging_count': total_packaging_count,
-                'total_packaging_hours': total_packaging_hours,
-                'total_packaging_qty': total_packaging_qty,
-                'releasable_packaging_count': releasable_packaging_count,
-                'releasable_packaging_hours': releasable_packaging_hours,
-                'releasable_packaging_qty': releasable_packaging_qty,
-                'total_malosa_instruments_count': total_malosa_instruments_count,
-                'total_malosa_instruments_hours': total_malosa_instruments_hours,
-                'total_malosa_instruments_qty': total_malosa_instruments_qty,
-                'releasable_malosa_instruments_count': releasable_malosa_instruments_count,
-                'releasable_malosa_instruments_hours': releasable_malosa_instruments_hours,
-                'releasable_malosa_instruments_qty': releasable_malosa_instruments_qty,
-                '---4': '---',
-                'total_virtuoso_count': total_virtuoso_count,
-                'total_virtuoso_hours': total_virtuoso_hours,
-                'total_virtuoso_qty': total_virtuoso_qty,
-                'releasable_virtuoso_count': releasable_virtuoso_count,
-                'releasable_virtuoso_hours': releasable_virtuoso_hours,
-                'releasable_virtuoso_qty': releasable_virtuoso_qty,
-                '---5': '---',
-                'committed_parts_count': committed_parts_count,
-                'total_committed_qty': total_committed_qty,
-                'total_kit_samples_count': total_kit_samples_count,
-                'total_kit_samples_hours': total_kit_samples_hours,
-                'total_kit_samples_qty': total_kit_samples_qty,
-                'releasable_kit_samples_count': releasable_kit_samples_count,
-                'releasable_kit_samples_hours': releasable_kit_samples_hours,
-                'releasable_kit_samples_qty': releasable_kit_samples_qty
-            }
-        } 
+        return result
+
+# Signals for the save worker
+class SaveFileSignals(QObject):
+    finished = pyqtSignal(str, str)  # file path, error message ('' on success)
+
+# Writes an in-memory workbook to disk off the GUI thread
+class SaveFileWorker(QRunnable):
+    def __init__(self, buffer, file_path):
+        super().__init__()
+        self.setAutoDelete(False)  # The main window keeps the reference until it reports back
+        self.signals = SaveFileSignals()
+        self.buffer = buffer
+        self.file_path = file_path
+    
+    def run(self):
+        try:
+            # Write straight from a view of the buffer - no bytes copy of the workbook
+            with self.buffer.getbuffer() as buffer_data:
+                with open(self.file_path, "wb") as f:
+                    f.write(buffer_data)
+        except Exception as e:
+            self.signals.finished.emit(self.file_path, str(e))
+        else:
+            self.signals.finished.emit(self.file_path, "")
+
+# Fonts shared by (family, size, weight) - setFont copies, so one instance per style is enough
+_FONT_CACHE = {}
+
+def _font(family, size, weight=QFont.Weight.Normal):
+    key = (family, size, weight)
+    font = _FONT_CACHE.get(key)
+    if font is None:
+        font = _FONT_CACHE[key] = QFont(family, size, weight)
+    return font
 
 # Qt6 Main Window
 class PlanSnapMainWindow(QMainWindow):
@@ -1190,6 +1612,19 @@ class PlanSnapMainWindow(QMainWindow):
         super().__init__()
         self.quick_analysis_excel_buffer = None
         self.processing_worker = None
+        self.save_worker = None
+        
+        # One persistent pool thread runs the processing - no QThread built per click
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        
+        # Progress messages from the worker are coalesced: only the latest one is painted
+        self._pending_status = None
+        self.status_timer = QTimer(self)
+        self.status_timer.setSingleShot(True)
+        self.status_timer.setInterval(50)
+        self.status_timer.timeout.connect(self.flush_status)
+        
         self.init_ui()
         
     def init_ui(self):
@@ -1225,12 +1660,12 @@ class PlanSnapMainWindow(QMainWindow):
         
         # Min/Max Mode checkbox
         self.minmax_checkbox = QCheckBox("🔥 Enable Triple Optimization Mode")
-        self.minmax_checkbox.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        self.minmax_checkbox.setFont(_font("Arial", 10, QFont.Weight.Bold))
         main_layout.addWidget(self.minmax_checkbox)
         
         # Min/Max tooltip
         minmax_tooltip = QLabel("Tests all sorting strategies to find best results for Orders, Hours, and Quantity")
-        minmax_tooltip.setFont(QFont("Arial", 8))
+        minmax_tooltip.setFont(_font("Arial", 8))
         minmax_tooltip.setStyleSheet("color: gray; font-style: italic;")
         main_layout.addWidget(minmax_tooltip)
         
@@ -1238,12 +1673,12 @@ class PlanSnapMainWindow(QMainWindow):
         
         # No Export checkbox
         self.no_export_checkbox = QCheckBox("⚡ Quick Analysis Mode")
-        self.no_export_checkbox.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        self.no_export_checkbox.setFont(_font("Arial", 10, QFont.Weight.Bold))
         main_layout.addWidget(self.no_export_checkbox)
         
         # No Export tooltip
         no_export_tooltip = QLabel("Show results instantly without creating Excel files (useful for rapid testing)")
-        no_export_tooltip.setFont(QFont("Arial", 8))
+        no_export_tooltip.setFont(_font("Arial", 8))
         no_export_tooltip.setStyleSheet("color: gray; font-style: italic;")
         main_layout.addWidget(no_export_tooltip)
         
@@ -1255,28 +1690,28 @@ class PlanSnapMainWindow(QMainWindow):
         
         # Create variables for material category checkboxes
         self.include_kits_checkbox = QCheckBox("🔧 Kits (Planner codes: 3001, 3801, 5001)")
-        self.include_kits_checkbox.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        self.include_kits_checkbox.setFont(_font("Arial", 10, QFont.Weight.Bold))
         self.include_kits_checkbox.setChecked(True)
         material_layout.addWidget(self.include_kits_checkbox)
         
         self.include_instruments_checkbox = QCheckBox("🔬 Instruments (Planner codes: 3802, 3803, 3804, 3805)")
-        self.include_instruments_checkbox.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        self.include_instruments_checkbox.setFont(_font("Arial", 10, QFont.Weight.Bold))
         self.include_instruments_checkbox.setChecked(True)
         material_layout.addWidget(self.include_instruments_checkbox)
         
         self.include_virtuoso_checkbox = QCheckBox("🎵 Virtuoso (Planner code: 3806)")
-        self.include_virtuoso_checkbox.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        self.include_virtuoso_checkbox.setFont(_font("Arial", 10, QFont.Weight.Bold))
         self.include_virtuoso_checkbox.setChecked(True)
         material_layout.addWidget(self.include_virtuoso_checkbox)
         
         self.include_kit_samples_checkbox = QCheckBox("🧪 Kit Samples (Planner code: KIT SAMPLES)")
-        self.include_kit_samples_checkbox.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        self.include_kit_samples_checkbox.setFont(_font("Arial", 10, QFont.Weight.Bold))
         self.include_kit_samples_checkbox.setChecked(False)
         material_layout.addWidget(self.include_kit_samples_checkbox)
         
         # Material categories tooltip
         material_tooltip = QLabel("Untick categories to exclude them from material availability checks")
-        material_tooltip.setFont(QFont("Arial", 8))
+        material_tooltip.setFont(_font("Arial", 8))
         material_tooltip.setStyleSheet("color: gray; font-style: italic;")
         material_layout.addWidget(material_tooltip)
         
@@ -1286,7 +1721,7 @@ class PlanSnapMainWindow(QMainWindow):
         
         # Process button
         self.process_btn = QPushButton("🗄️ CONNECT TO DATABASE & PROCESS")
-        self.process_btn.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        self.process_btn.setFont(_font("Arial", 12, QFont.Weight.Bold))
         self.process_btn.clicked.connect(self.start_processing)
         main_layout.addWidget(self.process_btn)
         
@@ -1294,7 +1729,7 @@ class PlanSnapMainWindow(QMainWindow):
         
         # Status
         self.status_label = QLabel("🔄 Ready - Connect to database to begin processing")
-        self.status_label.setFont(QFont("Arial", 10))
+        self.status_label.setFont(_font("Arial", 10))
         main_layout.addWidget(self.status_label)
         
         # Progress bar
@@ -1306,9 +1741,12 @@ class PlanSnapMainWindow(QMainWindow):
         results_group = QGroupBox("📊 Results")
         results_layout = QVBoxLayout(results_group)
         
-        self.results_text = QTextEdit()
-        self.results_text.setFont(QFont("Consolas", 9))
+        # Plain-text widget: line-based layout is much cheaper than rich text for large summaries
+        self.results_text = QPlainTextEdit()
+        self.results_text.setFont(_font("Consolas", 9))
         self.results_text.setReadOnly(True)
+        # Monospaced report: no wrap-point search during layout, long lines scroll horizontally
+        self.results_text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
         results_layout.addWidget(self.results_text)
         
         # Buttons layout
@@ -1330,8 +1768,8 @@ class PlanSnapMainWindow(QMainWindow):
         self.results_text.setPlainText("Connect to your database to begin material release planning...")
         
     def start_processing(self):
-        """Start the processing in a separate thread"""
-        if self.processing_worker and self.processing_worker.isRunning():
+        """Start the processing on the worker thread pool"""
+        if self.thread_pool.activeThreadCount() > 0:
             return  # Already processing
         
         # Disable the process button
@@ -1342,7 +1780,7 @@ class PlanSnapMainWindow(QMainWindow):
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)  # Indeterminate progress
         
-        # Create and start the worker thread
+        # Create the worker and queue it on the pool
         self.processing_worker = ProcessingWorker(
             minmax_mode=self.minmax_checkbox.isChecked(),
             include_kits=self.include_kits_checkbox.isChecked(),
@@ -1351,39 +1789,60 @@ class PlanSnapMainWindow(QMainWindow):
             include_kit_samples=self.include_kit_samples_checkbox.isChecked()
         )
         
-        # Connect signals
+        # Connect signals (queued onto the GUI thread)
         self.processing_worker.progress_updated.connect(self.update_status)
         self.processing_worker.finished.connect(self.processing_finished)
         self.processing_worker.error_occurred.connect(self.processing_error)
         
         # Start the worker
-        self.processing_worker.start()
+        self.thread_pool.start(self.processing_worker)
     
     def update_status(self, message):
-        """Update the status label with progress messages"""
-        self.status_label.setText(message)
-        QApplication.processEvents()  # Process events to update UI
+        """Queue a progress message; the status label picks up the latest one on the next tick"""
+        self._pending_status = message
+        if not self.status_timer.isActive():
+            self.status_timer.start()
+    
+    def flush_status(self):
+        """Show the most recent queued progress message"""
+        message, self._pending_status = self._pending_status, None
+        # Skip the relayout/repaint when the label already shows this text
+        if message is not None and message != self.status_label.text():
+            self.status_label.setText(message)
     
     def processing_finished(self, results):
         """Handle processing completion"""
-        # Hide progress bar
-        self.progress_bar.setVisible(False)
-        
-        # Re-enable the process button
-        self.process_btn.setEnabled(True)
-        self.process_btn.setText("🗄️ CONNECT TO DATABASE & PROCESS")
-        
-        # Generate and display results
-        self.display_results(results)
-        
-        # Show download button if in quick analysis mode
-        if self.no_export_checkbox.isChecked():
-            self.download_btn.setVisible(True)
-        else:
-            self.download_btn.setVisible(False)
+        # Drop any queued progress message so it can't overwrite the final status
+        self.status_timer.stop()
+        self._pending_status = None
+        
+        # Apply all the end-of-run widget changes behind one repaint, with the results pane's
+        # change signals held back while the summary is loaded
+        self.setUpdatesEnabled(False)
+        results_blocker = QSignalBlocker(self.results_text)
+        try:
+            # Hide progress bar
+            self.progress_bar.setVisible(False)
+            
+            # Re-enable the process button
+            self.process_btn.setEnabled(True)
+            self.process_btn.setText("🗄️ CONNECT TO DATABASE & PROCESS")
+            
+            # Generate and display results
+            self.display_results(results)
+            
+            # Show download button if in quick analysis mode
+            self.download_btn.setVisible(self.no_export_checkbox.isChecked())
+        finally:
+            results_blocker.unblock()
+            self.setUpdatesEnabled(True)
     
     def processing_error(self, error_message):
         """Handle processing errors"""
+        # Drop any queued progress message so it can't overwrite the final status
+        self.status_timer.stop()
+        self._pending_status = None
+        
         # Hide progress bar
         self.progress_bar.setVisible(False)
         
@@ -1401,13 +1860,23 @@ class PlanSnapMainWindow(QMainWindow):
         scenarios_for_comparison = results['scenarios_for_comparison']
         processing_time = results['processing_time']
         minmax_mode = results['minmax_mode']
+        summary_tail = ""  # Part of the summary appended after the first screen is shown
         
         # Generate summary text
         if minmax_mode:
             # Min/Max optimization summary
-            files_processed = list(set([s['filepath'] for s in scenarios_for_comparison]))
+            # Group strategy results by file in one pass (insertion order keeps files in run order)
+            scenarios_by_file = defaultdict(list)
+            total_orders_all = 0
+            for s in scenarios_for_comparison:
+                scenarios_by_file[s['filepath']].append(s)
+                total_orders_all += s['metrics']['total_orders']
+            files_processed = list(scenarios_by_file)
+            basenames = {fp: os.path.basename(fp) for fp in files_processed}
             
-            summary_text = f"""🔥 MIN/MAX OPTIMIZATION COMPLETE!
+            # Summary blocks are collected in a list and joined once at the end
+            summary_parts = []
+            summary_parts.append(f"""🔥 MIN/MAX OPTIMIZATION COMPLETE!
 
 📊 OPTIMIZATION ANALYSIS:
    Files Analyzed: {len(files_processed)}
@@ -1421,38 +1890,34 @@ class PlanSnapMainWindow(QMainWindow):
    Virtuoso (3806): {'✓ Included' if self.include_virtuoso_checkbox.isChecked() else '✗ Excluded'}
    Kit Samples (KIT SAMPLES): {'✓ Included' if self.include_kit_samples_checkbox.isChecked() else '✗ Excluded'}
 
-"""
+""")
             
-            for filepath in files_processed:
-                file_scenarios = [s for s in scenarios_for_comparison if s['filepath'] == filepath]
-                best_orders = max(file_scenarios, key=lambda s: s['metrics']['releasable_count'])
-                best_hours = max(file_scenarios, key=lambda s: s['metrics']['releasable_hours'])
-                best_qty = max(file_scenarios, key=lambda s: s['metrics']['releasable_qty'])
-                worst_orders = min(file_scenarios, key=lambda s: s['metrics']['releasable_count'])
+            for filepath, file_scenarios in scenarios_by_file.items():
+                best_orders, best_hours, best_qty, worst_orders = find_strategy_extremes(file_scenarios)
                 
-                improvement_orders = best_orders['metrics']['releasable_count'] - worst_orders['metrics']['releasable_count']
-                improvement_pct = improvement_orders / worst_orders['metrics']['total_orders'] * 100
+                bo, bh, bq, wo = best_orders['metrics'], best_hours['metrics'], best_qty['metrics'], worst_orders['metrics']
+                improvement_orders = bo['releasable_count'] - wo['releasable_count']
                 
-                summary_text += f"""📁 FILE: {os.path.basename(filepath)}
-   🏆 BEST STRATEGY (Orders): {best_orders['sorting_strategy']}
-      → {best_orders['metrics']['releasable_count']:>6}/{best_orders['metrics']['total_orders']:>6} orders releasable ({best_orders['metrics']['releasable_count']/best_orders['metrics']['total_orders']*100:.1f}%)
-   
-   🏆 BEST STRATEGY (Hours): {best_hours['sorting_strategy']}
-      → {best_hours['metrics']['releasable_hours']:,.0f}/{best_hours['metrics']['total_hours']:,.0f} hours releasable ({best_hours['metrics']['releasable_hours']/best_hours['metrics']['total_hours']*100:.1f}%)
-   
-   🏆 BEST STRATEGY (Qty): {best_qty['sorting_strategy']}
-      → {best_qty['metrics']['releasable_qty']:,}/{best_qty['metrics']['total_qty']:,} units releasable ({best_qty['metrics']['releasable_qty']/best_qty['metrics']['total_qty']*100:.1f}%)
-   
-   📉 WORST STRATEGY: {worst_orders['sorting_strategy']}
-      → {worst_orders['metrics']['releasable_count']:,} orders releasable
-   
-   🔺 IMPROVEMENT POTENTIAL: +{improvement_orders:,} more orders ({improvement_pct:.1f}% boost)
-
-"""
+                summary_parts.append(_FILE_SUMMARY(
+                    basename=basenames[filepath],
+                    bo_name=best_orders['sorting_strategy'],
+                    bo_rc=bo['releasable_count'], bo_to=bo['total_orders'],
+                    bo_pct=bo['releasable_count'] * percent_factor(bo['total_orders']),
+                    bh_name=best_hours['sorting_strategy'],
+                    bh_rh=bh['releasable_hours'], bh_th=bh['total_hours'],
+                    bh_pct=bh['releasable_hours'] * percent_factor(bh['total_hours']),
+                    bq_name=best_qty['sorting_strategy'],
+                    bq_rq=bq['releasable_qty'], bq_tq=bq['total_qty'],
+                    bq_pct=bq['releasable_qty'] * percent_factor(bq['total_qty']),
+                    wo_name=worst_orders['sorting_strategy'],
+                    wo_rc=wo['releasable_count'],
+                    improvement=improvement_orders,
+                    improvement_pct=improvement_orders * percent_factor(wo['total_orders']),
+                ))
             
-            summary_text += f"""⏱️ PERFORMANCE METRICS:
+            summary_parts.append(f"""⏱️ PERFORMANCE METRICS:
    Total Processing Time: {processing_time:.2f} seconds
-   Processing Speed: {sum(s['metrics']['total_orders'] for s in scenarios_for_comparison)/processing_time:.1f} orders/second
+   Processing Speed: {total_orders_all/processing_time:.1f} orders/second
    Average per Strategy: {processing_time/len(scenarios_for_comparison):.1f} seconds
    
 💾 Results saved to: {'No export (Quick Analysis Mode)' if self.no_export_checkbox.isChecked() else 'Desktop'}
@@ -1462,13 +1927,27 @@ class PlanSnapMainWindow(QMainWindow):
    ✓ Triple optimization: Orders + Hours + Quantity
    ✓ Only optimal results saved as individual sheets
    ✓ Complete strategy comparison table
-   ✓ Improvement potential analysis"""
+   ✓ Improvement potential analysis""")
+            # Header plus the first few files are shown straight away; the rest follows on the next idle tick
+            head_count = 1 + SUMMARY_HEAD_FILES
+            summary_text = "".join(summary_parts[:head_count])
+            summary_tail = "".join(summary_parts[head_count:])
             
         elif len(scenarios) > 1:
             # Multi-scenario summary (standard mode)
-            best_scenario = max(scenarios, key=lambda s: s['metrics']['releasable_count'])
-            worst_scenario = min(scenarios, key=lambda s: s['metrics']['releasable_count'])
+            # Best, worst and total orders in one pass (first occurrence wins ties, as max/min did)
+            best_scenario = worst_scenario = scenarios[0]
+            total_orders_all = 0
+            for s in scenarios:
+                releasable = s['metrics']['releasable_count']
+                if releasable > best_scenario['metrics']['releasable_count']:
+                    best_scenario = s
+                if releasable < worst_scenario['metrics']['releasable_count']:
+                    worst_scenario = s
+                total_orders_all += s['metrics']['total_orders']
             improvement = best_scenario['metrics']['releasable_count'] - worst_scenario['metrics']['releasable_count']
+            best_name = os.path.basename(best_scenario['filepath'])
+            worst_name = os.path.basename(worst_scenario['filepath'])
             
             summary_text = f"""✅ MULTI-SCENARIO ANALYSIS COMPLETE!
 
@@ -1480,17 +1959,17 @@ class PlanSnapMainWindow(QMainWindow):
    Virtuoso (3806): {'✓ Included' if self.include_virtuoso_checkbox.isChecked() else '✗ Excluded'}
    Kit Samples (KIT SAMPLES): {'✓ Included' if self.include_kit_samples_checkbox.isChecked() else '✗ Excluded'}
 
-🏆 BEST PERFORMER: {os.path.basename(best_scenario['filepath'])}
-   ✅ {best_scenario['metrics']['releasable_count']:,} releasable orders ({best_scenario['metrics']['releasable_count']/best_scenario['metrics']['total_orders']*100:.1f}%)
+🏆 BEST PERFORMER: {best_name}
+   ✅ {best_scenario['metrics']['releasable_count']:,} releasable orders ({best_scenario['metrics']['releasable_count'] * percent_factor(best_scenario['metrics']['total_orders']):.1f}%)
 
-📉 BASELINE: {os.path.basename(worst_scenario['filepath'])}
-   ✅ {worst_scenario['metrics']['releasable_count']:,} releasable orders ({worst_scenario['metrics']['releasable_count']/worst_scenario['metrics']['total_orders']*100:.1f}%)
+📉 BASELINE: {worst_name}
+   ✅ {worst_scenario['metrics']['releasable_count']:,} releasable orders ({worst_scenario['metrics']['releasable_count'] * percent_factor(worst_scenario['metrics']['total_orders']):.1f}%)
 
 🔺 IMPROVEMENT: +{improvement:,} more orders releasable
 
 ⏱️ PERFORMANCE METRICS:
    Total Processing Time: {processing_time:.2f} seconds
-   Processing Speed: {sum(s['metrics']['total_orders'] for s in scenarios)/processing_time:.1f} orders/second
+   Processing Speed: {total_orders_all/processing_time:.1f} orders/second
    
 💾 Results saved to: {'No export (Quick Analysis Mode)' if self.no_export_checkbox.isChecked() else 'Desktop'}"""
         else:
@@ -1498,14 +1977,38 @@ class PlanSnapMainWindow(QMainWindow):
             scenario = scenarios[0]
             metrics = scenario['metrics']
             
+            # Read each headline metric once; percentages are computed once from the bound values
+            g = metrics.get
+            total_orders = g('total_orders', 0)
+            releasable_count = g('releasable_count', 0)
+            held_count = g('held_count', 0)
+            total_hours = g('total_hours', 0)
+            releasable_hours = g('releasable_hours', 0)
+            orders_factor = percent_factor(total_orders)
+            releasable_pct = format_metric(releasable_count * orders_factor, 'percentage')
+            held_pct = format_metric(held_count * orders_factor, 'percentage')
+            releasable_hours_pct = format_metric(releasable_hours * percent_factor(total_hours), 'percentage')
+            
+            # Category lines come from the section table; each line reads its three metrics once
+            fm = format_metric
+            category_text = "\n\n".join(
+                "\n".join([heading] + [
+                    f"   {label:<26}{fm(g(key + '_count', 0)):>6} orders,  "
+                    f"{fm(g(key + '_hours', 0), 'hours'):>8} hrs,  "
+                    f"{fm(g(key + '_qty', 0)):>8} qty"
+                    for label, key in rows
+                ])
+                for heading, rows in _RELEASABLE_SECTIONS
+            )
+            
             summary_text = f"""✅ PROCESSING COMPLETE!
 
 📊 RESULTS SUMMARY:
-   Total Orders:     {format_metric(safe_metric(metrics, 'total_orders')):>8}
-   ✅ Releasable:    {format_metric(safe_metric(metrics, 'releasable_count')):>8} ({format_metric(safe_metric(metrics, 'releasable_count') / safe_metric(metrics, 'total_orders') * 100, 'percentage')})
-   ❌ On Hold:       {format_metric(safe_metric(metrics, 'held_count')):>8} ({format_metric(safe_metric(metrics, 'held_count') / safe_metric(metrics, 'total_orders') * 100, 'percentage')})
-   🏷️ Piggyback:     {format_metric(safe_metric(metrics, 'pb_count')):>8}
-   ⚠️ Skipped:       {format_metric(safe_metric(metrics, 'skipped_count')):>8}
+   Total Orders:     {format_metric(total_orders):>8}
+   ✅ Releasable:    {format_metric(releasable_count):>8} ({releasable_pct})
+   ❌ On Hold:       {format_metric(held_count):>8} ({held_pct})
+   🏷️ Piggyback:     {format_metric(g('pb_count', 0)):>8}
+   ⚠️ Skipped:       {format_metric(g('skipped_count', 0)):>8}
 
 🔧 MATERIAL CATEGORIES PROCESSED:
    Kits (3001, 3801, 5001): {'✓ Included' if self.include_kits_checkbox.isChecked() else '✗ Excluded'}
@@ -1513,93 +2016,102 @@ class PlanSnapMainWindow(QMainWindow):
    Virtuoso (3806): {'✓ Included' if self.include_virtuoso_checkbox.isChecked() else '✗ Excluded'}
    Kit Samples (KIT SAMPLES): {'✓ Included' if self.include_kit_samples_checkbox.isChecked() else '✗ Excluded'}
 
-🔧 RELEASABLE KITS:
-   BVI Kits (3001, 3801):    {format_metric(safe_metric(metrics, 'releasable_bvi_kits_count')):>6} orders,  {format_metric(safe_metric(metrics, 'releasable_bvi_kits_hours'), 'hours'):>8} hrs,  {format_metric(safe_metric(metrics, 'releasable_bvi_kits_qty')):>8} qty
-   Malosa Kits (5001):       {format_metric(safe_metric(metrics, 'releasable_malosa_kits_count')):>6} orders,  {format_metric(safe_metric(metrics, 'releasable_malosa_kits_hours'), 'hours'):>8} hrs,  {format_metric(safe_metric(metrics, 'releasable_malosa_kits_qty')):>8} qty
-   Total Kits:               {format_metric(safe_metric(metrics, 'releasable_kits_count')):>6} orders,  {format_metric(safe_metric(metrics, 'releasable_kits_hours'), 'hours'):>8} hrs,  {format_metric(safe_metric(metrics, 'releasable_kits_qty')):>8} qty
-
-🔬 RELEASABLE INSTRUMENTS:
-   Manufacturing (3802):     {format_metric(safe_metric(metrics, 'releasable_manufacturing_count')):>6} orders,  {format_metric(safe_metric(metrics, 'releasable_manufacturing_hours'), 'hours'):>8} hrs,  {format_metric(safe_metric(metrics, 'releasable_manufacturing_qty')):>8} qty
-   Assembly (3803):          {format_metric(safe_metric(metrics, 'releasable_assembly_count')):>6} orders,  {format_metric(safe_metric(metrics, 'releasable_assembly_hours'), 'hours'):>8} hrs,  {format_metric(safe_metric(metrics, 'releasable_assembly_qty')):>8} qty
-   Packaging (3804):         {format_metric(safe_metric(metrics, 'releasable_packaging_count')):>6} orders,  {format_metric(safe_metric(metrics, 'releasable_packaging_hours'), 'hours'):>8} hrs,  {format_metric(safe_metric(metrics, 'releasable_packaging_qty')):>8} qty
-   Malosa Instruments (3805):{format_metric(safe_metric(metrics, 'releasable_malosa_instruments_count')):>6} orders,  {format_metric(safe_metric(metrics, 'releasable_malosa_instruments_hours'), 'hours'):>8} hrs,  {format_metric(safe_metric(metrics, 'releasable_malosa_instruments_qty')):>8} qty
-   Total Instruments:        {format_metric(safe_metric(metrics, 'releasable_instruments_count')):>6} orders,  {format_metric(safe_metric(metrics, 'releasable_instruments_hours'), 'hours'):>8} hrs,  {format_metric(safe_metric(metrics, 'releasable_instruments_qty')):>8} qty
-
-🎵 RELEASABLE VIRTUOSO:
-   Virtuoso (3806):          {format_metric(safe_metric(metrics, 'releasable_virtuoso_count')):>6} orders,  {format_metric(safe_metric(metrics, 'releasable_virtuoso_hours'), 'hours'):>8} hrs,  {format_metric(safe_metric(metrics, 'releasable_virtuoso_qty')):>8} qty
+{category_text}
 
 ⏱️ LABOR HOURS SUMMARY:
-   Total Hours:              {format_metric(safe_metric(metrics, 'total_hours'), 'hours'):>8}
-   ✅ Releasable Hours:       {format_metric(safe_metric(metrics, 'releasable_hours'), 'hours'):>8} ({format_metric(safe_metric(metrics, 'releasable_hours') / safe_metric(metrics, 'total_hours') * 100, 'percentage')})
+   Total Hours:              {format_metric(total_hours, 'hours'):>8}
+   ✅ Releasable Hours:       {format_metric(releasable_hours, 'hours'):>8} ({releasable_hours_pct})
 
 ⏱️ PERFORMANCE METRICS:
    Processing Time: {processing_time:.2f} seconds
-   Orders per Second: {metrics['total_orders']/processing_time:.1f}
+   Orders per Second: {total_orders/processing_time:.1f}
 
 💾 Results saved to: {'No export (Quick Analysis Mode)' if self.no_export_checkbox.isChecked() else 'Desktop'}"""
         
         # Add performance report to the summary
         performance_report = self.generate_performance_report()
-        full_summary = summary_text + "\n\n" + performance_report
+        if summary_tail:
+            # appendPlainText starts a new line itself, so the head gives up its last newline
+            head_text = summary_text[:-1]
+            tail_text = "\n\n".join((summary_tail, performance_report))
+        else:
+            head_text = "\n\n".join((summary_text, performance_report))
         
-        # Display results
-        self.results_text.setPlainText(full_summary)
+        # Display results (repaint once after the whole summary is laid out)
+        self.results_text.setUpdatesEnabled(False)
+        try:
+            self.results_text.setPlainText(head_text)
+        finally:
+            self.results_text.setUpdatesEnabled(True)
+        if summary_tail:
+            QTimer.singleShot(0, lambda: self.append_results_tail(tail_text))
         
         # Update status
         if minmax_mode:
             self.status_label.setText(f"🔥 MIN/MAX OPTIMIZATION COMPLETE! {len(scenarios_for_comparison)} strategies tested, {len(scenarios)} best results saved in {processing_time:.1f}s")
         elif len(scenarios) > 1:
-            best_scenario = max(scenarios, key=lambda s: s['metrics']['releasable_count'])
-            worst_scenario = min(scenarios, key=lambda s: s['metrics']['releasable_count'])
-            improvement = best_scenario['metrics']['releasable_count'] - worst_scenario['metrics']['releasable_count']
+            # best_scenario/improvement were worked out for the summary above
             self.status_label.setText(f"✅ ALL {len(scenarios)} SCENARIOS COMPLETE! Best: {best_scenario['metrics']['releasable_count']:,} releasable (+{improvement:,} vs worst) | Total time: {processing_time:.1f}s")
         else:
             total_orders = scenarios[0]['metrics']['total_orders']
             total_releasable = scenarios[0]['metrics']['releasable_count']
             self.status_label.setText(f"✅ PROCESSING COMPLETE! {total_releasable:,}/{total_orders:,} orders releasable in {processing_time:.1f}s")
     
+    def append_results_tail(self, text):
+        """Append the deferred part of the summary without moving the view"""
+        scrollbar = self.results_text.verticalScrollBar()
+        position = scrollbar.value()
+        self.results_text.appendPlainText(text)
+        scrollbar.setValue(position)
+    
     def generate_performance_report(self):
         """Generate detailed performance report with phase breakdown"""
         phase_summary = performance_tracker.get_phase_summary()
         memory_summary = performance_tracker.get_memory_summary()
         
-        report = []
-        report.append("🔍 DETAILED PERFORMANCE ANALYSIS")
-        report.append("=" * 50)
+        # Total is known up front so breakdown and distribution come out of one pass
+        total_time = sum(m.total_time for _, m in phase_summary)
+        report = StringIO()
+        w = report.write
+        distribution = StringIO()
+        
+        w("🔍 DETAILED PERFORMANCE ANALYSIS\n")
+        w("=" * 50 + "\n")
         
         # Phase breakdown
-        report.append("\n📊 PHASE BREAKDOWN:")
-        total_time = 0
-        for phase, metrics in phase_summary.items():
-            total_time += metrics['total_time']
-            report.append(f"   {phase}:")
-            report.append(f"     Total Time: {metrics['total_time']:.3f}s")
-            report.append(f"     Average Time: {metrics['avg_time']:.3f}s")
-            report.append(f"     Count: {metrics['count']}")
-            report.append(f"     Min/Max: {metrics['min_time']:.3f}s / {metrics['max_time']:.3f}s")
-        
-        # Calculate percentages
-        report.append(f"\n📈 TIME DISTRIBUTION:")
-        for phase, metrics in phase_summary.items():
-            percentage = (metrics['total_time'] / total_time * 100) if total_time > 0 else 0
-            report.append(f"   {phase}: {percentage:.1f}% ({metrics['total_time']:.3f}s)")
+        w("\n📊 PHASE BREAKDOWN:\n")
+        for phase, metrics in phase_summary:
+            phase_time = metrics.total_time
+            w(f"   {phase}:\n"
+              f"     Total Time: {phase_time:.3f}s\n"
+              f"     Average Time: {metrics.avg_time:.3f}s\n"
+              f"     Count: {metrics.count}\n"
+              f"     Min/Max: {metrics.min_time:.3f}s / {metrics.max_time:.3f}s\n")
+            percentage = (phase_time / total_time * 100) if total_time > 0 else 0
+            distribution.write(f"   {phase}: {percentage:.1f}% ({phase_time:.3f}s)\n")
+        
+        # Time distribution
+        w("\n📈 TIME DISTRIBUTION:\n")
+        w(distribution.getvalue())
         
         # Memory usage
         if memory_summary:
-            report.append(f"\n💾 MEMORY USAGE:")
-            report.append(f"   Peak Memory: {memory_summary['peak_memory_mb']:.1f} MB")
-            report.append(f"   Average Memory: {memory_summary['avg_memory_mb']:.1f} MB")
-            report.append(f"   Initial Memory: {memory_summary['initial_memory_mb']:.1f} MB")
-            report.append(f"   Final Memory: {memory_summary['final_memory_mb']:.1f} MB")
-            report.append(f"   Memory Growth: {memory_summary['final_memory_mb'] - memory_summary['initial_memory_mb']:.1f} MB")
-        
-        return "\n".join(report)
+            w("\n💾 MEMORY USAGE:\n")
+            w(f"   Peak Memory: {memory_summary.peak_memory_mb:.1f} MB\n")
+            w(f"   Average Memory: {memory_summary.avg_memory_mb:.1f} MB\n")
+            w(f"   Initial Memory: {memory_summary.initial_memory_mb:.1f} MB\n")
+            w(f"   Final Memory: {memory_summary.final_memory_mb:.1f} MB\n")
+            w(f"   Memory Growth: {memory_summary.final_memory_mb - memory_summary.initial_memory_mb:.1f} MB\n")
+        
+        return report.getvalue().rstrip("\n")
     
     def copy_summary_to_clipboard(self):
         """Copy the summary text to clipboard"""
-        summary_text_content = self.results_text.toPlainText().strip()
-        clipboard = QApplication.clipboard()
-        clipboard.setText(summary_text_content)
+        # One retrieval of the text; the clipboard takes ownership of the mime data
+        # (the summary is generated without surrounding whitespace, so no strip copy)
+        mime_data = QMimeData()
+        mime_data.setText(self.results_text.toPlainText())
+        QApplication.clipboard().setMimeData(mime_data)
         
         # Temporarily change button text to show it was copied
         original_text = self.copy_btn.text()
@@ -1613,13 +2125,15 @@ class PlanSnapMainWindow(QMainWindow):
             return
         
         try:
-            # Check if buffer has data
-            if self.quick_analysis_excel_buffer.getvalue() == b'':
+            buf = self.quick_analysis_excel_buffer
+            
+            # Check if buffer has data (size probe, no copy of the payload)
+            if buf.seek(0, os.SEEK_END) == 0:
                 QMessageBox.critical(self, "No data", "Quick analysis buffer is empty.")
                 return
                 
             # Try to get a default filename
-            default_filename = f"Quick_Analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+            default_filename = f"Quick_Analysis_{time.strftime('%Y%m%d_%H%M%S')}.xlsx"
             
             file_path, _ = QFileDialog.getSaveFileName(
                 self,
@@ -1629,25 +2143,26 @@ class PlanSnapMainWindow(QMainWindow):
             )
             
             if file_path:
-                # Ensure the buffer is at the beginning
-                self.quick_analysis_excel_buffer.seek(0)
-                
-                # Get the buffer data
-                buffer_data = self.quick_analysis_excel_buffer.getvalue()
-                
-                # Check if we have data to write
-                if not buffer_data:
-                    QMessageBox.critical(self, "Error", "No data available to save.")
-                    return
-                
-                # Write the file with proper error handling
-                with open(file_path, "wb") as f:
-                    f.write(buffer_data)
-                
-                QMessageBox.information(self, "Success", f"File saved successfully to:\n{file_path}")
+                # Write on a pool thread so a slow disk doesn't freeze the window
+                self.download_btn.setEnabled(False)
+                self.download_btn.setText("💾 Saving...")
+                self.save_worker = SaveFileWorker(buf, file_path)
+                self.save_worker.signals.finished.connect(self.save_finished)
+                QThreadPool.globalInstance().start(self.save_worker)
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save file:\n{str(e)}")
+    
+    def save_finished(self, file_path, error):
+        """Handle completion of a background file save"""
+        self.save_worker = None
+        self.download_btn.setText("⬇️ Download File")
+        self.download_btn.setEnabled(True)
+        
+        if error:
+            QMessageBox.critical(self, "Error", f"Failed to save file:\n{error}")
+        else:
+            QMessageBox.information(self, "Success", f"File saved successfully to:\n{file_path}")
 
 # Main application
 def main():
@@ -1664,4 +2179,5 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Worker processes for the min/max sweep in frozen builds
     main() 
\ No newline at end of file